@@ -0,0 +1,237 @@
+"""Benchmarks of every model, stage by stage, for airspeed velocity (asv).
+
+Stages are rule building, network generation, simulator construction, and
+first and repeated integration over the 20,000 s horizon used in tests.
+
+Peak memory benchmarks report the peak resident size of the benchmark
+process, which includes building the model and simulator in ``setup``, not
+only the integration. Compare them between commits for the same benchmark,
+not between engines.
+
+Integration of this package's compiled :class:`~caspase_model.network.Network`
+is benchmarked in separate classes, which also track how many times its
+right-hand side is evaluated. That count says nothing about the number of
+evaluations made by the PySB or SimBio simulators.
+
+Import of the package is timed in a fresh interpreter, to catch engines or
+other heavy dependencies creeping back into ``import caspase_model``.
+
+Benchmarks that time a stage which changes the model set ``number = 1``, so
+asv runs ``setup`` before each sample and every sample starts fresh.
+
+Run with ``asv run`` and compare commits with ``asv compare``.
+"""
+
+import numpy as np
+
+T = np.linspace(0, 20_000, 1_000)
+SOLVER_OPTIONS = {"atol": 1e-6, "rtol": 1e-6}
+
+PYSB_MODELS = ["albeck_as_matlab", "corbat_2018", "arm"]
+SIMBIO_MODELS = [
+    "Albeck11b",
+    "Albeck11bPoreTransport",
+    "Albeck11c",
+    "Albeck11cPoreTransport",
+    "Albeck11d",
+    "Albeck11dPoreTransport",
+    "Albeck11e",
+    "Albeck11ePoreTransport",
+    "Albeck11f",
+    "Albeck11fPoreTransport",
+]
+
+
+def timeraw_import_caspase_model():
+    return "import caspase_model"
+
+
+def build_pysb(name):
+    from caspase_model import models
+
+    return getattr(models, name)()
+
+
+def generate_pysb(name):
+    from pysb.bng import generate_equations
+
+    model = build_pysb(name)
+    generate_equations(model)
+    return model
+
+
+def compile_pysb(name):
+    from caspase_model.network import Network
+
+    return Network.from_pysb(generate_pysb(name))
+
+
+class PySBBuild:
+    params = PYSB_MODELS
+    param_names = ["model"]
+
+    def time_build(self, name):
+        build_pysb(name)
+
+
+class PySBNetwork:
+    params = PYSB_MODELS
+    param_names = ["model"]
+    number = 1
+    warmup_time = 0
+
+    def setup(self, name):
+        self.model = build_pysb(name)
+
+    def time_generate_equations(self, name):
+        from pysb.bng import generate_equations
+
+        generate_equations(self.model)
+
+
+class PySBCompile:
+    params = PYSB_MODELS
+    param_names = ["model"]
+    number = 1
+    warmup_time = 0
+
+    def setup(self, name):
+        self.model = generate_pysb(name)
+
+    def time_scipy_simulator(self, name):
+        from pysb.simulator import ScipyOdeSimulator
+
+        ScipyOdeSimulator(self.model, integrator="lsoda")
+
+    def time_network(self, name):
+        from caspase_model.network import Network
+
+        Network.from_pysb(self.model)
+
+
+class PySBFirstRun:
+    params = PYSB_MODELS
+    param_names = ["model"]
+    number = 1
+    warmup_time = 0
+
+    def setup(self, name):
+        from pysb.simulator import ScipyOdeSimulator
+
+        self.simulator = ScipyOdeSimulator(
+            generate_pysb(name), integrator="lsoda", integrator_options=SOLVER_OPTIONS
+        )
+
+    def time_first_run(self, name):
+        self.simulator.run(T)
+
+
+class PySBRun:
+    params = PYSB_MODELS
+    param_names = ["model"]
+
+    def setup(self, name):
+        from pysb.simulator import ScipyOdeSimulator
+
+        model = generate_pysb(name)
+        self.simulator = ScipyOdeSimulator(
+            model, integrator="lsoda", integrator_options=SOLVER_OPTIONS
+        )
+        self.simulator.run(T)
+
+    def time_run(self, name):
+        self.simulator.run(T)
+
+    def peakmem_run(self, name):
+        self.simulator.run(T)
+
+
+class PySBNetworkRun:
+    params = PYSB_MODELS
+    param_names = ["model"]
+
+    def setup(self, name):
+        self.network = compile_pysb(name)
+        self.network.simulate(T, **SOLVER_OPTIONS)
+
+    def time_run(self, name):
+        self.network.simulate(T, **SOLVER_OPTIONS)
+
+    def peakmem_run(self, name):
+        self.network.simulate(T, **SOLVER_OPTIONS)
+
+    def track_network_rhs_calls(self, name):
+        return count_rhs_calls(self.network)
+
+    track_network_rhs_calls.unit = "calls"
+
+
+class SimBio:
+    params = SIMBIO_MODELS
+    param_names = ["model"]
+
+    def setup(self, name):
+        from simbio import Simulator
+        from simbio.simulator.solvers.scipy import ODEint
+
+        from caspase_model.simbio_model import albeck
+
+        self.model = getattr(albeck, name)
+        self.make_simulator = lambda: Simulator(
+            self.model, builder="numpy", solver=ODEint, solver_kwargs=SOLVER_OPTIONS
+        )
+        self.simulator = self.make_simulator()
+        self.simulator.run(T)
+
+    def time_simulator(self, name):
+        self.make_simulator()
+
+    def time_first_run(self, name):
+        self.make_simulator().run(T)
+
+    def time_run(self, name):
+        self.simulator.run(T)
+
+    def peakmem_run(self, name):
+        self.simulator.run(T)
+
+
+class SimBioNetworkRun:
+    params = SIMBIO_MODELS
+    param_names = ["model"]
+
+    def setup(self, name):
+        from caspase_model.network import Network
+        from caspase_model.simbio_model import albeck
+
+        self.network = Network.from_simbio(getattr(albeck, name))
+        self.network.simulate(T, **SOLVER_OPTIONS)
+
+    def time_run(self, name):
+        self.network.simulate(T, **SOLVER_OPTIONS)
+
+    def peakmem_run(self, name):
+        self.network.simulate(T, **SOLVER_OPTIONS)
+
+    def track_network_rhs_calls(self, name):
+        return count_rhs_calls(self.network)
+
+    track_network_rhs_calls.unit = "calls"
+
+
+def count_rhs_calls(network):
+    """Number of evaluations of :meth:`Network.rhs` to integrate `network`."""
+    calls = 0
+    rhs = network.rhs
+
+    def counted(*args):
+        nonlocal calls
+        calls += 1
+        return rhs(*args)
+
+    network.rhs = counted
+    try:
+        network.simulate(T, **SOLVER_OPTIONS)
+    finally:
+        del network.rhs
+    return calls
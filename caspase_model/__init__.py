@@ -0,0 +1,33 @@
+"""Caspase model based on Albeck et al. (2008), as modified by Corbat et al.
+(2018).
+
+Importing the package is cheap: modelling engines and numerical libraries
+are only imported when the attribute that needs them is first accessed.
+"""
+
+import importlib
+
+_API = {
+    "albeck_as_matlab": "models",
+    "arm": "models",
+    "corbat_2018": "models",
+    "CompiledModel": "compiled",
+    "Network": "network",
+    "SimulationCache": "cache",
+    "compare": "equivalence",
+    "infer_name_mapping": "mapping",
+    "MappingIndex": "mapping",
+}
+
+__all__ = list(_API)
+
+
+def __getattr__(name):
+    if name not in _API:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{_API[name]}", __name__)
+    return getattr(module, name)
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,73 @@
+"""Helpers shared by modules of the package."""
+
+import contextlib
+import hashlib
+import os
+import pickle
+import tempfile
+
+import numpy as np
+
+# Fixed, so keys do not change with the default protocol of new Pythons.
+_KEY_PROTOCOL = 4
+
+
+@contextlib.contextmanager
+def atomic_write(path, mode="wb"):
+    """Open a temporary file next to `path` that replaces it on success.
+
+    Readers, in this or other processes, see either the previous file or
+    the complete new one. The temporary file is removed on error.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode) as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def save_pickle(path, content):
+    """Pickle `content` to `path` atomically."""
+    with atomic_write(path) as f:
+        pickle.dump(content, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_pickle(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def job_key(*settings):
+    """Digest identifying a job, so a checkpoint is not resumed by another.
+
+    Arrays are hashed by content. Callables, such as samplers, and objects
+    without a repr of their own, such as accumulators, are hashed by their
+    pickle, which covers their configuration. Other settings are hashed by
+    their repr.
+
+    Raises
+    ------
+    TypeError
+        If a callable or object cannot be pickled. Jobs then take an
+        explicit job id in its place.
+    """
+    h = hashlib.sha256()
+    for setting in settings:
+        if isinstance(setting, np.ndarray):
+            h.update(np.ascontiguousarray(setting).tobytes())
+        elif callable(setting) or type(setting).__repr__ is object.__repr__:
+            try:
+                h.update(pickle.dumps(setting, protocol=_KEY_PROTOCOL))
+            except (pickle.PicklingError, AttributeError, TypeError) as error:
+                raise TypeError(
+                    f"{setting!r} cannot be pickled to identify the job; "
+                    "pass an explicit job id instead."
+                ) from error
+        else:
+            h.update(repr(setting).encode())
+        h.update(b"\0")
+    return h.hexdigest()
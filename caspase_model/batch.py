@@ -0,0 +1,171 @@
+"""Stiff integration of batches of parameter sets in lockstep.
+
+:func:`simulate_batch` integrates many copies of a network, one per
+parameter set, with the modified Rosenbrock (2, 3) pair of Shampine and
+Reichelt (the method of MATLAB's ``ode23s``). Every step is a handful of
+NumPy operations over the whole batch, but each member keeps its own step
+size and error control, so cells switching early do not force small steps
+on the others. Members that reach the final time are retired from the
+batch.
+
+Outputs at the requested times come from the continuous extension of the
+method, so steps are not shortened to hit output times.
+
+A member that needs more than the maximum number of steps, or whose step
+size shrinks below the spacing of floating-point times, fails. By default
+this raises an error for the whole batch, but failures can also be reported
+per member, so that one extreme parameter set does not discard the others.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+BatchSolution = namedtuple("BatchSolution", ["y", "steps", "rejected", "h", "failed"])
+BatchSolution.__doc__ = """Solution of a batch.
+
+y : array of shape (members, len(t), number of species), NaN at the times
+    a failed member did not reach.
+steps, rejected : number of accepted and rejected steps of each member.
+h : step size each member would take next, a good initial step size for
+    neighbouring parameter sets.
+failed : whether each member failed to reach the final time.
+"""
+
+_D = 1 / (2 + np.sqrt(2))
+_E32 = 6 + np.sqrt(2)
+
+
+def simulate_batch(
+    network,
+    t,
+    params=None,
+    y0=None,
+    rtol=1e-6,
+    atol=1e-6,
+    h0=None,
+    max_steps=100_000,
+    strict=True,
+):
+    """Integrate `network` for each parameter set in `params`.
+
+    Parameters
+    ----------
+    network : Network
+    t : array_like
+        Increasing output times. Integration starts at ``t[0]``.
+    params : array_like, optional
+        Parameter vectors of shape (members, number of parameters). Defaults
+        to a single member with :attr:`Network.values`.
+    y0 : array_like, optional
+        Initial amounts of shape (members, number of species), computed
+        from `params` by default.
+    rtol, atol : float
+        Relative and absolute tolerances of the local error.
+    h0 : float or array_like, optional
+        Initial step size of each member, estimated by default.
+    max_steps : int
+        Maximum number of steps, accepted or not, of any member.
+    strict : bool
+        If True, raise a RuntimeError when any member fails. Otherwise,
+        failed members are retired from the batch and flagged in the
+        solution.
+
+    Returns
+    -------
+    solution : BatchSolution
+    """
+    t = np.asarray(t, dtype=float)
+    params = network.values if params is None else np.asarray(params, dtype=float)
+    params = np.atleast_2d(params)
+    y = network.initial_amounts(params) if y0 is None else np.array(y0, dtype=float)
+    y = np.broadcast_to(y, (len(params), len(network.species))).copy()
+    k = network.rate_constants(params)
+    n_members, n_species = y.shape
+    identity = np.eye(n_species)
+
+    output = np.full((n_members, len(t), n_species), np.nan)
+    output[:, 0] = y
+    next_output = np.ones(n_members, dtype=int)
+    time = np.full(n_members, t[0])
+    f = network.rhs(None, y, k)
+
+    if h0 is None:
+        scale = np.abs(y) + atol / rtol
+        rate = np.abs(f / scale).max(axis=-1)
+        h = 0.8 * rtol ** (1 / 3) / np.maximum(rate, np.finfo(float).tiny)
+    else:
+        h = np.broadcast_to(np.asarray(h0, dtype=float), (n_members,)).copy()
+    h = np.minimum(h, t[-1] - t[0])
+
+    steps = np.zeros(n_members, dtype=int)
+    rejected = np.zeros(n_members, dtype=int)
+    failed = np.zeros(n_members, dtype=bool)
+    active = np.flatnonzero(time < t[-1])
+    while active.size:
+        exhausted = steps[active] + rejected[active] >= max_steps
+        exhausted |= h[active] < 10 * np.spacing(time[active])
+        if exhausted.any():
+            if strict:
+                raise RuntimeError(
+                    "Maximum number of steps reached or step size too small."
+                )
+            failed[active[exhausted]] = True
+            active = active[~exhausted]
+            if not active.size:
+                break
+
+        ya, ka, fa, ta = y[active], k[active], f[active], time[active]
+        ha = np.minimum(h[active], t[-1] - ta)
+        hc = ha[:, None]
+
+        jacobian = network.jacobian(None, ya, ka)
+        inverse = np.linalg.inv(identity - (_D * hc)[..., None] * jacobian)
+
+        k1 = _apply(inverse, fa)
+        f1 = network.rhs(None, ya + 0.5 * hc * k1, ka)
+        k2 = _apply(inverse, f1 - k1) + k1
+        y_new = ya + hc * k2
+        f2 = network.rhs(None, y_new, ka)
+        k3 = _apply(inverse, f2 - _E32 * (k2 - f1) - 2 * (k1 - fa))
+
+        error = hc / 6 * (k1 - 2 * k2 + k3)
+        scale = atol + rtol * np.maximum(np.abs(ya), np.abs(y_new))
+        norm = np.abs(error / scale).max(axis=-1)
+        accepted = norm <= 1
+
+        t_new = np.where(ha >= t[-1] - ta, t[-1], ta + ha)
+
+        # Outputs within accepted steps, from the continuous extension.
+        position, member = np.flatnonzero(accepted), active[accepted]
+        while position.size:
+            index = next_output[member]
+            due = index < len(t)
+            due[due] = t[index[due]] <= t_new[position[due]]
+            position, member, index = position[due], member[due], index[due]
+            s = ((t[index] - ta[position]) / ha[position])[:, None]
+            output[member, index] = ya[position] + hc[position] * (
+                s * (1 - s) / (1 - 2 * _D) * k1[position]
+                + s * (s - 2 * _D) / (1 - 2 * _D) * k2[position]
+            )
+            next_output[member] += 1
+
+        done = active[accepted]
+        y[done] = y_new[accepted]
+        f[done] = f2[accepted]
+        time[done] = t_new[accepted]
+        steps[done] += 1
+        rejected[active[~accepted]] += 1
+
+        factor = 0.8 * np.maximum(norm, 1e-10) ** (-1 / 3)
+        # Non-finite errors, from overflowing states, shrink the step most.
+        factor = np.where(np.isfinite(factor), factor, 0.2)
+        h[active] = ha * np.clip(factor, 0.2, 5)
+        active = np.flatnonzero((time < t[-1]) & ~failed)
+
+    return BatchSolution(output, steps, rejected, h, failed)
+
+
+def _apply(matrices, vectors):
+    """Batched matrix-vector product."""
+    return (matrices @ vectors[..., None])[..., 0]
@@ -0,0 +1,46 @@
+"""Explicit targeting of PySB model construction.
+
+PySB attaches new components to a process-wide default model (its
+``SelfExporter``) and injects their names into the calling module. Model
+functions in this package instead receive the model they build, and run
+PySB code inside :func:`exporting_to`, which points the exporter to that
+model and to a throw-away namespace. A re-entrant lock serializes these
+sections, so models can be built from several threads and builders can call
+each other.
+"""
+
+import threading
+from contextlib import contextmanager
+
+from pysb.core import SelfExporter
+
+_lock = threading.RLock()
+
+
+@contextmanager
+def exporting_to(model):
+    """Attach self-exported PySB components to `model`.
+
+    Components created within the context are added to `model` only, and
+    their names are not injected into any module.
+    """
+    with _lock:
+        saved = (
+            SelfExporter.do_export,
+            SelfExporter.default_model,
+            SelfExporter.target_globals,
+            SelfExporter.target_module,
+        )
+        SelfExporter.do_export = True
+        SelfExporter.default_model = model
+        SelfExporter.target_globals = {}
+        SelfExporter.target_module = None
+        try:
+            yield model
+        finally:
+            (
+                SelfExporter.do_export,
+                SelfExporter.default_model,
+                SelfExporter.target_globals,
+                SelfExporter.target_module,
+            ) = saved
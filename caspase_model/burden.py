@@ -0,0 +1,118 @@
+"""Perturbation of caspase dynamics by biosensor loading.
+
+CASPAM sensors are caspase substrates, so loading cells with them diverts
+caspases from their endogenous targets. A sensor-loaded network with zero
+sensor amounts is exactly the sensor-free network: sensor reactions have no
+flux without sensor, and the remaining species follow the same equations.
+:func:`sensor_burden` therefore simulates cells without sensors and with a
+range of sensor loadings as one batch of the sensor-loaded network, instead
+of building and simulating models with and without CASPAM separately, and
+compares every loading with the sensor-free reference.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from .batch import simulate_batch
+from .features import activation_time
+
+SENSOR_PARAMETERS = ("dsCas3_0", "dsCas8_0", "dsCas9_0")
+
+Burden = namedtuple("Burden", ["loadings", "y", "deviation", "time_to_death", "delay"])
+Burden.__doc__ = """Perturbation of each cell by each sensor loading.
+
+loadings : array of shape (loadings, sensors), starting with the sensor-free
+    reference, all zeros.
+y : observables of shape (cells, loadings, len(t), observables).
+deviation : maximum absolute difference of each observable from the
+    reference, relative to the reference's maximum, of shape (cells,
+    loadings, observables).
+time_to_death : array of shape (cells, loadings).
+delay : time to death minus that of the reference.
+"""
+
+
+def sensor_burden(
+    network,
+    t,
+    loadings,
+    params=None,
+    sensors=SENSOR_PARAMETERS,
+    observables=("Cas3_active", "Apop_active"),
+    death="Cas3_active",
+    fraction=0.5,
+    **options,
+):
+    """Compare dynamics with and without sensors, over sensor loadings.
+
+    Parameters
+    ----------
+    network : Network
+        Network including sensors, such as one compiled from ``arm()`` or
+        ``corbat_2018()`` with the default ``add_CASPAM=True``.
+    t : array_like
+        Output times. Integration starts at ``t[0]``.
+    loadings : array_like
+        Sensor amounts, of shape (loadings,) to load every sensor equally or
+        (loadings, len(sensors)). The sensor-free reference is prepended.
+    params : array_like, optional
+        Parameter vectors of the cells, of shape (number of parameters,) or
+        (cells, number of parameters). Defaults to :attr:`Network.values`.
+    sensors : sequence of str
+        Names of the parameters setting sensor amounts.
+    observables : sequence of str
+        Observables, or species, whose perturbation is reported. Caspase
+        observables are added by :func:`~caspase_model.shared.observe_caspases`.
+    death : str
+        Observable, or species, whose activation time, when it reaches
+        `fraction` of its rise, is the time to death. Cleaved PARP is a
+        common choice, when the network has it.
+    fraction : float
+    options
+        Passed to :func:`~caspase_model.batch.simulate_batch`.
+
+    Returns
+    -------
+    burden : Burden
+    """
+    t = np.asarray(t, dtype=float)
+    params = network.values if params is None else np.asarray(params, dtype=float)
+    params = np.atleast_2d(params)
+    loadings = np.asarray(loadings, dtype=float)
+    if loadings.ndim == 1:
+        loadings = np.repeat(loadings[:, None], len(sensors), axis=1)
+    loadings = np.concatenate((np.zeros((1, len(sensors))), loadings))
+
+    n_cells, n_loadings = len(params), len(loadings)
+    batch = np.repeat(params[:, None], n_loadings, axis=1)
+    batch[..., [network.parameters.index(name) for name in sensors]] = loadings
+    y = simulate_batch(network, t, batch.reshape(n_cells * n_loadings, -1), **options).y
+
+    matrix = np.stack([_coefficients(network, name) for name in (*observables, death)])
+    y = (y @ matrix.T).reshape(n_cells, n_loadings, len(t), len(matrix))
+
+    reference = y[:, :1]
+    scale = np.abs(reference).max(axis=2, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        deviation = (np.abs(y - reference) / scale).max(axis=2)[..., :-1]
+
+    death_time = activation_time(
+        t, y[..., -1:].reshape(n_cells * n_loadings, len(t), 1), fraction
+    ).reshape(n_cells, n_loadings)
+    return Burden(
+        loadings,
+        y[..., :-1],
+        deviation,
+        death_time,
+        death_time - death_time[:, :1],
+    )
+
+
+def _coefficients(network, name):
+    """Coefficients over species of an observable or a species."""
+    if name in network.observables:
+        return network.observable_matrix[network.observables.index(name)]
+    coefficients = np.zeros(len(network.species))
+    coefficients[network.species.index(name)] = 1
+    return coefficients
@@ -0,0 +1,205 @@
+"""Content-addressed cache of simulation results.
+
+Results are keyed by a digest of the compiled network, the parameter and
+initial condition vectors, the time grid and the solver settings, so a hit
+skips integration entirely. There is an in-memory tier and an optional
+on-disk tier, both evicting least recently used entries beyond a size bound.
+The on-disk tier can be shared by concurrent processes: entries are written
+atomically and eviction is serialized through a lock file.
+"""
+
+import hashlib
+import inspect
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from ._util import atomic_write
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+def simulation_key(network, t, params=None, y0=None, **solver_options):
+    """Hex digest identifying a simulation of `network`.
+
+    Solver options left at their defaults in :meth:`Network.simulate` give
+    the same digest as passing those defaults explicitly.
+    """
+    params = network.values if params is None else params
+    y0 = network.initial_amounts(params) if y0 is None else y0
+    solver_options = {**_default_options(network), **solver_options}
+
+    h = hashlib.sha256(network.digest().encode())
+    for array in (params, y0, t):
+        array = np.ascontiguousarray(array, dtype=float)
+        h.update(str(array.shape).encode())
+        h.update(array.tobytes())
+    h.update(repr(sorted(solver_options.items())).encode())
+    return h.hexdigest()
+
+
+class SimulationCache:
+    """Two-tier LRU cache of simulation results.
+
+    Parameters
+    ----------
+    directory : str or path, optional
+        Directory of the on-disk tier. If None, only memory is used.
+    max_memory_bytes : int
+        Size bound of the in-memory tier.
+    max_disk_bytes : int
+        Size bound of the on-disk tier.
+    """
+
+    def __init__(self, directory=None, max_memory_bytes=2**28, max_disk_bytes=2**32):
+        self.directory = directory
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def simulate(self, network, t, params=None, y0=None, **solver_options):
+        """Cached equivalent of :meth:`Network.simulate`.
+
+        The returned array is read-only, as it is shared with the cache.
+        Dense output is not cached: passing ``dense_output=True`` raises a
+        TypeError.
+        """
+        if solver_options.get("dense_output"):
+            raise TypeError("Dense output trajectories are not cached.")
+        key = simulation_key(network, t, params, y0, **solver_options)
+        y = self.get(key)
+        if y is None:
+            y = self.put(key, network.simulate(t, params, y0, **solver_options))
+        return y
+
+    def get(self, key):
+        """Cached array for `key`, or None."""
+        with self._lock:
+            y = self._memory.get(key)
+            if y is not None:
+                self._memory.move_to_end(key)
+
+        if self.directory is None:
+            return y
+        path = self._path(key)
+        if y is not None:
+            # Keep the disk tier's recency in step with memory hits.
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                pass
+            return y
+        try:
+            with open(path, "rb") as f:
+                y = np.load(f)
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            # Missing, evicted meanwhile or partially written by a crashed
+            # process.
+            return None
+        return self._remember(key, y)
+
+    def put(self, key, y):
+        """Store array `y` under `key` in both tiers and return it read-only."""
+        y = self._remember(key, np.array(y))
+        if self.directory is None:
+            return y
+
+        with atomic_write(self._path(key)) as f:
+            np.save(f, y)
+        self._evict_disk()
+        return y
+
+    def clear(self):
+        """Remove all entries from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        if self.directory is None:
+            return
+        with self._disk_lock():
+            for path in self._disk_entries():
+                _remove(path)
+
+    def _remember(self, key, y):
+        y.flags.writeable = False
+        with self._lock:
+            if key in self._memory:
+                self._memory_bytes -= self._memory.pop(key).nbytes
+            self._memory[key] = y
+            self._memory_bytes += y.nbytes
+            while self._memory_bytes > self.max_memory_bytes and len(self._memory):
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted.nbytes
+        return y
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".npy")
+
+    def _disk_entries(self):
+        with os.scandir(self.directory) as it:
+            return [e.path for e in it if e.name.endswith(".npy")]
+
+    def _evict_disk(self):
+        with self._disk_lock():
+            entries = []
+            for path in self._disk_entries():
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_disk_bytes:
+                    break
+                _remove(path)
+                total -= size
+
+    def _disk_lock(self):
+        return _FileLock(os.path.join(self.directory, ".lock"))
+
+
+class _FileLock:
+    """Exclusive inter-process lock on a file (a no-op without fcntl)."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __enter__(self):
+        self._file = open(self.path, "a")
+        if fcntl is not None:
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+        self._file.close()
+
+
+def _default_options(network):
+    """Solver options of :meth:`Network.simulate` and their defaults."""
+    parameters = inspect.signature(type(network).simulate).parameters
+    return {
+        name: p.default
+        for name, p in parameters.items()
+        if name not in ("self", "t", "params", "y0") and p.default is not p.empty
+    }
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,131 @@
+"""Prebuilt models for repeated simulation with parameter vectors.
+
+A :class:`CompiledModel` is built once from a model and then simulated with
+plain arrays: parameters and initial amounts are positional vectors laid out
+by fixed indexes, so optimizers changing values millions of times do no name
+lookups and never mutate the model.
+
+The layout is that of the compiled :class:`~caspase_model.network.Network`:
+
+- parameters are in model declaration order, including the parameters that
+  give initial amounts (named ``<monomer>_0`` in PySB models, or
+  ``<species>_0`` for SimBio models),
+- species are in network order, as produced by network generation.
+
+Names are translated to positions once, outside the hot loop, through
+:class:`Index`.
+"""
+
+import numpy as np
+
+from .network import Network
+
+
+class Index:
+    """Fixed, ordered mapping between names and positions.
+
+    Parameters
+    ----------
+    names : sequence of str
+    """
+
+    __slots__ = ("names", "_positions")
+
+    def __init__(self, names):
+        self.names = tuple(names)
+        self._positions = {name: i for i, name in enumerate(self.names)}
+
+    def __repr__(self):
+        return f"Index({list(self.names)!r})"
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __contains__(self, name):
+        return name in self._positions
+
+    def __getitem__(self, name):
+        """Position of `name`."""
+        return self._positions[name]
+
+    def positions(self, names):
+        """Positions of several names, as an array usable for indexing."""
+        return np.array([self._positions[name] for name in names], dtype=int)
+
+    def vector(self, defaults, **values):
+        """Copy of `defaults` with some entries replaced by name."""
+        vector = np.array(defaults, dtype=float)
+        for name, value in values.items():
+            vector[self._positions[name]] = value
+        return vector
+
+
+class CompiledModel:
+    """Model compiled for simulation with parameter and initial amount vectors.
+
+    Parameters
+    ----------
+    network : Network
+
+    Attributes
+    ----------
+    parameters : Index
+        Layout of parameter vectors.
+    species : Index
+        Layout of initial amount and state vectors.
+    values : ndarray
+        Default parameter vector. It is never modified.
+    """
+
+    __slots__ = ("network", "parameters", "species", "values")
+
+    def __init__(self, network):
+        self.network = network
+        self.parameters = Index(network.parameters)
+        self.species = Index(network.species)
+        self.values = network.values.copy()
+        self.values.flags.writeable = False
+
+    def __repr__(self):
+        return (
+            f"<CompiledModel {len(self.species)} species, "
+            f"{len(self.parameters)} parameters>"
+        )
+
+    @classmethod
+    def from_pysb(cls, model):
+        return cls(Network.from_pysb(model))
+
+    @classmethod
+    def from_simbio(cls, model):
+        return cls(Network.from_simbio(model))
+
+    def initial_amounts(self, params):
+        """Initial species amounts given by a parameter vector."""
+        return self.network.initial_amounts(params)
+
+    def simulate(self, params, y0, t, method="LSODA", rtol=1e-6, atol=1e-6):
+        """Integrate the model and return species amounts at times `t`.
+
+        Parameters
+        ----------
+        params : ndarray or None
+            Parameter vector laid out by :attr:`parameters`, or None for
+            :attr:`values`.
+        y0 : ndarray or None
+            Initial amounts laid out by :attr:`species`, or None to take
+            them from `params`.
+        t : ndarray
+            Output times. Integration starts at ``t[0]``.
+        method, rtol, atol
+            Passed to :meth:`Network.simulate`.
+
+        Returns
+        -------
+        y : ndarray
+            Array of shape (len(t), number of species).
+        """
+        return self.network.simulate(t, params, y0, method=method, rtol=rtol, atol=atol)
@@ -0,0 +1,394 @@
+"""Numerical continuation of steady states.
+
+Steady states are followed as a parameter changes by pseudo-arclength
+continuation, which goes around folds where branches turn back. Folds mark
+stimulus thresholds: between two folds of a branch the model is bistable.
+Following a fold while changing a second parameter traces the boundary of
+the bistable region, so threshold maps in two parameters (such as ligand
+and XIAP or Bcl2 levels) are obtained without simulation grids.
+
+Steady states are restricted to the stoichiometric compatibility class of
+the initial amounts: the system solved is the projection of the rate
+equations onto the range of the stoichiometry matrix, together with the
+conservation laws spanning its left null space. Parameters can be rate
+constants or initial amounts, which change the conserved totals.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+Branch = namedtuple("Branch", ["parameter", "values", "states", "stable", "folds"])
+Branch.__doc__ = """Steady state branch.
+
+values : parameter value of each point.
+states : species amounts of each point.
+stable : whether each point is linearly stable.
+folds : list of Fold.
+"""
+
+Fold = namedtuple("Fold", ["parameter", "value", "state", "vector"])
+Fold.__doc__ = """Fold (saddle-node) point, with the null vector of the
+Jacobian of the steady state equations in scaled species amounts."""
+
+FoldCurve = namedtuple("FoldCurve", ["parameters", "values", "states"])
+FoldCurve.__doc__ = """Folds as two parameters change.
+
+values : array of shape (points, 2) with the value of each parameter.
+"""
+
+
+def steady_state(network, params=None, y=None, t_max=1e6, tol=1e-10):
+    """Steady state reached from `y` (default: the initial amounts).
+
+    The network is integrated up to `t_max` and the result refined with
+    Newton's method.
+    """
+    params = network.values if params is None else np.asarray(params, dtype=float)
+    if y is None:
+        y = network.initial_amounts(params)
+    y = network.simulate([0, t_max], params, y)[-1]
+    system = SteadyState(network, params, [], log=False, scale=species_scale(y))
+    z = _newton(
+        lambda z: system.residual(z, []),
+        lambda z: system.jacobian(z, []),
+        y / system.scale,
+        tol,
+    )
+    if z is None:
+        raise RuntimeError("Steady state did not converge.")
+    return z * system.scale
+
+
+def continuation(
+    network,
+    parameter,
+    bounds,
+    params=None,
+    y=None,
+    log=True,
+    step=0.05,
+    max_step=0.5,
+    max_points=1000,
+):
+    """Follow the steady state through `y` as `parameter` changes.
+
+    Parameters
+    ----------
+    network : Network
+    parameter : str
+        Parameter name.
+    bounds : tuple of float
+        Range of `parameter` to explore.
+    params : array_like, optional
+        Values of the other parameters (default: :attr:`Network.values`).
+    y : array_like, optional
+        Starting steady state, computed by :func:`steady_state` by default.
+    log : bool
+        Continue in the logarithm of `parameter`.
+    step, max_step : float
+        Initial and maximum arclength steps, in scaled species amounts and
+        (log10) parameter units.
+    max_points : int
+        Maximum number of points in each direction.
+
+    Returns
+    -------
+    branch : Branch
+    """
+    params = network.values if params is None else np.asarray(params, dtype=float)
+    index = network.parameters.index(parameter)
+    if y is None:
+        y = steady_state(network, params)
+    system = SteadyState(network, params, [index], log, species_scale(y))
+    lower, upper = system.to_continuation(np.asarray(bounds, dtype=float))
+
+    u = np.append(y / system.scale, system.to_continuation(params[index]))
+    points = _trace_both(
+        system.residual_u,
+        system.jacobian_u,
+        u,
+        lambda u: lower <= u[-1] <= upper,
+        step,
+        max_step,
+        max_points,
+    )
+    points, tangents = np.array([p for p, _ in points]), [t for _, t in points]
+
+    folds = []
+    for i in np.flatnonzero(np.diff(np.sign([t[-1] for t in tangents]))):
+        fold = _refine_fold(system, (points[i] + points[i + 1]) / 2)
+        if fold is not None:
+            z, v, lam = fold
+            folds.append(
+                Fold(parameter, system.from_continuation(lam), z * system.scale, v)
+            )
+
+    states = points[:, :-1] * system.scale
+    values = system.from_continuation(points[:, -1])
+    stable = np.array(
+        [system.is_stable(z, [lam]) for z, lam in zip(points[:, :-1], points[:, -1])]
+    )
+    return Branch(parameter, values, states, stable, folds)
+
+
+def fold_continuation(
+    network,
+    fold,
+    parameter,
+    bounds,
+    params=None,
+    fold_bounds=None,
+    log=True,
+    step=0.05,
+    max_step=0.5,
+    max_points=1000,
+):
+    """Follow a fold as a second parameter changes.
+
+    Parameters
+    ----------
+    network : Network
+    fold : Fold
+        Starting fold, from :func:`continuation` with the same `params`.
+    parameter : str
+        Second parameter name.
+    bounds : tuple of float
+        Range of the second parameter to explore.
+    fold_bounds : tuple of float, optional
+        Range of the fold parameter to explore (default: unbounded).
+    params, log, step, max_step, max_points
+        As in :func:`continuation`.
+
+    Returns
+    -------
+    curve : FoldCurve
+        Ends where either parameter leaves its bounds or the fold
+        disappears, such as at a cusp.
+    """
+    params = network.values if params is None else np.asarray(params, dtype=float)
+    indexes = [network.parameters.index(p) for p in (fold.parameter, parameter)]
+    system = SteadyState(network, params, indexes, log, species_scale(fold.state))
+    lower, upper = system.to_continuation(np.array([bounds, bounds], dtype=float).T)
+    if fold_bounds is None:
+        lower[0], upper[0] = -np.inf, np.inf
+    else:
+        lower[0], upper[0] = system.to_continuation(np.asarray(fold_bounds, float))
+
+    n = len(network.species)
+    z = fold.state / system.scale
+    v = fold.vector / np.linalg.norm(fold.vector)
+    lam = system.to_continuation(np.array([fold.value, params[indexes[1]]]))
+
+    def residual(u):
+        z, w, lam = u[:n], u[n : 2 * n], u[2 * n :]
+        return np.concatenate(
+            (system.residual(z, lam), system.jacobian(z, lam) @ w, [w @ v - 1])
+        )
+
+    points = _trace_both(
+        residual,
+        lambda u: _numeric_jacobian(residual, u),
+        np.concatenate((z, v, lam)),
+        lambda u: np.all((lower <= u[2 * n :]) & (u[2 * n :] <= upper)),
+        step,
+        max_step,
+        max_points,
+    )
+    points = np.array([p for p, _ in points])
+    return FoldCurve(
+        (fold.parameter, parameter),
+        system.from_continuation(points[:, 2 * n :]),
+        points[:, :n] * system.scale,
+    )
+
+
+class SteadyState:
+    """Steady state equations in scaled species amounts ``z = y / scale``
+    and continuation parameters ``lam`` (log10 of parameters if `log`).
+
+    Parameters
+    ----------
+    network : Network
+    params : array_like
+        Parameter vector, whose entries at `indexes` are replaced by the
+        continuation parameters.
+    indexes : sequence of int
+        Indexes of the continuation parameters in `params`.
+    log : bool
+        Whether continuation parameters are log10 of the parameters.
+    scale : ndarray
+        Characteristic amount of each species, such as given by
+        :func:`species_scale`.
+    """
+
+    def __init__(self, network, params, indexes, log, scale):
+        self.network = network
+        self.params = np.array(params, dtype=float)
+        self.indexes = list(indexes)
+        self.log = log
+        self.scale = scale
+
+        self.basis, self.conservation = network.stoichiometric_subspace()
+
+    def to_continuation(self, value):
+        return np.log10(value) if self.log else value
+
+    def from_continuation(self, lam):
+        return 10.0**lam if self.log else lam
+
+    def _params(self, lam):
+        params = self.params.copy()
+        params[self.indexes] = self.from_continuation(np.asarray(lam))
+        return params
+
+    def residual(self, z, lam):
+        params = self._params(lam)
+        y = z * self.scale
+        k = self.network.rate_constants(params)
+        totals = self.conservation @ self.network.initial_amounts(params)
+        return np.concatenate(
+            (
+                self.basis.T @ self.network.rhs(None, y, k),
+                self.conservation @ y - totals,
+            )
+        )
+
+    def jacobian(self, z, lam):
+        k = self.network.rate_constants(self._params(lam))
+        jacobian = self.network.jacobian(None, z * self.scale, k)
+        return np.vstack((self.basis.T @ jacobian, self.conservation)) * self.scale
+
+    def parameter_derivatives(self, z, lam):
+        """Derivatives of the residual with respect to each of `lam`."""
+        params = self._params(lam)
+        y = z * self.scale
+        columns = []
+        for i in self.indexes:
+            unit = np.zeros_like(params)
+            unit[i] = params[i] * np.log(10) if self.log else 1
+            flux = self.network.fluxes(y, self.network.rate_constants(unit))
+            columns.append(
+                np.concatenate(
+                    (
+                        self.basis.T @ self.network.stoichiometry @ flux,
+                        -self.conservation @ self.network.initial_amounts(unit),
+                    )
+                )
+            )
+        return np.array(columns).T
+
+    def residual_u(self, u):
+        return self.residual(u[: -len(self.indexes)], u[-len(self.indexes) :])
+
+    def jacobian_u(self, u):
+        z, lam = u[: -len(self.indexes)], u[-len(self.indexes) :]
+        return np.hstack((self.jacobian(z, lam), self.parameter_derivatives(z, lam)))
+
+    def is_stable(self, z, lam):
+        """Stability within the stoichiometric compatibility class."""
+        k = self.network.rate_constants(self._params(lam))
+        jacobian = self.network.jacobian(None, z * self.scale, k)
+        reduced = self.basis.T @ jacobian @ self.basis
+        return bool(np.all(np.linalg.eigvals(reduced).real < 0))
+
+
+def _refine_fold(system, u):
+    """Solve for the fold near `u`, returning scaled amounts, null vector and
+    parameter, or None if Newton's method fails."""
+    n = len(u) - 1
+    z, lam = u[:-1], u[-1:]
+    v = np.linalg.svd(system.jacobian(z, lam))[2][-1]
+
+    def residual(x):
+        z, w, lam = x[:n], x[n : 2 * n], x[2 * n :]
+        return np.concatenate(
+            (system.residual(z, lam), system.jacobian(z, lam) @ w, [w @ v - 1])
+        )
+
+    x = _newton(
+        residual, lambda x: _numeric_jacobian(residual, x), np.concatenate((z, v, lam))
+    )
+    if x is None:
+        return None
+    return x[:n], x[n : 2 * n], x[-1]
+
+
+def _trace_both(residual, jacobian, u, inside, step, max_step, max_points):
+    """Points and tangents of the solution curve through `u`, in both
+    directions, ordered along the curve."""
+    tangent = np.linalg.svd(jacobian(u))[2][-1]
+    if tangent[-1] < 0:
+        tangent = -tangent
+    forward = _trace(residual, jacobian, u, tangent, inside, step, max_step, max_points)
+    backward = _trace(
+        residual, jacobian, u, -tangent, inside, step, max_step, max_points
+    )
+    backward = [(p, -t) for p, t in backward[:0:-1]]
+    return backward + forward
+
+
+def _trace(residual, jacobian, u, tangent, inside, step, max_step, max_points):
+    """Pseudo-arclength continuation from `u` along `tangent`."""
+    points = [(u, tangent)]
+    min_step = step * 1e-4
+    while len(points) < max_points and step > min_step:
+        predicted = u + step * tangent
+
+        def extended(x):
+            return np.append(residual(x), tangent @ (x - predicted))
+
+        def extended_jacobian(x):
+            return np.vstack((jacobian(x), tangent))
+
+        corrected, iterations = _newton(
+            extended, extended_jacobian, predicted, return_iterations=True
+        )
+        if corrected is None:
+            step /= 2
+            continue
+        if not inside(corrected):
+            break
+
+        new_tangent = np.linalg.solve(
+            np.vstack((jacobian(corrected), tangent)),
+            np.append(np.zeros(len(corrected) - 1), 1),
+        )
+        new_tangent /= np.linalg.norm(new_tangent)
+        u, tangent = corrected, new_tangent
+        points.append((u, tangent))
+        if iterations <= 3:
+            step = min(step * 1.5, max_step)
+    return points
+
+
+def _newton(
+    residual, jacobian, x, tol=1e-10, max_iterations=10, return_iterations=False
+):
+    """Newton's method, returning None if it does not converge."""
+    for iteration in range(1, max_iterations + 1):
+        try:
+            dx = np.linalg.solve(jacobian(x), -residual(x))
+        except np.linalg.LinAlgError:
+            break
+        x = x + dx
+        if not np.all(np.isfinite(x)):
+            break
+        if np.linalg.norm(dx) <= tol * (1 + np.linalg.norm(x)):
+            return (x, iteration) if return_iterations else x
+    return (None, None) if return_iterations else None
+
+
+def _numeric_jacobian(function, x):
+    f = function(x)
+    h = 1e-7 * (1 + np.abs(x))
+    columns = [
+        (function(x + h[i] * e) - f) / h[i] for i, e in enumerate(np.eye(len(x)))
+    ]
+    return np.array(columns).T
+
+
+def species_scale(y):
+    """Characteristic amount of each species, for scaling."""
+    y = np.abs(np.asarray(y, dtype=float))
+    return np.maximum(y, 1e-6 * max(y.max(), 1))
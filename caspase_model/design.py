@@ -0,0 +1,193 @@
+"""Optimal experimental design from Fisher information.
+
+A design sets experimentally controlled parameters, such as biosensor
+loadings (``dsCas3_0``, ``dsCas8_0``, ``dsCas9_0``) or stimulus dose, and
+the times at which observables are measured. Its information about the
+estimated parameters is the Fisher information matrix of the measured
+observables, built from their sensitivities to the logarithm of each
+estimated parameter, computed by central finite differences as one batched
+simulation. Designs are ranked by D-optimality, the log-determinant of that
+matrix.
+
+As sensors are part of the network, a design with more sensor has larger
+signals but also perturbs the dynamics it measures, and this trade-off is
+reflected in the sensitivities.
+"""
+
+from collections import namedtuple
+from functools import partial
+
+import numpy as np
+
+from .batch import simulate_batch
+
+Design = namedtuple("Design", ["values", "times"])
+Design.__doc__ = """Experimental design.
+
+values : dict of parameter names to values set by the experimenter.
+times : measurement times.
+"""
+
+
+def sensitivities(
+    network,
+    t,
+    estimated,
+    params=None,
+    observables=None,
+    step=1e-3,
+    t_start=0,
+    **options,
+):
+    """Sensitivities of observables to the logarithm of estimated parameters.
+
+    Parameters
+    ----------
+    network : Network
+    t : array_like
+        Increasing measurement times, after `t_start`.
+    estimated : sequence of str
+        Names of the estimated parameters.
+    params : array_like, optional
+        Parameter vector (default: :attr:`Network.values`).
+    observables : sequence of str, optional
+        Measured observables (default: all).
+    step : float
+        Relative finite difference step.
+    t_start : float
+        Start of the simulation.
+    options
+        Passed to :func:`~caspase_model.batch.simulate_batch`.
+
+    Returns
+    -------
+    y : ndarray
+        Observables of shape (len(t), number of observables).
+    sensitivities : ndarray
+        Array of shape (len(t), number of observables, len(estimated)).
+    """
+    params = network.values if params is None else np.asarray(params, dtype=float)
+    observables = network.observables if observables is None else observables
+    rows = [network.observables.index(name) for name in observables]
+    columns = [network.parameters.index(name) for name in estimated]
+
+    factors = np.ones((2 * len(columns) + 1, len(params)))
+    for i, j in enumerate(columns):
+        factors[2 * i + 1, j] = np.exp(step)
+        factors[2 * i + 2, j] = np.exp(-step)
+
+    t = np.asarray(t, dtype=float)
+    options.setdefault("rtol", 1e-8)
+    options.setdefault("atol", 1e-8)
+    y = simulate_batch(network, np.append(t_start, t), params * factors, **options).y
+    y = network.observe(y[:, 1:])[..., rows]
+
+    derivatives = (y[1::2] - y[2::2]) / (2 * step)
+    return y[0], np.moveaxis(derivatives, 0, -1)
+
+
+def fisher_information(y, sensitivities, relative_error=0.05, absolute_error=1.0):
+    """Fisher information matrix of measurements with Gaussian errors of
+    standard deviation ``relative_error * |y| + absolute_error``."""
+    sigma = relative_error * np.abs(y) + absolute_error
+    weighted = sensitivities / sigma[..., None]
+    return np.einsum("...toi,...toj->...ij", weighted, weighted)
+
+
+def d_optimality(information, ridge=1e-12):
+    """Log-determinant of the Fisher information matrix."""
+    information = np.asarray(information)
+    scale = max(np.trace(information, axis1=-2, axis2=-1).max(initial=0), 1)
+    identity = np.eye(information.shape[-1])
+    return np.linalg.slogdet(information + ridge * scale * identity)[1]
+
+
+def evaluate(network, design, estimated, observables=None, **options):
+    """D-optimality of a design.
+
+    Parameters
+    ----------
+    network : Network
+    design : Design
+    estimated, observables
+        As in :func:`sensitivities`.
+    options
+        Error model of :func:`fisher_information` (`relative_error`,
+        `absolute_error`), or passed to :func:`sensitivities`.
+    """
+    errors = {
+        key: options.pop(key)
+        for key in ("relative_error", "absolute_error")
+        if key in options
+    }
+    params = _design_params(network, design.values)
+    y, s = sensitivities(
+        network, design.times, estimated, params, observables, **options
+    )
+    return d_optimality(fisher_information(y, s, **errors))
+
+
+def evaluate_designs(
+    network, designs, estimated, observables=None, executor=None, **options
+):
+    """D-optimality of each design, computed in parallel with `executor`
+    (such as a :class:`concurrent.futures.ProcessPoolExecutor`) if given."""
+    function = partial(
+        evaluate,
+        network,
+        estimated=estimated,
+        observables=observables,
+        **options,
+    )
+    return np.array(list((executor.map if executor else map)(function, designs)))
+
+
+def select_times(
+    network, values, candidates, n, estimated, observables=None, **options
+):
+    """Greedily choose `n` measurement times among `candidates`.
+
+    Each time added is the one increasing D-optimality the most, given the
+    times already chosen.
+
+    Parameters
+    ----------
+    network : Network
+    values : dict of str to float
+        Experimentally controlled parameter values.
+    candidates : array_like
+        Increasing candidate times.
+    n : int
+    estimated, observables, options
+        As in :func:`evaluate`.
+
+    Returns
+    -------
+    times : ndarray
+        Chosen times, sorted.
+    """
+    errors = {
+        key: options.pop(key)
+        for key in ("relative_error", "absolute_error")
+        if key in options
+    }
+    params = _design_params(network, values)
+    y, s = sensitivities(network, candidates, estimated, params, observables, **options)
+    contributions = fisher_information(y[:, None], s[:, None], **errors)
+
+    chosen = []
+    information = np.zeros(contributions.shape[1:])
+    for _ in range(min(n, len(candidates))):
+        scores = d_optimality(information + contributions)
+        scores[chosen] = -np.inf
+        best = int(scores.argmax())
+        chosen.append(best)
+        information = information + contributions[best]
+    return np.asarray(candidates, dtype=float)[sorted(chosen)]
+
+
+def _design_params(network, values):
+    params = network.values.copy()
+    for name, value in values.items():
+        params[network.parameters.index(name)] = value
+    return params
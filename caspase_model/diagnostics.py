@@ -0,0 +1,161 @@
+"""Time-scale and stiffness diagnostics along trajectories.
+
+The Jacobian of the rate equations is evaluated analytically at every point
+of a trajectory, in one batched call, and restricted to the stoichiometric
+subspace so conservation laws do not show up as zero eigenvalues. Its
+eigenvalues give the time scales of the dynamics, their spread the
+stiffness, and the participation index of each species in each mode, from
+left and right eigenvectors, the species that dominate fast modes.
+
+:func:`report` summarizes these per phase of the trajectory, such as
+before, during and after the caspase-3 activation switch, and recommends a
+solver or a quasi-steady state reduction for each.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from .features import activation_time
+
+Diagnostics = namedtuple(
+    "Diagnostics", ["t", "eigenvalues", "participation", "stiffness", "condition"]
+)
+Diagnostics.__doc__ = """Jacobian diagnostics at each time.
+
+eigenvalues : array of shape (times, modes), sorted by decreasing absolute
+    real part.
+participation : array of shape (times, modes, species), adding up to 1 over
+    species.
+stiffness : ratio of the fastest to the slowest decay rate.
+condition : condition number of the restricted Jacobian.
+"""
+
+PhaseReport = namedtuple(
+    "PhaseReport",
+    ["phase", "start", "end", "stiffness", "condition", "fast_species", "solver"],
+)
+
+
+def diagnose(network, t, y, params=None):
+    """Jacobian eigen-spectrum along a trajectory.
+
+    Parameters
+    ----------
+    network : Network
+    t : array_like
+        Times.
+    y : array_like
+        Species amounts at `t`, of shape (len(t), number of species).
+    params : array_like, optional
+        Parameter vector (default: :attr:`Network.values`).
+
+    Returns
+    -------
+    diagnostics : Diagnostics
+    """
+    basis, _ = network.stoichiometric_subspace()
+    jacobian = network.jacobian(None, y, network.rate_constants(params))
+    reduced = basis.T @ jacobian @ basis
+
+    eigenvalues, right = np.linalg.eig(reduced)
+    left = np.linalg.inv(right)
+    order = np.argsort(-np.abs(eigenvalues.real), axis=-1)
+    eigenvalues = np.take_along_axis(eigenvalues, order, axis=-1)
+    right = np.take_along_axis(right, order[:, None, :], axis=-1)
+    left = np.take_along_axis(left, order[:, :, None], axis=-2)
+
+    # Participation of species i in mode m: |left[m, i] * right[i, m]| in
+    # species coordinates, normalized over species.
+    participation = np.abs((left @ basis.T) * np.swapaxes(basis @ right, -1, -2))
+    total = participation.sum(axis=-1, keepdims=True)
+    participation /= np.where(total > 0, total, 1)
+
+    rates = np.abs(eigenvalues.real)
+    fastest = rates.max(axis=-1, initial=0)
+    slowest = np.where(rates > 1e-12 * fastest[:, None], rates, np.inf).min(axis=-1)
+    return Diagnostics(
+        np.asarray(t, dtype=float),
+        eigenvalues,
+        participation,
+        fastest / slowest,
+        np.linalg.cond(reduced),
+    )
+
+
+def switch_phases(t, signal, low=0.1, high=0.9):
+    """Phases before, during and after a switch in `signal`.
+
+    The switch spans from when `signal` reaches fraction `low` of its rise
+    to when it reaches `high`, such as effector caspase activation from
+    MOMP to cell death.
+
+    Returns
+    -------
+    phases : dict of str to tuple of float
+    """
+    t = np.asarray(t, dtype=float)
+    signal = np.asarray(signal, dtype=float)[None, :, None]
+    start = activation_time(t, signal, low)[0, 0]
+    end = activation_time(t, signal, high)[0, 0]
+    if np.isnan(start):
+        return {"before": (t[0], t[-1])}
+    return {"before": (t[0], start), "switch": (start, end), "after": (end, t[-1])}
+
+
+def report(diagnostics, species, phases=None, separation=1e3, stiff=1e3):
+    """Summarize diagnostics per phase and recommend how to integrate it.
+
+    Parameters
+    ----------
+    diagnostics : Diagnostics
+    species : sequence of str
+        Species names.
+    phases : dict of str to tuple of float, optional
+        Start and end time of each phase, as from :func:`switch_phases`
+        (default: the whole trajectory).
+    separation : float
+        Modes relaxing this many times faster than the phase duration are
+        fast, and species dominating them candidates for a quasi-steady
+        state reduction.
+    stiff : float
+        Stiffness ratio above which an implicit solver is recommended.
+
+    Returns
+    -------
+    reports : list of PhaseReport
+    """
+    t = diagnostics.t
+    if phases is None:
+        phases = {"all": (t[0], t[-1])}
+
+    reports = []
+    for phase, (start, end) in phases.items():
+        inside = (t >= start) & (t <= end)
+        if not inside.any():
+            continue
+        rates = np.abs(diagnostics.eigenvalues[inside].real)
+        fast = rates * max(end - start, np.finfo(float).tiny) > separation
+        weight = (diagnostics.participation[inside] * fast[..., None]).sum(axis=(0, 1))
+        weight /= max(weight.sum(), np.finfo(float).tiny)
+        fast_species = [species[i] for i in np.argsort(-weight) if weight[i] > 0.05]
+
+        stiffness = diagnostics.stiffness[inside].max()
+        if stiffness < stiff:
+            solver = "RK45"
+        elif 0 < len(fast_species) < len(species):
+            solver = "BDF, or quasi-steady state for " + ", ".join(fast_species)
+        else:
+            solver = "BDF"
+        reports.append(
+            PhaseReport(
+                phase,
+                float(start),
+                float(end),
+                float(stiffness),
+                float(diagnostics.condition[inside].max()),
+                fast_species,
+                solver,
+            )
+        )
+    return reports
@@ -0,0 +1,114 @@
+"""Structural comparison of PySB and SimBio versions of a model.
+
+Both models are compiled to reaction networks, species are renamed through
+a PySB to SimBio name mapping, and reactions are compared by stoichiometry
+and effective rate constant. This checks every trajectory at once and takes
+milliseconds, instead of simulating both models and comparing one
+trajectory.
+"""
+
+from collections import defaultdict
+
+import numpy as np
+
+from .network import Network
+
+
+def compare(pysb_model, simbio_model, name_mapping, rtol=1e-9):
+    """List the differences between the reaction networks of two models.
+
+    Only the part of each network reachable from species with a non-zero
+    initial amount is compared, as the rest cannot affect the dynamics.
+
+    Parameters
+    ----------
+    pysb_model : pysb.Model or Network
+    simbio_model : simbio.Compartment or Network
+    name_mapping : dict
+        Maps PySB species strings to SimBio species names.
+    rtol : float
+        Relative tolerance for rate constants and initial amounts.
+
+    Returns
+    -------
+    differences : list of str
+        Human-readable description of each difference. Empty if the models
+        are equivalent.
+    """
+    if not isinstance(pysb_model, Network):
+        pysb_model = Network.from_pysb(pysb_model)
+    if not isinstance(simbio_model, Network):
+        simbio_model = Network.from_simbio(simbio_model)
+
+    unmapped = [s for s in pysb_model.species if s not in name_mapping]
+    if unmapped:
+        return [f"PySB species {s} has no SimBio name" for s in unmapped]
+    pysb_names = [name_mapping[s] for s in pysb_model.species]
+
+    pysb_reactions, pysb_initials = _canonical(pysb_model, pysb_names)
+    simbio_reactions, simbio_initials = _canonical(simbio_model, simbio_model.species)
+
+    differences = []
+    for reaction in sorted(pysb_reactions.keys() | simbio_reactions.keys()):
+        name = _reaction_name(reaction)
+        if reaction not in simbio_reactions:
+            differences.append(f"{name} only in PySB")
+        elif reaction not in pysb_reactions:
+            differences.append(f"{name} only in SimBio")
+        elif not np.isclose(
+            pysb_reactions[reaction], simbio_reactions[reaction], rtol=rtol, atol=0
+        ):
+            differences.append(
+                f"{name} has rate constant {pysb_reactions[reaction]:g} in PySB "
+                f"and {simbio_reactions[reaction]:g} in SimBio"
+            )
+
+    for species in sorted(pysb_initials.keys() | simbio_initials.keys()):
+        pysb_amount = pysb_initials.get(species, 0)
+        simbio_amount = simbio_initials.get(species, 0)
+        if not np.isclose(pysb_amount, simbio_amount, rtol=rtol, atol=0):
+            differences.append(
+                f"{species} starts at {pysb_amount:g} in PySB "
+                f"and {simbio_amount:g} in SimBio"
+            )
+    return differences
+
+
+def _canonical(network, names):
+    """Reachable reactions as a mapping from sorted reactant and product names
+    to effective rate constant, and non-zero initial amounts by name."""
+    y0 = network.initial_amounts()
+    k = network.rate_constants()
+    reachable = reachable_species(network, y0 > 0)
+
+    reactions = defaultdict(float)
+    for i, (reactants, products) in enumerate(zip(network.reactants, network.products)):
+        if not all(reachable[j] for j in reactants) or k[i] == 0:
+            continue
+        key = (
+            tuple(sorted(names[j] for j in reactants)),
+            tuple(sorted(names[j] for j in products)),
+        )
+        reactions[key] += k[i]
+
+    initials = {names[i]: y0[i] for i in np.flatnonzero(y0)}
+    return reactions, initials
+
+
+def reachable_species(network, present):
+    """Species that can be present, starting from `present`."""
+    reachable = np.array(present, dtype=bool)
+    changed = True
+    while changed:
+        changed = False
+        for reactants, products in zip(network.reactants, network.products):
+            if all(reachable[j] for j in reactants):
+                for j in products:
+                    if not reachable[j]:
+                        reachable[j] = changed = True
+    return reachable
+
+
+def _reaction_name(reaction):
+    reactants, products = reaction
+    return f"{' + '.join(reactants) or 'None'} >> {' + '.join(products) or 'None'}"
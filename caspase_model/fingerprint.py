@@ -0,0 +1,109 @@
+"""Canonical fingerprints of models.
+
+A fingerprint is a pair of digests: ``structure`` covers species, reactions
+and rate laws, while ``values`` additionally covers parameter values. Both
+are computed from a canonical, sorted description of the model, so they do
+not depend on the order in which components were declared.
+
+PySB models are fingerprinted at the rule level, which needs no network
+generation and takes milliseconds. Equal rule-level fingerprints imply the
+same network; to compare the expanded networks instead, fingerprint
+``Network.from_pysb(model)``.
+"""
+
+import hashlib
+from collections import namedtuple
+
+from .network import Network
+
+Fingerprint = namedtuple("Fingerprint", ["structure", "values"])
+
+
+def fingerprint(model):
+    """Fingerprint of a PySB model, a SimBio compartment or a Network."""
+    if isinstance(model, Network):
+        structure, values = _network_items(model)
+    elif _is_pysb(model):
+        structure, values = _pysb_items(model)
+    else:
+        structure, values = _network_items(Network.from_simbio(model))
+
+    structure = _digest(structure)
+    return Fingerprint(structure, _digest([structure, *values]))
+
+
+def _digest(items):
+    h = hashlib.sha256()
+    for item in sorted(items):
+        h.update(item.encode())
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+def _is_pysb(model):
+    return type(model).__module__.startswith("pysb")
+
+
+def _network_items(network):
+    species = network.species
+    parameters = network.parameters
+    structure = [f"species {s}" for s in species]
+
+    for reactants, products, k, factor in zip(
+        network.reactants,
+        network.products,
+        network.rate_parameters,
+        network.rate_factors,
+    ):
+        left = " + ".join(sorted(species[i] for i in reactants))
+        right = " + ".join(sorted(species[i] for i in products))
+        structure.append(f"reaction {left} >> {right} @ {factor!r} * {parameters[k]}")
+
+    for s, p in zip(network.initial_species, network.initial_parameters):
+        structure.append(f"initial {species[s]} = {parameters[p]}")
+
+    for name, coefficients in zip(network.observables, network.observable_matrix):
+        terms = sorted(f"{c!r} * {species[i]}" for i, c in enumerate(coefficients) if c)
+        structure.append(f"observable {name} = {' + '.join(terms)}")
+
+    values = [
+        f"value {p} = {float(v).hex()}" for p, v in zip(parameters, network.values)
+    ]
+    return structure, values
+
+
+def _pysb_items(model):
+    structure = []
+    for monomer in model.monomers:
+        states = sorted(f"{k}~{'~'.join(v)}" for k, v in monomer.site_states.items())
+        structure.append(f"monomer {monomer.name}({monomer.sites}; {states})")
+
+    for rule in model.rules:
+        expression = rule.rule_expression
+        left = " + ".join(
+            sorted(map(str, expression.reactant_pattern.complex_patterns))
+        )
+        right = " + ".join(
+            sorted(map(str, expression.product_pattern.complex_patterns))
+        )
+        arrow = "|" if expression.is_reversible else ">>"
+        rates = [
+            r.name for r in (rule.rate_forward, rule.rate_reverse) if r is not None
+        ]
+        flags = (rule.delete_molecules, rule.move_connected)
+        structure.append(f"rule {left} {arrow} {right} @ {rates} {flags}")
+
+    for expression in model.expressions:
+        structure.append(f"expression {expression.name} = {expression.expr}")
+
+    for initial in model.initials:
+        structure.append(f"initial {initial.pattern} = {initial.value.name}")
+
+    for observable in model.observables:
+        structure.append(
+            f"observable {observable.name} = {observable.reaction_pattern} "
+            f"({observable.match})"
+        )
+
+    values = [f"value {p.name} = {float(p.value).hex()}" for p in model.parameters]
+    return structure, values
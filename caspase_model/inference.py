@@ -0,0 +1,349 @@
+"""Bayesian inference of kinetic parameters by parallel tempering.
+
+:func:`parallel_tempering` runs several random-walk Metropolis walkers at
+each of a ladder of temperatures, swapping states between neighbouring
+temperatures so the cold chain can cross between modes. The log-likelihoods
+of all proposals of a step are requested in a single call, so a
+:class:`BatchLikelihood` evaluates every walker at every temperature, for
+every cell, as one batched simulation. The sampler state, including the
+random generator, is checkpointed to disk and resumed bit-identically.
+Each checkpoint writes the sampler state and only the samples drawn since
+the previous one, so checkpoints cost the same however long the chain.
+
+:func:`r_hat` and :func:`effective_sample_size` diagnose convergence of the
+cold chain.
+"""
+
+import glob
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from ._util import atomic_write, job_key, load_pickle, save_pickle
+from .batch import simulate_batch
+
+Samples = namedtuple(
+    "Samples", ["chain", "log_likelihood", "acceptance", "swap_acceptance"]
+)
+Samples.__doc__ = """Samples of the cold chain.
+
+chain : array of shape (steps, walkers, parameters).
+log_likelihood : array of shape (steps, walkers).
+acceptance : acceptance rate at each temperature.
+swap_acceptance : swap acceptance rate between neighbouring temperatures.
+"""
+
+
+class BatchLikelihood:
+    """Gaussian log-likelihood of single-cell traces, batched over
+    parameter sets and cells.
+
+    Parameter sets for which the simulation of any cell fails, such as
+    extreme proposals from a wide prior, have a log-likelihood of -inf.
+
+    Parameters
+    ----------
+    network : Network
+    t : array_like
+        Measurement times. The simulation starts at ``t[0]``.
+    data : array_like
+        Observables of each cell, of shape (cells, len(t), len(observables)).
+        NaN values are ignored.
+    sigma : float or array_like
+        Measurement standard deviation, broadcast against `data`.
+    estimated : sequence of str
+        Names of the estimated parameters, which are sampled as natural
+        logarithms.
+    cells : array_like, optional
+        Parameter vector of each cell, such as its protein amounts, of
+        shape (cells, number of parameters). Estimated parameters are
+        overridden. Defaults to :attr:`Network.values` for every cell.
+    observables : sequence of str, optional
+        Names of the measured observables (default: all).
+    options
+        Passed to :func:`~caspase_model.batch.simulate_batch`.
+    """
+
+    def __init__(
+        self,
+        network,
+        t,
+        data,
+        sigma,
+        estimated,
+        cells=None,
+        observables=None,
+        **options,
+    ):
+        self.network = network
+        self.t = np.asarray(t, dtype=float)
+        self.data = np.asarray(data, dtype=float)
+        self.sigma = np.broadcast_to(sigma, self.data.shape)
+        self.estimated = [network.parameters.index(name) for name in estimated]
+        if cells is None:
+            cells = np.broadcast_to(
+                network.values, (len(self.data), len(network.values))
+            )
+        self.cells = np.asarray(cells, dtype=float)
+        observables = network.observables if observables is None else observables
+        self.observables = [network.observables.index(name) for name in observables]
+        self.options = options
+
+    def __call__(self, theta):
+        """Log-likelihood of each row of log parameters `theta`."""
+        theta = np.atleast_2d(theta)
+        params = np.repeat(self.cells[None], len(theta), axis=0)
+        params[..., self.estimated] = np.exp(theta)[:, None, :]
+        solution = simulate_batch(
+            self.network,
+            self.t,
+            params.reshape(-1, params.shape[-1]),
+            strict=False,
+            **self.options,
+        )
+        y = self.network.observe(solution.y)[..., self.observables]
+        residuals = (
+            y.reshape((len(theta),) + self.data.shape) - self.data
+        ) / self.sigma
+        log_likelihood = -0.5 * np.nansum(residuals**2, axis=(1, 2, 3))
+        failed = solution.failed.reshape(len(theta), -1).any(axis=1)
+        return np.where(failed, -np.inf, log_likelihood)
+
+
+def parallel_tempering(
+    log_likelihood,
+    bounds,
+    n_steps,
+    n_walkers=8,
+    n_temperatures=8,
+    max_temperature=1e3,
+    theta0=None,
+    proposal=0.1,
+    tune=0,
+    seed=0,
+    checkpoint=None,
+    checkpoint_every=100,
+    job_id=None,
+):
+    """Sample a posterior with a uniform prior within `bounds`.
+
+    Parameters
+    ----------
+    log_likelihood : callable
+        Maps an array of parameter sets, of shape (n, parameters), to their
+        log-likelihoods, of shape (n,).
+    bounds : array_like
+        Lower and upper bounds of each parameter, of shape (parameters, 2).
+    n_steps : int
+        Number of recorded steps, after tuning.
+    n_walkers : int
+        Walkers per temperature.
+    n_temperatures : int
+    max_temperature : float
+        Temperature of the hottest chain. Temperatures are geometrically
+        spaced from 1.
+    theta0 : array_like, optional
+        Starting parameters, of shape (parameters,) or (temperatures,
+        walkers, parameters). Drawn uniformly within bounds by default, and
+        redrawn where the log-likelihood is not finite.
+    proposal : float
+        Initial standard deviation of random walk proposals.
+    tune : int
+        Initial steps during which proposal scales adapt towards an
+        acceptance rate of 0.234, and which are not recorded.
+    seed : int
+    checkpoint : str or path, optional
+        Directory where the sampler state and the chain are saved and
+        resumed from.
+    checkpoint_every : int
+        Steps between checkpoints.
+    job_id : str, optional
+        Identifies `log_likelihood` in the checkpoint, in place of its
+        pickle, for log-likelihoods that cannot be pickled.
+
+    Returns
+    -------
+    samples : Samples
+    """
+    bounds = np.asarray(bounds, dtype=float)
+    shape = (n_temperatures, n_walkers, len(bounds))
+    beta = max_temperature ** (-np.arange(n_temperatures) / max(n_temperatures - 1, 1))
+    key = None
+    if checkpoint is not None:
+        key = job_key(
+            "parallel tempering",
+            log_likelihood if job_id is None else job_id,
+            bounds,
+            n_steps,
+            n_walkers,
+            n_temperatures,
+            max_temperature,
+            proposal,
+            tune,
+            seed,
+        )
+
+    state = _load(checkpoint, key)
+    if state is None:
+        rng = np.random.default_rng(seed)
+        if theta0 is None:
+            theta = rng.uniform(bounds[:, 0], bounds[:, 1], shape)
+        else:
+            theta = np.broadcast_to(np.asarray(theta0, dtype=float), shape).copy()
+        flat = theta.reshape(-1, shape[-1])
+        current = np.asarray(log_likelihood(flat), dtype=float)
+        for _ in range(100):
+            invalid = ~np.isfinite(current)
+            if not invalid.any() or theta0 is not None:
+                break
+            flat[invalid] = rng.uniform(
+                bounds[:, 0], bounds[:, 1], (invalid.sum(), shape[-1])
+            )
+            current[invalid] = log_likelihood(flat[invalid])
+        if not np.isfinite(current).all():
+            raise ValueError("Walkers start where the log-likelihood is not finite.")
+        state = {
+            "key": key,
+            "step": 0,
+            "theta": flat.reshape(shape),
+            "log_likelihood": current.reshape(shape[:2]),
+            "scale": np.full(n_temperatures, float(proposal)),
+            "accepted": np.zeros(n_temperatures),
+            "swaps": np.zeros((n_temperatures - 1, 2)),
+            "chain": [],
+            "chain_log_likelihood": [],
+            "rng": rng.bit_generator.state,
+        }
+    rng = np.random.default_rng()
+    rng.bit_generator.state = state["rng"]
+
+    saved = len(state["chain"])
+    while state["step"] < tune + n_steps:
+        _step(state, log_likelihood, bounds, beta, rng, adapt=state["step"] < tune)
+        state["step"] += 1
+        if state["step"] > tune:
+            state["chain"].append(state["theta"][0].copy())
+            state["chain_log_likelihood"].append(state["log_likelihood"][0].copy())
+        if checkpoint is not None and (
+            state["step"] % checkpoint_every == 0 or state["step"] == tune + n_steps
+        ):
+            state["rng"] = rng.bit_generator.state
+            _save(checkpoint, state, saved)
+            saved = len(state["chain"])
+
+    recorded = max(state["step"] - tune, 1)
+    swaps = state["swaps"]
+    return Samples(
+        np.array(state["chain"]).reshape(-1, n_walkers, len(bounds)),
+        np.array(state["chain_log_likelihood"]).reshape(-1, n_walkers),
+        state["accepted"] / (recorded * n_walkers),
+        swaps[:, 0] / np.maximum(swaps[:, 1], 1),
+    )
+
+
+def _step(state, log_likelihood, bounds, beta, rng, adapt):
+    theta, current = state["theta"], state["log_likelihood"]
+    scale = state["scale"]
+
+    proposed = theta + scale[:, None, None] * rng.standard_normal(theta.shape)
+    inside = np.all((proposed >= bounds[:, 0]) & (proposed <= bounds[:, 1]), axis=-1)
+    proposed_log_likelihood = np.full(current.shape, -np.inf)
+    if inside.any():
+        proposed_log_likelihood[inside] = log_likelihood(proposed[inside])
+
+    with np.errstate(invalid="ignore"):
+        log_ratio = beta[:, None] * (proposed_log_likelihood - current)
+    accept = np.log(rng.uniform(size=current.shape)) < log_ratio
+    theta[accept] = proposed[accept]
+    current[accept] = proposed_log_likelihood[accept]
+    rate = accept.mean(axis=1)
+    if adapt:
+        scale *= np.exp(rate - 0.234)
+    else:
+        state["accepted"] += accept.sum(axis=1)
+
+    # Swap states between neighbouring temperatures, alternating pairs.
+    for k in range(state["step"] % 2, len(beta) - 1, 2):
+        log_ratio = (beta[k] - beta[k + 1]) * (current[k + 1] - current[k])
+        swap = np.log(rng.uniform(size=log_ratio.shape)) < log_ratio
+        theta[[k, k + 1]] = np.where(
+            swap[:, None], theta[[k + 1, k]], theta[[k, k + 1]]
+        )
+        current[[k, k + 1]] = np.where(swap, current[[k + 1, k]], current[[k, k + 1]])
+        if not adapt:
+            state["swaps"][k] += swap.sum(), len(swap)
+
+
+def _save(checkpoint, state, saved):
+    """Write the samples after the first `saved` ones, then the sampler state
+    without the chain."""
+    os.makedirs(checkpoint, exist_ok=True)
+    chain = state["chain"][saved:]
+    if chain:
+        with atomic_write(os.path.join(checkpoint, f"chain_{saved:09d}.npz")) as f:
+            np.savez(
+                f,
+                chain=np.array(chain),
+                log_likelihood=np.array(state["chain_log_likelihood"][saved:]),
+            )
+    sampler = {**state, "chain": len(state["chain"]), "chain_log_likelihood": None}
+    save_pickle(os.path.join(checkpoint, "state.pkl"), sampler)
+
+
+def _load(checkpoint, key):
+    """Sampler state with its chain, or None without checkpoint."""
+    if checkpoint is None or not os.path.exists(os.path.join(checkpoint, "state.pkl")):
+        return None
+    state = load_pickle(os.path.join(checkpoint, "state.pkl"))
+    if state["key"] != key:
+        raise ValueError(f"Checkpoint {checkpoint} belongs to a different job.")
+
+    # Chunks past the saved state, left by an interrupted checkpoint, are
+    # ignored and later overwritten.
+    recorded, chain, chain_log_likelihood = state["chain"], [], []
+    for path in sorted(glob.glob(os.path.join(checkpoint, "chain_*.npz"))):
+        with np.load(path) as chunk:
+            if len(chain) + len(chunk["chain"]) > recorded:
+                break
+            chain.extend(chunk["chain"])
+            chain_log_likelihood.extend(chunk["log_likelihood"])
+    if len(chain) != recorded:
+        raise ValueError(f"Checkpoint {checkpoint} is missing samples.")
+    state["chain"], state["chain_log_likelihood"] = chain, chain_log_likelihood
+    return state
+
+
+def r_hat(chain):
+    """Split R-hat of each parameter, treating each walker as a chain.
+
+    Parameters
+    ----------
+    chain : array_like
+        Array of shape (steps, walkers, parameters).
+    """
+    chain = np.asarray(chain, dtype=float)
+    half = len(chain) // 2
+    chains = np.concatenate((chain[:half], chain[half : 2 * half]), axis=1)
+    n = len(chains)
+    within = chains.var(axis=0, ddof=1).mean(axis=0)
+    between = n * chains.mean(axis=0).var(axis=0, ddof=1)
+    variance = (n - 1) / n * within + between / n
+    return np.sqrt(variance / within)
+
+
+def effective_sample_size(chain):
+    """Effective sample size of each parameter over all walkers, from the
+    autocorrelation summed up to its first negative pair (Geyer)."""
+    chain = np.asarray(chain, dtype=float)
+    n, walkers = chain.shape[:2]
+    centered = chain - chain.mean(axis=0)
+    spectrum = np.fft.rfft(centered, n=2 * n, axis=0)
+    autocovariance = np.fft.irfft(spectrum * spectrum.conj(), axis=0)[:n]
+    autocorrelation = (autocovariance / autocovariance[0]).mean(axis=1)
+
+    pairs = autocorrelation[: n - n % 2].reshape(-1, 2, autocorrelation.shape[-1])
+    pairs = pairs.sum(axis=1)
+    positive = np.cumprod(pairs > 0, axis=0).astype(bool)
+    tau = -1 + 2 * (pairs * positive).sum(axis=0)
+    return n * walkers / np.maximum(tau, 1)
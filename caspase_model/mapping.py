@@ -0,0 +1,144 @@
+"""Automatic species name mapping between PySB and SimBio models.
+
+Correspondences are derived from an isomorphism between the reaction
+networks of both models, seen as bipartite graphs of species and reactions
+labelled by initial amounts and rate constants. Mappings can be persisted in
+a :class:`MappingIndex`, keyed by the structural fingerprints of both
+networks, so each pair of models is only matched once.
+
+Matching requires networkx, installed with the ``mapping`` extra.
+"""
+
+import json
+import os
+import re
+from collections import defaultdict
+
+from ._util import atomic_write
+from .equivalence import reachable_species
+from .fingerprint import fingerprint
+from .network import Network
+
+
+def infer_name_mapping(pysb_model, simbio_model):
+    """Map PySB species strings to SimBio species names.
+
+    Only species reachable from a non-zero initial amount are mapped.
+    Among structurally equivalent matches, the one where every PySB monomer
+    name appears in the corresponding SimBio name is preferred.
+
+    Parameters
+    ----------
+    pysb_model : pysb.Model or Network
+    simbio_model : simbio.Compartment or Network
+
+    Returns
+    -------
+    name_mapping : dict
+
+    Raises
+    ------
+    ValueError
+        If the reaction networks are not isomorphic.
+    """
+    from networkx.algorithms.isomorphism import DiGraphMatcher
+
+    if not isinstance(pysb_model, Network):
+        pysb_model = Network.from_pysb(pysb_model)
+    if not isinstance(simbio_model, Network):
+        simbio_model = Network.from_simbio(simbio_model)
+
+    pysb_graph = _graph(pysb_model)
+    simbio_graph = _graph(simbio_model)
+
+    def same_label(a, b):
+        return a["label"] == b["label"]
+
+    def same_label_and_name(a, b):
+        return same_label(a, b) and a["tokens"] <= b["tokens"]
+
+    for node_match in (same_label_and_name, same_label):
+        matcher = DiGraphMatcher(
+            pysb_graph, simbio_graph, node_match=node_match, edge_match=same_label
+        )
+        if matcher.is_isomorphic():
+            return {
+                pysb_model.species[a[1]]: simbio_model.species[b[1]]
+                for a, b in matcher.mapping.items()
+                if a[0] == "species"
+            }
+    raise ValueError("Reaction networks are not isomorphic.")
+
+
+class MappingIndex:
+    """Name mappings persisted in a JSON file.
+
+    Parameters
+    ----------
+    path : str or path
+        JSON file. It is created on first write.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._mappings = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self._mappings = json.load(f)
+
+    def get(self, pysb_model, simbio_model):
+        """Name mapping between two models, inferred and stored if missing."""
+        if not isinstance(pysb_model, Network):
+            pysb_model = Network.from_pysb(pysb_model)
+        if not isinstance(simbio_model, Network):
+            simbio_model = Network.from_simbio(simbio_model)
+
+        key = (
+            fingerprint(pysb_model).structure
+            + ":"
+            + fingerprint(simbio_model).structure
+        )
+        if key not in self._mappings:
+            self._mappings[key] = infer_name_mapping(pysb_model, simbio_model)
+            self.save()
+        return self._mappings[key]
+
+    def save(self):
+        with atomic_write(self.path, "w") as f:
+            json.dump(self._mappings, f, indent=1, sort_keys=True)
+
+
+def _graph(network):
+    """Bipartite graph of reachable species and merged reactions."""
+    from networkx import DiGraph
+
+    y0 = network.initial_amounts()
+    k = network.rate_constants()
+    reachable = reachable_species(network, y0 > 0)
+
+    reactions = defaultdict(float)
+    for i, (reactants, products) in enumerate(zip(network.reactants, network.products)):
+        if all(reachable[j] for j in reactants) and k[i] != 0:
+            reactions[tuple(sorted(reactants)), tuple(sorted(products))] += k[i]
+
+    graph = DiGraph()
+    for i in reachable.nonzero()[0]:
+        graph.add_node(
+            ("species", i), label=f"{y0[i]:.9g}", tokens=_tokens(network.species[i])
+        )
+    for n, ((reactants, products), rate) in enumerate(reactions.items()):
+        node = ("reaction", n)
+        graph.add_node(node, label=f"{rate:.9g}", tokens=frozenset())
+        for j in set(reactants):
+            graph.add_edge(("species", j), node, label=reactants.count(j))
+        for j in set(products):
+            graph.add_edge(node, ("species", j), label=products.count(j))
+    return graph
+
+
+def _tokens(name):
+    """Monomer names in a PySB species string, or name parts in a SimBio
+    species name."""
+    if "(" in name:
+        return frozenset(re.findall(r"(\w+)\(", name))
+    return frozenset(re.split(r"[._]", name))
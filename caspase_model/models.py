@@ -1,36 +1,42 @@
 from pysb import *
 from pysb.macros import *
-from pysb.util import alias_model_components
 
+from .builder import exporting_to
 from .modules import pore_to_parp_double_apop
 from .shared import add_apaf_biosensor_cleavage, add_biosensors, choose_stimuli
 
 
-def albeck_as_matlab():
-    """Loads model as stated in Albeck's 2008 paper."""
+def _albeck_11e(pore_to_parp):
+    """Builds Albeck's 11e model with the given downstream section and the
+    corrections needed to match Albeck's 2008 paper.
+
+    pore_to_parp: Callable
+        Receives the model and adds the rules from pore to PARP cleavage.
+    """
     from earm import albeck_modules
 
-    model = Model()
+    model = Model(__name__, _export=False)
 
-    # Declare monomers
-    albeck_modules.all_monomers()
+    with exporting_to(model):
+        # Declare monomers
+        albeck_modules.all_monomers()
 
-    # Generate the upstream and downstream sections
-    albeck_modules.rec_to_bid()
-    albeck_modules.pore_to_parp()
+        # Generate the upstream and downstream sections
+        albeck_modules.rec_to_bid()
+        pore_to_parp(model)
 
-    # The specific MOMP model to use
-    albeck_modules.albeck_11e()
+        # The specific MOMP model to use
+        albeck_modules.albeck_11e()
 
-    # Add citoplasmic Bcl2 as it was in Albeck's model because it's absent in
-    # EARM implementation.
-    Monomer("Bcl2c", ["b"])
-    Parameter("Bcl2c_0", 2e4)
+        # Add citoplasmic Bcl2 as it was in Albeck's model because it's absent
+        # in EARM implementation.
+        Bcl2c = Monomer("Bcl2c", ["b"])
+        Bcl2c_0 = Parameter("Bcl2c_0", 2e4)
 
-    alias_model_components()
-    Initial(Bcl2c(b=None), Bcl2c_0)
+        Initial(Bcl2c(b=None), Bcl2c_0)
 
-    bind(Bid(bf=None, state="T"), "bf", Bcl2c(b=None), "b", [1e-6, 0.001])
+        Bid = model.monomers["Bid"]
+        bind(Bid(bf=None, state="T"), "bf", Bcl2c(b=None), "b", [1e-6, 0.001])
 
     # There is another discrepancy in C8A and Bid kf
     model.parameters["bind_C8A_BidU_to_C8ABidU_kf"].value = 1e-7
@@ -38,17 +44,22 @@ def albeck_as_matlab():
     return model
 
 
+def albeck_as_matlab():
+    """Loads model as stated in Albeck's 2008 paper."""
+    from earm import albeck_modules
+
+    return _albeck_11e(lambda model: albeck_modules.pore_to_parp())
+
+
 def corbat_2018(stimuli="extrinsic", add_CASPAM=True):
     """EARM model as modified by Corbat et al. (2018)."""
     model = albeck_as_matlab()
     if add_CASPAM:
-        add_biosensors()
-
-    alias_model_components()
+        add_biosensors(model)
 
-    XIAP_0.value = 1e2
-    L_0.value = 1e3
-    R_0.value = 1e3
+    model.parameters["XIAP_0"].value = 1e2
+    model.parameters["L_0"].value = 1e3
+    model.parameters["R_0"].value = 1e3
 
     model = choose_stimuli(model, stimuli)
 
@@ -66,36 +77,11 @@ def arm(stimuli="extrinsic", add_CASPAM=True):
     add_CASPAM: bool (default: True)
         if True, CASPAM biosensors are added to the model
     """
-    from earm import albeck_modules
-
-    model = Model()
-
-    # Declare monomers
-    albeck_modules.all_monomers()
-
-    # Generate the upstream and downstream sections
-    albeck_modules.rec_to_bid()
-    pore_to_parp_double_apop()
-
-    # The specific MOMP model to use
-    albeck_modules.albeck_11e()
-
-    # Add citoplasmic Bcl2 as it was in Albeck's model because it's absent in
-    # EARM implementation.
-    Monomer("Bcl2c", ["b"])
-    Parameter("Bcl2c_0", 2e4)
-
-    alias_model_components()
-    Initial(Bcl2c(b=None), Bcl2c_0)
-
-    bind(Bid(bf=None, state="T"), "bf", Bcl2c(b=None), "b", [1e-6, 0.001])
-
-    # There is another discrepancy in C8A and Bid kf
-    model.parameters["bind_C8A_BidU_to_C8ABidU_kf"].value = 1e-7
+    model = _albeck_11e(pore_to_parp_double_apop)
 
     if add_CASPAM:
         # Add biosensors and their perturbation
-        add_biosensors()
+        add_biosensors(model)
 
         model.parameters["dsCas3_0"].value = 7.5e5
         model.parameters["dsCas8_0"].value = 7.5e5
@@ -106,7 +92,7 @@ def arm(stimuli="extrinsic", add_CASPAM=True):
         model.parameters["bind_sCas9sCas9_Apop_kf"].value = 2.8e-07
 
         # Add interaction between single activation
-        add_apaf_biosensor_cleavage()
+        add_apaf_biosensor_cleavage(model)
 
     # Other parameters that need to be corrected
     model.parameters["L_0"].value = 1e3
@@ -119,31 +105,6 @@ def arm(stimuli="extrinsic", add_CASPAM=True):
 def albeck_apoptosome_corrected(stimuli="extrinsic"):
     """to_deprecate: Loads model as stated in Albeck's 2008 paper and modifies
     apoptosome dyanmics."""
-    from earm import albeck_modules
-
-    model = Model()
-
-    # Declare monomers
-    albeck_modules.all_monomers()
-
-    # Generate the upstream and downstream sections
-    albeck_modules.rec_to_bid()
-    pore_to_parp_double_apop()
-
-    # The specific MOMP model to use
-    albeck_modules.albeck_11e()
-
-    # Add citoplasmic Bcl2 as it was in Albeck's model because it's absent in
-    # EARM implementation.
-    Monomer("Bcl2c", ["b"])
-    Parameter("Bcl2c_0", 2e4)
-
-    alias_model_components()
-    Initial(Bcl2c(b=None), Bcl2c_0)
-
-    bind(Bid(bf=None, state="T"), "bf", Bcl2c(b=None), "b", [1e-6, 0.001])
-
-    # There is another discrepancy in C8A and Bid kf
-    model.parameters["bind_C8A_BidU_to_C8ABidU_kf"].value = 1e-7
+    model = _albeck_11e(pore_to_parp_double_apop)
 
     return choose_stimuli(model, stimuli)
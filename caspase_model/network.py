@@ -0,0 +1,369 @@
+"""Mass-action reaction networks compiled to NumPy arrays.
+
+A :class:`Network` holds the expanded reaction network of a model (species,
+reactions, rate constants and initial conditions) as plain arrays, so it can
+be simulated without going back to the modelling engine.
+"""
+
+import hashlib
+
+import numpy as np
+
+
+class Network:
+    """Mass-action reaction network.
+
+    Parameters
+    ----------
+    species : sequence of str
+        Species names.
+    parameters : sequence of str
+        Parameter names.
+    values : array_like
+        Default parameter values, in the same order as `parameters`.
+    reactants, products : sequence of sequence of int
+        Species indexes consumed and produced by each reaction. Repeated
+        indexes account for stoichiometry.
+    rate_parameters : sequence of int
+        Index of the parameter used as rate constant of each reaction.
+    rate_factors : sequence of float, optional
+        Statistical factor multiplying each rate constant (default: 1).
+    initial_species, initial_parameters : sequence of int, optional
+        Species whose initial amount is given by a parameter, and the
+        corresponding parameter indexes. Other species start at 0.
+    observables : dict of str to array_like, optional
+        Observables as coefficient vectors over species.
+    """
+
+    def __init__(
+        self,
+        species,
+        parameters,
+        values,
+        reactants,
+        products,
+        rate_parameters,
+        rate_factors=None,
+        initial_species=(),
+        initial_parameters=(),
+        observables=None,
+    ):
+        self.species = tuple(species)
+        self.parameters = tuple(parameters)
+        self.values = np.asarray(values, dtype=float)
+        self.reactants = tuple(tuple(r) for r in reactants)
+        self.products = tuple(tuple(p) for p in products)
+        self.rate_parameters = np.asarray(rate_parameters, dtype=int)
+        if rate_factors is None:
+            rate_factors = np.ones(len(self.reactants))
+        self.rate_factors = np.asarray(rate_factors, dtype=float)
+        self.initial_species = np.asarray(initial_species, dtype=int)
+        self.initial_parameters = np.asarray(initial_parameters, dtype=int)
+
+        observables = observables or {}
+        self.observables = tuple(observables)
+        self.observable_matrix = np.zeros((len(observables), len(self.species)))
+        for i, coefficients in enumerate(observables.values()):
+            self.observable_matrix[i] = coefficients
+
+        n_species = len(self.species)
+        n_reactions = len(self.reactants)
+
+        # Reactant indexes padded with a virtual species held at 1, so that
+        # fluxes are a product over a rectangular array.
+        width = max((len(r) for r in self.reactants), default=0)
+        self.reactant_index = np.full((n_reactions, width), n_species)
+        for i, r in enumerate(self.reactants):
+            self.reactant_index[i, : len(r)] = r
+
+        self.stoichiometry = np.zeros((n_species, n_reactions))
+        for i, (r, p) in enumerate(zip(self.reactants, self.products)):
+            np.add.at(self.stoichiometry[:, i], list(r), -1)
+            np.add.at(self.stoichiometry[:, i], list(p), 1)
+
+    def __repr__(self):
+        return (
+            f"<Network {len(self.species)} species, "
+            f"{len(self.reactants)} reactions, {len(self.parameters)} parameters>"
+        )
+
+    @classmethod
+    def from_pysb(cls, model):
+        """Compile a PySB model, generating its reaction network if needed."""
+        from pysb.bng import generate_equations
+
+        generate_equations(model)
+
+        parameters = model.parameters.keys()
+        parameter_index = {name: i for i, name in enumerate(parameters)}
+
+        rate_parameters, rate_factors = [], []
+        for reaction in model.reactions:
+            rate = reaction["rate"]
+            names = [s.name for s in rate.free_symbols if s.name in parameter_index]
+            if len(names) != 1:
+                raise ValueError(f"Rate {rate} is not mass-action.")
+            rate_parameters.append(parameter_index[names[0]])
+            rate_factors.append(float(rate.subs({s: 1 for s in rate.free_symbols})))
+
+        initial_species, initial_parameters = [], []
+        for initial in model.initials:
+            if initial.value.name not in parameter_index:
+                raise ValueError(f"Initial {initial} is not given by a Parameter.")
+            initial_species.append(model.get_species_index(initial.pattern))
+            initial_parameters.append(parameter_index[initial.value.name])
+
+        observables = {}
+        for observable in model.observables:
+            coefficients = np.zeros(len(model.species))
+            np.add.at(coefficients, observable.species, observable.coefficients)
+            observables[observable.name] = coefficients
+
+        return cls(
+            species=map(str, model.species),
+            parameters=parameters,
+            values=[p.value for p in model.parameters],
+            reactants=[r["reactants"] for r in model.reactions],
+            products=[r["products"] for r in model.reactions],
+            rate_parameters=rate_parameters,
+            rate_factors=rate_factors,
+            initial_species=initial_species,
+            initial_parameters=initial_parameters,
+            observables=observables,
+        )
+
+    @classmethod
+    def from_simbio(cls, model):
+        """Compile a SimBio compartment.
+
+        Every single reaction of the compartment must be mass-action, with
+        species (optionally scaled by a stoichiometric coefficient) as
+        `reactants` and `products` and a `rate` parameter. The initial amount
+        of each species becomes a parameter named after it with a ``_0``
+        suffix, as in PySB models.
+
+        Species are named by their path in the compartment, such as
+        ``C8.pro``. A ValueError is raised if two species share a name.
+        """
+        species, parameters, values = {}, {}, []
+
+        def parameter_index(parameter):
+            if parameter.name not in parameters:
+                parameters[parameter.name] = len(values)
+                values.append(parameter.value)
+            return parameters[parameter.name]
+
+        def species_indexes(refs):
+            indexes = []
+            for ref in refs:
+                s = getattr(ref, "species", ref)
+                if s.name not in species:
+                    species[s.name] = (len(species), s)
+                elif species[s.name][1] is not s:
+                    raise ValueError(f"Two species of {model} are named {s.name}.")
+                indexes += [species[s.name][0]] * int(getattr(ref, "stoichiometry", 1))
+            return indexes
+
+        reactants, products, rate_parameters = [], [], []
+        for reaction in model._reactions.values():
+            reactants.append(species_indexes(reaction.reactants))
+            products.append(species_indexes(reaction.products))
+            rate_parameters.append(parameter_index(reaction.rate))
+
+        initial_parameters = []
+        for name, (_, s) in species.items():
+            parameters[name + "_0"] = len(values)
+            initial_parameters.append(len(values))
+            values.append(s.value)
+
+        return cls(
+            species=species,
+            parameters=parameters,
+            values=values,
+            reactants=reactants,
+            products=products,
+            rate_parameters=rate_parameters,
+            initial_species=range(len(species)),
+            initial_parameters=initial_parameters,
+        )
+
+    def digest(self):
+        """Hex digest identifying the compiled network.
+
+        It covers species, parameter names, reactions and observables in
+        their compiled order, as parameter and species vectors are
+        positional. Parameter values are not included.
+        """
+        h = hashlib.sha256()
+        for names in (self.species, self.parameters, self.observables):
+            h.update("\0".join(names).encode())
+            h.update(b"\1")
+        for array in (
+            self.reactant_index,
+            self.stoichiometry,
+            self.rate_parameters,
+            self.rate_factors,
+            self.initial_species,
+            self.initial_parameters,
+            self.observable_matrix,
+        ):
+            array = np.ascontiguousarray(array)
+            h.update(str((array.dtype.str, array.shape)).encode())
+            h.update(array.tobytes())
+        return h.hexdigest()
+
+    def rate_constants(self, params=None):
+        """Rate constant of each reaction. Accepts batches of parameters."""
+        params = self.values if params is None else np.asarray(params, dtype=float)
+        return self.rate_factors * params[..., self.rate_parameters]
+
+    def initial_amounts(self, params=None):
+        """Initial amount of each species. Accepts batches of parameters."""
+        params = self.values if params is None else np.asarray(params, dtype=float)
+        y0 = np.zeros(params.shape[:-1] + (len(self.species),))
+        y0[..., self.initial_species] = params[..., self.initial_parameters]
+        return y0
+
+    def fluxes(self, y, k):
+        """Flux of each reaction for amounts `y` and rate constants `k`."""
+        y = np.asarray(y, dtype=float)
+        y = np.concatenate((y, np.ones(y.shape[:-1] + (1,))), axis=-1)
+        return k * y[..., self.reactant_index].prod(axis=-1)
+
+    def rhs(self, t, y, k):
+        """Time derivative of species amounts."""
+        return self.fluxes(y, k) @ self.stoichiometry.T
+
+    def jacobian(self, t, y, k):
+        """Jacobian of :meth:`rhs` with respect to species amounts."""
+        y = np.asarray(y, dtype=float)
+        n_species = len(self.species)
+        y = np.concatenate((y, np.ones(y.shape[:-1] + (1,))), axis=-1)
+        factors = y[..., self.reactant_index]
+        width = self.reactant_index.shape[1]
+        n_reactions = len(self.reactants)
+
+        partials = np.zeros(y.shape[:-1] + (n_reactions, n_species + 1))
+        reaction = np.arange(n_reactions)
+        for slot in range(width):
+            others = np.delete(factors, slot, axis=-1).prod(axis=-1)
+            np.add.at(
+                partials,
+                (..., reaction, self.reactant_index[:, slot]),
+                k * others,
+            )
+        return self.stoichiometry @ partials[..., :n_species]
+
+    def stoichiometric_subspace(self):
+        """Orthonormal bases of the stoichiometric subspace and of the
+        conservation laws.
+
+        Returns
+        -------
+        basis : ndarray
+            Array of shape (number of species, rank), spanning the directions
+            in which species amounts can change.
+        conservation : ndarray
+            Array of shape (number of species - rank, number of species),
+            whose rows are conserved linear combinations of species amounts.
+        """
+        u, s, _ = np.linalg.svd(self.stoichiometry)
+        rank = int((s > s.max(initial=0) * 1e-10).sum())
+        return u[:, :rank], u[:, rank:].T
+
+    def observe(self, y):
+        """Observables for species amounts `y`, stacked in the last axis."""
+        return np.asarray(y) @ self.observable_matrix.T
+
+    def simulate(
+        self,
+        t,
+        params=None,
+        y0=None,
+        method="LSODA",
+        rtol=1e-6,
+        atol=1e-6,
+        dense_output=False,
+    ):
+        """Integrate the network and return species amounts at times `t`.
+
+        Parameters
+        ----------
+        t : array_like
+            Output times. Integration starts at ``t[0]``.
+        params : array_like, optional
+            Parameter vector (default: :attr:`values`).
+        y0 : array_like, optional
+            Initial species amounts (default: computed from `params`).
+        method, rtol, atol
+            Passed to :func:`scipy.integrate.solve_ivp`.
+        dense_output : bool
+            If True, return a :class:`~caspase_model.trajectory.Trajectory`
+            that can be evaluated at any time between ``t[0]`` and ``t[-1]``
+            instead of values at `t`.
+
+        Returns
+        -------
+        y : ndarray or Trajectory
+            Array of shape (len(t), number of species).
+
+        See Also
+        --------
+        sample : Output at times chosen adaptively.
+        """
+        from scipy.integrate import solve_ivp
+
+        t = np.asarray(t, dtype=float)
+        params = self.values if params is None else np.asarray(params, dtype=float)
+        y0 = self.initial_amounts(params) if y0 is None else np.asarray(y0, float)
+        k = self.rate_constants(params)
+
+        result = solve_ivp(
+            self.rhs,
+            (t[0], t[-1]),
+            y0,
+            method=method,
+            t_eval=None if dense_output else t,
+            args=(k,),
+            jac=self.jacobian,
+            rtol=rtol,
+            atol=atol,
+        )
+        if not result.success:
+            raise RuntimeError(result.message)
+        if dense_output:
+            from .trajectory import Trajectory
+
+            y = result.y.T
+            return Trajectory(result.t, y, self.rhs(None, y, k))
+        return result.y.T
+
+    def sample(self, t_span, n, params=None, y0=None, observables=True, **options):
+        """Integrate the network and return `n` adaptively placed outputs.
+
+        Output times concentrate where observables (or every species, if
+        `observables` is False or there are none) change fastest, such as
+        around MOMP and effector caspase activation.
+
+        Parameters
+        ----------
+        t_span : tuple of float
+            Start and end times.
+        n : int
+            Maximum number of output times.
+        params, y0, options
+            As in :meth:`simulate`.
+
+        Returns
+        -------
+        t : ndarray
+            Output times, at most `n`.
+        y : ndarray
+            Array of shape (len(t), number of species).
+        """
+        trajectory = self.simulate(t_span, params, y0, dense_output=True, **options)
+        weights = None
+        if observables and self.observables:
+            weights = self.observable_matrix
+        t = trajectory.adaptive_times(n, weights)
+        return t, trajectory(t)
@@ -0,0 +1,190 @@
+"""Populations of cells sharing an extracellular compartment.
+
+In dense cultures, ligand bound and internalized by each cell is depleted
+from the medium all cells are bathed in, so cells are coupled through the
+amount of ligand left. A :class:`Population` integrates heterogeneous cells,
+each with its own parameter vector, together with well-mixed shared species
+as one system:
+
+- each cell sees the same amount of every shared species, in units of its
+  own volume, and its reactions consume or release them as they would in
+  the single-cell network,
+- the shared amounts change by the sum of those contributions divided by
+  the ratio between the volume of the medium and that of a cell.
+
+A single cell with a volume ratio of 1 is therefore the original network,
+and an infinite volume ratio keeps shared species constant. The Jacobian of
+the coupled system is block diagonal, one block per cell, plus rows and
+columns for the shared species. Its sparsity structure is fixed by the
+network, so only the values of the structural nonzeros of every cell are
+computed, and the cost of every step grows linearly with the number of
+cells.
+"""
+
+import numpy as np
+
+
+class Population:
+    """Cells of `network` coupled through shared species.
+
+    Parameters
+    ----------
+    network : Network
+    shared : sequence of str
+        Names of the species in the shared compartment, such as ``"L"`` (or
+        ``"L(bf=None)"`` in networks compiled from PySB).
+    volume_ratio : float
+        Volume of the shared compartment relative to that of one cell.
+    """
+
+    def __init__(self, network, shared=("L",), volume_ratio=1.0):
+        self.network = network
+        self.shared = np.array([network.species.index(name) for name in shared])
+        self.volume_ratio = float(volume_ratio)
+        n_species = len(network.species)
+        self.cell_species = np.setdiff1d(np.arange(n_species), self.shared)
+
+        # Structural nonzeros of the single-cell Jacobian: species changed by
+        # a reaction depend on every reactant of that reaction. Each nonzero
+        # sums the partial derivatives of fluxes with respect to reactant
+        # slots, times stoichiometric coefficients.
+        self._reactions, self._slots = np.nonzero(network.reactant_index < n_species)
+        stoichiometry = network.stoichiometry[:, self._reactions]
+        changed, term = np.nonzero(stoichiometry)
+        reactant = network.reactant_index[self._reactions, self._slots][term]
+        entries, entry = np.unique(changed * n_species + reactant, return_inverse=True)
+        self._rows, self._columns = np.divmod(entries, n_species)
+        # Terms sorted by entry, each entry starting at its first term.
+        order = np.argsort(entry, kind="stable")
+        self._terms = term[order]
+        self._coefficients = stoichiometry[changed, term][order]
+        self._starts = np.searchsorted(entry[order], np.arange(len(entries)))
+
+    def state(self, y):
+        """Shared amounts and cell amounts, of shape (cells, number of
+        species), packed into the state vector of the coupled system.
+
+        Shared amounts are taken as their mean over cells."""
+        y = np.asarray(y, dtype=float)
+        return np.concatenate(
+            (y[:, self.shared].mean(axis=0), y[:, self.cell_species].ravel())
+        )
+
+    def amounts(self, state):
+        """Species amounts of each cell, of shape (..., cells, number of
+        species), from (a trailing axis of) states of the coupled system."""
+        state = np.asarray(state, dtype=float)
+        n_shared, n_cell = len(self.shared), len(self.cell_species)
+        cells = state[..., n_shared:].reshape(state.shape[:-1] + (-1, n_cell))
+        y = np.empty(cells.shape[:-1] + (len(self.network.species),))
+        y[..., self.cell_species] = cells
+        y[..., self.shared] = state[..., None, :n_shared]
+        return y
+
+    def rhs(self, t, state, k):
+        """Time derivative of the state, for rate constants `k` of each cell."""
+        dy = self.network.rhs(t, self.amounts(state), k)
+        return np.concatenate(
+            (
+                dy[:, self.shared].sum(axis=0) / self.volume_ratio,
+                dy[:, self.cell_species].ravel(),
+            )
+        )
+
+    def jacobian(self, t, state, k):
+        """Sparse Jacobian of :meth:`rhs`."""
+        from scipy.sparse import csc_matrix
+
+        values = self._values(self.amounts(state), k)
+        rows = self._index(self._rows, len(k))
+        columns = self._index(self._columns, len(k))
+        shared_rows = np.isin(self._rows, self.shared)
+        values[:, shared_rows] /= self.volume_ratio
+        # Duplicate entries, from every cell onto shared species, are summed.
+        size = len(state)
+        return csc_matrix(
+            (values.ravel(), (rows.ravel(), columns.ravel())), shape=(size, size)
+        )
+
+    def simulate(
+        self,
+        t,
+        params=None,
+        y0=None,
+        method="BDF",
+        rtol=1e-6,
+        atol=1e-6,
+    ):
+        """Integrate the population and return species amounts at times `t`.
+
+        Parameters
+        ----------
+        t : array_like
+            Output times. Integration starts at ``t[0]``.
+        params : array_like, optional
+            Parameter vectors of each cell, of shape (cells, number of
+            parameters). Defaults to a single cell with
+            :attr:`Network.values`.
+        y0 : array_like, optional
+            Initial species amounts of each cell (default: computed from
+            `params`). Initial shared amounts are the mean over cells.
+        method : str
+            Method of :func:`scipy.integrate.solve_ivp` that accepts sparse
+            Jacobians ("BDF" or "Radau").
+        rtol, atol
+            Passed to :func:`scipy.integrate.solve_ivp`.
+
+        Returns
+        -------
+        y : ndarray
+            Array of shape (cells, len(t), number of species), where shared
+            species hold the amount in the shared compartment.
+        """
+        from scipy.integrate import solve_ivp
+
+        network = self.network
+        t = np.asarray(t, dtype=float)
+        params = network.values if params is None else np.asarray(params, float)
+        params = np.atleast_2d(params)
+        y0 = network.initial_amounts(params) if y0 is None else np.asarray(y0, float)
+        k = network.rate_constants(params)
+
+        result = solve_ivp(
+            self.rhs,
+            (t[0], t[-1]),
+            self.state(np.broadcast_to(y0, (len(params), len(network.species)))),
+            method=method,
+            t_eval=t,
+            args=(k,),
+            jac=self.jacobian,
+            rtol=rtol,
+            atol=atol,
+        )
+        if not result.success:
+            raise RuntimeError(result.message)
+        return np.moveaxis(self.amounts(result.y.T), 0, 1)
+
+    def _values(self, y, k):
+        """Structural nonzeros of the single-cell Jacobian of each cell, of
+        shape (cells, len(self._rows)), without dense per-cell blocks."""
+        network = self.network
+        y = np.concatenate((y, np.ones((len(y), 1))), axis=-1)
+        factors = y[:, network.reactant_index]
+        width = network.reactant_index.shape[1]
+        partials = np.stack(
+            [np.delete(factors, slot, axis=-1).prod(axis=-1) for slot in range(width)],
+            axis=-1,
+        )
+        partials = (k[..., None] * partials)[:, self._reactions, self._slots]
+        contributions = partials[:, self._terms] * self._coefficients
+        return np.add.reduceat(contributions, self._starts, axis=1)
+
+    def _index(self, species, n_cells):
+        """Position in the state of each cell's `species`, of shape (cells,
+        len(species))."""
+        n_shared, n_cell = len(self.shared), len(self.cell_species)
+        position = np.empty(len(self.network.species), dtype=int)
+        position[self.shared] = np.arange(n_shared)
+        position[self.cell_species] = n_shared + np.arange(n_cell)
+        offset = np.where(np.isin(species, self.shared), 0, n_cell)
+        return position[species] + offset * np.arange(n_cells)[:, None]
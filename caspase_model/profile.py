@@ -0,0 +1,245 @@
+"""Profile likelihood identifiability analysis.
+
+The profile of a parameter is the minimum of the objective (``-2 log L``,
+such as a chi-square) over all other parameters, as the profiled one is
+moved away from its optimum. Each profile point is optimized starting from
+the optimum of the previous point, and the step along the profile adapts so
+that the objective increases by roughly a fixed fraction of the confidence
+threshold per step. Profiles of different parameters are independent and
+run concurrently through an executor such as a process pool.
+
+The confidence interval of a parameter is where its profile stays below the
+optimum plus the chi-square quantile with one degree of freedom (3.84 for
+95 %, that is 1.92 in log-likelihood). A parameter whose profile does not
+reach the threshold on one side is practically non-identifiable, and one
+whose profile is flat is structurally non-identifiable.
+"""
+
+from collections import namedtuple
+from functools import partial
+
+import numpy as np
+
+Profile = namedtuple(
+    "Profile", ["parameter", "values", "chi2", "optima", "interval", "identifiability"]
+)
+Profile.__doc__ = """Profile of one parameter.
+
+values : profiled values (log parameters), sorted.
+chi2 : objective increase over the optimum at each value.
+optima : optimal log parameters at each value.
+interval : confidence interval bounds, infinite if not reached.
+identifiability : "identifiable", "practically non-identifiable" or
+    "structurally non-identifiable".
+"""
+
+
+class ChiSquare:
+    """Chi-square of observables against data, as a function of the
+    natural logarithm of the estimated parameters.
+
+    Parameters
+    ----------
+    network : Network
+    t : array_like
+        Measurement times. The simulation starts at ``t[0]``.
+    data : array_like
+        Measured observables of shape (len(t), len(observables)). NaN
+        values are ignored.
+    sigma : float or array_like
+        Measurement standard deviation, broadcast against `data`.
+    estimated : sequence of str
+        Names of the estimated parameters.
+    observables : sequence of str, optional
+        Names of the measured observables (default: all).
+    options
+        Passed to :meth:`Network.simulate`.
+    """
+
+    def __init__(self, network, t, data, sigma, estimated, observables=None, **options):
+        self.network = network
+        self.t = np.asarray(t, dtype=float)
+        self.data = np.asarray(data, dtype=float)
+        self.sigma = np.broadcast_to(sigma, self.data.shape)
+        self.estimated = [network.parameters.index(name) for name in estimated]
+        observables = network.observables if observables is None else observables
+        self.observables = [network.observables.index(name) for name in observables]
+        self.options = options
+
+    def params(self, theta):
+        """Parameter vector for log parameters `theta`."""
+        params = self.network.values.copy()
+        params[self.estimated] = np.exp(theta)
+        return params
+
+    def __call__(self, theta):
+        try:
+            y = self.network.simulate(self.t, self.params(theta), **self.options)
+        except RuntimeError:
+            return np.inf
+        residuals = (
+            self.network.observe(y)[:, self.observables] - self.data
+        ) / self.sigma
+        return float(np.nansum(residuals**2))
+
+
+def profile(
+    objective,
+    theta,
+    index,
+    threshold=3.84,
+    bounds=(-10, 10),
+    step=0.1,
+    max_points=50,
+    names=None,
+    method="L-BFGS-B",
+):
+    """Profile one parameter in both directions from the optimum `theta`.
+
+    Parameters
+    ----------
+    objective : callable
+        Function of the log parameter vector to minimize.
+    theta : array_like
+        Optimal log parameters.
+    index : int
+        Index of the profiled parameter in `theta`.
+    threshold : float
+        Objective increase defining the confidence interval.
+    bounds : tuple of float
+        Maximum deviation of the profiled parameter from its optimum.
+    step : float
+        Initial step along the profile.
+    max_points : int
+        Maximum number of points on each side.
+    names : sequence of str, optional
+        Parameter names, to label the result.
+    method : str
+        Method of :func:`scipy.optimize.minimize` used to optimize the other
+        parameters.
+
+    Returns
+    -------
+    profile : Profile
+    """
+    theta = np.asarray(theta, dtype=float)
+    minimum = objective(theta)
+    sides = [
+        _profile_side(
+            objective,
+            theta,
+            index,
+            minimum,
+            direction,
+            threshold,
+            bounds,
+            step,
+            max_points,
+            method,
+        )
+        for direction in (-1, 1)
+    ]
+    (left, left_chi2, left_optima), (right, right_chi2, right_optima) = sides
+    values = np.array([*left[::-1], theta[index], *right])
+    chi2 = np.array([*left_chi2[::-1], 0, *right_chi2])
+    optima = np.array([*left_optima[::-1], theta, *right_optima])
+
+    interval = (
+        _crossing([theta[index], *left], [0, *left_chi2], threshold, -np.inf),
+        _crossing([theta[index], *right], [0, *right_chi2], threshold, np.inf),
+    )
+    if chi2.max() < 0.01 * threshold:
+        identifiability = "structurally non-identifiable"
+    elif np.isinf(interval).any():
+        identifiability = "practically non-identifiable"
+    else:
+        identifiability = "identifiable"
+    name = index if names is None else names[index]
+    return Profile(name, values, chi2, optima, interval, identifiability)
+
+
+def profile_all(objective, theta, names=None, executor=None, **options):
+    """Profiles of every parameter, computed concurrently with `executor`
+    (such as a :class:`concurrent.futures.ProcessPoolExecutor`) if given.
+
+    `objective` must be picklable to use a process pool, as
+    :class:`ChiSquare` is. Other options are passed to :func:`profile`.
+    """
+    function = partial(profile, objective, theta, names=names, **options)
+    return list((executor.map if executor else map)(function, range(len(theta))))
+
+
+def report(profiles):
+    """Text table of confidence intervals and identifiability."""
+    lines = [f"{'parameter':<20} {'lower':>10} {'upper':>10}  identifiability"]
+    for p in profiles:
+        lower, upper = p.interval
+        lines.append(
+            f"{p.parameter!s:<20} {lower:>10.3g} {upper:>10.3g}  {p.identifiability}"
+        )
+    return "\n".join(lines)
+
+
+def _profile_side(
+    objective,
+    theta,
+    index,
+    minimum,
+    direction,
+    threshold,
+    bounds,
+    step,
+    max_points,
+    method,
+):
+    """Profile points on one side of the optimum, as lists of values,
+    objective increases and optima."""
+    from scipy.optimize import minimize
+
+    free = np.arange(len(theta)) != index
+    values, chi2, optima = [], [], []
+    current, target = theta.copy(), 0.1 * threshold
+    offset = 0.0
+    while len(values) < max_points:
+        trial_offset = offset + direction * step
+        if not bounds[0] <= trial_offset <= bounds[1]:
+            break
+        trial = current.copy()
+        trial[index] = theta[index] + trial_offset
+
+        def restricted(x):
+            full = trial.copy()
+            full[free] = x
+            return objective(full)
+
+        if free.any():
+            result = minimize(restricted, trial[free], method=method)
+            trial[free], value = result.x, result.fun
+        else:
+            value = objective(trial)
+        increase = value - minimum - (chi2[-1] if chi2 else 0)
+
+        if increase > 2 * target and step > 1e-4:
+            step /= 2
+            continue
+        offset, current = trial_offset, trial
+        values.append(trial[index])
+        chi2.append(value - minimum)
+        optima.append(trial)
+        if chi2[-1] > threshold:
+            break
+        if increase < target / 2:
+            step *= 1.5
+    return values, chi2, optima
+
+
+def _crossing(values, chi2, threshold, default):
+    """Value where `chi2`, increasing away from the optimum along `values`,
+    first exceeds `threshold`, linearly interpolated."""
+    values, chi2 = np.asarray(values), np.asarray(chi2)
+    above = np.flatnonzero(chi2 > threshold)
+    if not above.size:
+        return default
+    i = above[0]
+    fraction = (threshold - chi2[i - 1]) / (chi2[i] - chi2[i - 1])
+    return values[i - 1] + fraction * (values[i] - values[i - 1])
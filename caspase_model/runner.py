@@ -0,0 +1,211 @@
+"""Ensemble and sweep runners that can be interrupted and resumed.
+
+Jobs are split into work units of fixed size. Each unit of an ensemble
+draws its cells from its own random generator, seeded from a
+:class:`numpy.random.SeedSequence` spawned for that unit, so its result does
+not depend on which units ran before or where. Unit results are combined
+strictly in unit order, and each is written to its own file in a checkpoint
+directory as soon as it is computed, so checkpointing costs the same for
+every unit however long the job. A resumed job combines the saved units and
+continues with the next one, giving results bit-identical to an
+uninterrupted run. Checkpoints of another job, including one with a
+differently configured sampler or accumulators, are refused.
+"""
+
+import copy
+import math
+import os
+from functools import partial
+
+import numpy as np
+
+from ._util import job_key, load_pickle, save_pickle
+from .statistics import simulate_statistics
+
+
+def run_ensemble(
+    network,
+    t,
+    sample,
+    n_cells,
+    statistics,
+    checkpoint=None,
+    seed=0,
+    unit_size=1000,
+    executor=None,
+    job_id=None,
+    **options,
+):
+    """Accumulate statistics over an ensemble of randomly sampled cells.
+
+    Parameters
+    ----------
+    network : Network
+    t : array_like
+        Output times.
+    sample : callable
+        ``sample(rng, n)`` returns the parameter vectors of `n` cells drawn
+        with the :class:`numpy.random.Generator` `rng`. It must be picklable
+        to use a process pool.
+    n_cells : int
+    statistics : sequence
+        Empty accumulators, as in
+        :func:`~caspase_model.statistics.simulate_statistics`.
+    checkpoint : str or path, optional
+        Directory where the result of each unit is saved and resumed from.
+    seed : int
+    unit_size : int
+        Cells per work unit.
+    executor : concurrent.futures.Executor, optional
+        Runs units in parallel. Results are still combined in order.
+    job_id : str, optional
+        Identifies the sampler in the checkpoint, in place of its pickle,
+        for samplers that cannot be pickled.
+    options
+        Passed to :func:`~caspase_model.statistics.simulate_statistics`.
+
+    Returns
+    -------
+    statistics : list
+        Accumulators over all cells.
+    """
+    t = np.asarray(t, dtype=float)
+    n_units = math.ceil(n_cells / unit_size)
+    seeds = np.random.SeedSequence(seed).spawn(n_units)
+    sizes = [min(unit_size, n_cells - i * unit_size) for i in range(n_units)]
+    key = None
+    if checkpoint is not None:
+        key = job_key(
+            "ensemble",
+            network.digest(),
+            t,
+            sample if job_id is None else job_id,
+            n_cells,
+            seed,
+            unit_size,
+            options,
+            *statistics,
+        )
+    run_unit = partial(_ensemble_unit, network, t, sample, list(statistics), options)
+
+    def combine(total, part):
+        for accumulator, other in zip(total, part):
+            accumulator.merge(other)
+        return total
+
+    return _run(
+        list(zip(seeds, sizes)),
+        run_unit,
+        combine,
+        copy.deepcopy(list(statistics)),
+        checkpoint,
+        key,
+        executor,
+    )
+
+
+def run_sweep(
+    network,
+    t,
+    params,
+    function=None,
+    checkpoint=None,
+    unit_size=100,
+    executor=None,
+    job_id=None,
+    **options,
+):
+    """Simulate each parameter vector of a sweep.
+
+    Parameters
+    ----------
+    network : Network
+    t : array_like
+        Output times.
+    params : array_like
+        Parameter vectors, of shape (points, number of parameters).
+    function : callable, optional
+        Reduces the species amounts of each point, of shape (len(t), number
+        of species), to its result, such as extracted features. It must be
+        picklable to use a process pool. Defaults to the observables.
+    checkpoint, unit_size, executor
+        As in :func:`run_ensemble`.
+    job_id : str, optional
+        Identifies `function` in the checkpoint, in place of its pickle.
+    options
+        Passed to :meth:`Network.simulate`.
+
+    Returns
+    -------
+    results : ndarray
+        Results of every point stacked along the first axis.
+    """
+    t = np.asarray(t, dtype=float)
+    params = np.asarray(params, dtype=float)
+    key = None
+    if checkpoint is not None:
+        function_id = function if job_id is None else job_id
+        key = job_key(
+            "sweep", network.digest(), t, function_id, params, unit_size, options
+        )
+    units = [params[i : i + unit_size] for i in range(0, len(params), unit_size)]
+    run_unit = partial(_sweep_unit, network, t, function, options)
+
+    def combine(results, part):
+        results.append(part)
+        return results
+
+    results = _run(units, run_unit, combine, [], checkpoint, key, executor)
+    return np.concatenate(results)
+
+
+def _ensemble_unit(network, t, sample, statistics, options, unit):
+    seed, size = unit
+    statistics = copy.deepcopy(statistics)
+    params = sample(np.random.default_rng(seed), size)
+    return simulate_statistics(network, t, params, statistics, **options)
+
+
+def _sweep_unit(network, t, function, options, params):
+    results = []
+    for p in params:
+        y = network.simulate(t, p, **options)
+        results.append(network.observe(y) if function is None else function(y))
+    return np.stack(results)
+
+
+def _run(units, run_unit, combine, state, checkpoint, key, executor):
+    """Combine unit results in order, resuming from and saving each unit in
+    the `checkpoint` directory."""
+    done = 0
+    if checkpoint is not None:
+        for result in _saved_units(checkpoint, key):
+            state = combine(state, result)
+            done += 1
+
+    results = (executor.map if executor else map)(run_unit, units[done:])
+    for i, result in enumerate(results, done):
+        if checkpoint is not None:
+            save_pickle(_unit_path(checkpoint, i), result)
+        state = combine(state, result)
+    return state
+
+
+def _saved_units(checkpoint, key):
+    """Results saved in `checkpoint` for job `key`, in unit order."""
+    os.makedirs(checkpoint, exist_ok=True)
+    key_path = os.path.join(checkpoint, "key")
+    if os.path.exists(key_path):
+        if load_pickle(key_path) != key:
+            raise ValueError(f"Checkpoint {checkpoint} belongs to a different job.")
+    else:
+        save_pickle(key_path, key)
+
+    i = 0
+    while os.path.exists(_unit_path(checkpoint, i)):
+        yield load_pickle(_unit_path(checkpoint, i))
+        i += 1
+
+
+def _unit_path(checkpoint, i):
+    return os.path.join(checkpoint, f"unit_{i:06d}.pkl")
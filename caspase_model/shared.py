@@ -1,104 +1,110 @@
 from pysb import *
 from pysb.macros import *
-from pysb.util import alias_model_components
 
+from .builder import exporting_to
 from .macros import cleave_dimer
 
 
-def add_biosensors(cc=1e7):
+def add_biosensors(model, cc=1e7):
     """Add biosensors monomers to model. All start with an initial
     concentration of 1e7 and the cleaving reactions proposed in the paper by
     Corbat et al. (2018)."""
+    C3, C8, Apop = (model.monomers[name] for name in ("C3", "C8", "Apop"))
     sensors = ["sCas3", "sCas8", "sCas9"]
-    sensors_monomer = {}
-    for sensor in sensors:
-        sensors_monomer[sensor] = Monomer(
-            sensor, ["sl", "bf"]
-        )  # sl for sensitive linker and es for enzyme site
 
-    sensor_cc = {sensor: cc for sensor in sensors}
-    sensor_ini = {}
-
-    for sensor in sensors:
-        sensor_ini[sensor] = Parameter("d" + sensor + "_0", sensor_cc[sensor])
-
-    alias_model_components()
-
-    for sensor in sensors:
-        Initial(
-            sensors_monomer[sensor](sl=1, bf=None)
-            % sensors_monomer[sensor](sl=1, bf=None),
-            sensor_ini[sensor],
-        )
-
-    # Forward rates have been halved because there are two binding sites for
-    # enzymes and this causes the rate to be doubled.
-    sensor_cleavers = {
-        "sCas3": (C3(state="A"), (1e-6 / 2, 1e-2, 1)),
-        "sCas9": (Apop(bf=None), (5e-9 / 2, 1e-3, 1)),
-        "sCas8": (C8(state="A"), (1e-7 / 2, 1e-3, 1)),
-    }
-
-    for sensor in sensors:
-        dimer = sensors_monomer[sensor](sl=1, bf=None) % sensors_monomer[sensor](
-            sl=1, bf=None
-        )
-        cleave_dimer(
-            sensor_cleavers[sensor][0],
-            "bf",
-            dimer,
-            "bf",
-            "sl",
-            sensor_cleavers[sensor][1],
-        )
-
-
-def add_apaf_biosensor_cleavage():
+    with exporting_to(model):
+        sensors_monomer = {}
+        for sensor in sensors:
+            sensors_monomer[sensor] = Monomer(
+                sensor, ["sl", "bf"]
+            )  # sl for sensitive linker and es for enzyme site
+
+        sensor_cc = {sensor: cc for sensor in sensors}
+        sensor_ini = {}
+
+        for sensor in sensors:
+            sensor_ini[sensor] = Parameter("d" + sensor + "_0", sensor_cc[sensor])
+
+        for sensor in sensors:
+            Initial(
+                sensors_monomer[sensor](sl=1, bf=None)
+                % sensors_monomer[sensor](sl=1, bf=None),
+                sensor_ini[sensor],
+            )
+
+        # Forward rates have been halved because there are two binding sites for
+        # enzymes and this causes the rate to be doubled.
+        sensor_cleavers = {
+            "sCas3": (C3(state="A"), (1e-6 / 2, 1e-2, 1)),
+            "sCas9": (Apop(bf=None), (5e-9 / 2, 1e-3, 1)),
+            "sCas8": (C8(state="A"), (1e-7 / 2, 1e-3, 1)),
+        }
+
+        for sensor in sensors:
+            dimer = sensors_monomer[sensor](sl=1, bf=None) % sensors_monomer[sensor](
+                sl=1, bf=None
+            )
+            cleave_dimer(
+                sensor_cleavers[sensor][0],
+                "bf",
+                dimer,
+                "bf",
+                "sl",
+                sensor_cleavers[sensor][1],
+            )
+
+
+def add_apaf_biosensor_cleavage(model):
     """In double apoptosome activation we need the first activation of apaf to
     cleave biosensor for cas9 at a slower rate."""
+    sCas9, Apaf = model.monomers["sCas9"], model.monomers["Apaf"]
     # We need to halve the forward rate because it has two binding sites
     klist = [2e-10, 1e-3, 1]
     dimer = sCas9(sl=1, bf=None) % sCas9(sl=1, bf=None)
-    cleave_dimer(Apaf(state="A"), "bf", dimer, "bf", "sl", klist)
+    with exporting_to(model):
+        cleave_dimer(Apaf(state="A"), "bf", dimer, "bf", "sl", klist)
 
 
-def add_effector_bid_feedback():
+def add_effector_bid_feedback(model):
     """Add a feedback from effector caspase to bid as reported by
     Slee et al. (2000, doi: 10.1038/sj.cdd.4400689).
     """
+    C3, Bid = model.monomers["C3"], model.monomers["Bid"]
     klist = [1e-6, 1e-3, 1]  # Taken from caspase 3
-    catalyze(C3(state="A"), "bf", Bid(state="U"), "bf", Bid(state="T"), klist)
+    with exporting_to(model):
+        catalyze(C3(state="A"), "bf", Bid(state="U"), "bf", Bid(state="T"), klist)
 
 
-def observe_biosensors():
+def observe_biosensors(model):
     """Add biosensors in monomeric and dimeric state as observables."""
-    alias_model_components()
-    sensor_dict = {"sCas3": sCas3, "sCas8": sCas8, "sCas9": sCas9}
-
-    for sensor_name, sensor in sensor_dict.items():
-        Observable(sensor_name + "_monomer", sensor(sl=None, bf=None))
-        Observable(
-            sensor_name + "_dimer",
-            sensor(sl=1, bf=None) % sensor(sl=1, bf=None),
-            match="species",
-        )
+    sensor_dict = {name: model.monomers[name] for name in ("sCas3", "sCas8", "sCas9")}
+
+    with exporting_to(model):
+        for sensor_name, sensor in sensor_dict.items():
+            Observable(sensor_name + "_monomer", sensor(sl=None, bf=None))
+            Observable(
+                sensor_name + "_dimer",
+                sensor(sl=1, bf=None) % sensor(sl=1, bf=None),
+                match="species",
+            )
 
 
-def observe_caspases():
+def observe_caspases(model):
     """Add caspases in inactive and active state as observables."""
-    alias_model_components()
-    caspase_dict = {'Cas3': C3,
-                   'Cas8': C8,
-                   'Cas6': C6}
+    caspase_dict = {'Cas3': model.monomers['C3'],
+                    'Cas8': model.monomers['C8'],
+                    'Cas6': model.monomers['C6']}
+    C9, Apaf, Apop = (model.monomers[name] for name in ('C9', 'Apaf', 'Apop'))
 
-    for caspase_name, caspase in caspase_dict.items():
-        Observable(caspase_name + '_inactive', caspase(state='pro'))
-        Observable(caspase_name + '_active', caspase(state='A'))
+    with exporting_to(model):
+        for caspase_name, caspase in caspase_dict.items():
+            Observable(caspase_name + '_inactive', caspase(state='pro'))
+            Observable(caspase_name + '_active', caspase(state='A'))
 
-    Observable('Cas9_inactive', C9)
-    Observable('Apaf_inactive', Apaf(state='I'))
-    Observable('Apaf_active', Apaf(state='A'))
-    Observable('Apop_active', Apop)
+        Observable('Cas9_inactive', C9)
+        Observable('Apaf_inactive', Apaf(state='I'))
+        Observable('Apaf_active', Apaf(state='A'))
+        Observable('Apop_active', Apop)
 
 
 def remove_extrinsic_stimuli(model):
@@ -106,33 +112,32 @@ def remove_extrinsic_stimuli(model):
     model.parameters["L_0"].value = 0
 
 
-def intrinsic_stimuli(model=None):
-    """Add instrinsic stimuli activation through Bid truncation. If model is
-    given, then extrinsic activation is removed from it."""
+def intrinsic_stimuli(model, remove_extrinsic=True):
+    """Add instrinsic stimuli activation through Bid truncation. By default,
+    extrinsic activation is removed from the model."""
+    Bid = model.monomers["Bid"]
 
-    Monomer("IntrinsicStimuli", ["bf"])
-    Parameter("IntrinsicStimuli_0", 1e2)
+    with exporting_to(model):
+        IntrinsicStimuli = Monomer("IntrinsicStimuli", ["bf"])
+        IntrinsicStimuli_0 = Parameter("IntrinsicStimuli_0", 1e2)
 
-    alias_model_components()
+        Initial(IntrinsicStimuli(bf=None), IntrinsicStimuli_0)
 
-    Initial(IntrinsicStimuli(bf=None), IntrinsicStimuli_0)
-
-    # =====================
-    # tBid Intrinsic Activation Rules
-    # ---------------------
-    #        Bid + IntrinsicStimuli <--> Bid:IS --> tBid + IS
-    # ---------------------
-    catalyze(
-        IntrinsicStimuli(bf=None),
-        "bf",
-        Bid(state="U"),
-        "bf",
-        Bid(state="T"),
-        [1e-6, 1e-3, 1],
-    )
+        # =====================
+        # tBid Intrinsic Activation Rules
+        # ---------------------
+        #        Bid + IntrinsicStimuli <--> Bid:IS --> tBid + IS
+        # ---------------------
+        catalyze(
+            IntrinsicStimuli(bf=None),
+            "bf",
+            Bid(state="U"),
+            "bf",
+            Bid(state="T"),
+            [1e-6, 1e-3, 1],
+        )
 
-    if model:
-        # Remove extrinsic stimuli
+    if remove_extrinsic:
         remove_extrinsic_stimuli(model)
 
 
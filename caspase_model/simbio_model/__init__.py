@@ -0,0 +1,11 @@
+"""SimBio versions of the models, imported on first access."""
+
+import importlib
+
+_SUBMODULES = ("albeck", "corbat")
+
+
+def __getattr__(name):
+    if name not in _SUBMODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return importlib.import_module(f".{name}", __name__)
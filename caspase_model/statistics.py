@@ -0,0 +1,222 @@
+"""Streaming statistics over ensembles of cells.
+
+Accumulators summarize batches of trajectories as they are simulated and
+then discard them, so memory does not grow with the number of cells. Each
+accumulator keeps one summary per element of an array of fixed shape, such
+as (times, observables), and accumulators of the same shape built by
+different workers can be merged.
+
+- :class:`Moments`: count, mean and variance (Welford and Chan updates),
+- :class:`QuantileSketch`: quantiles with bounded relative error, from
+  counts over logarithmic buckets (as in DDSketch),
+- :class:`Histogram`: counts over fixed bin edges.
+"""
+
+import numpy as np
+
+
+class Moments:
+    """Mean and variance of each element.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        Shape of each sample.
+    """
+
+    def __init__(self, shape=()):
+        self.count = 0
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+
+    def update(self, x):
+        """Add a batch of samples stacked along the first axis."""
+        x = np.asarray(x, dtype=float)
+        batch = Moments(self.mean.shape)
+        batch.count = len(x)
+        if batch.count:
+            batch.mean = x.mean(axis=0)
+            batch.m2 = ((x - batch.mean) ** 2).sum(axis=0)
+        return self.merge(batch)
+
+    def merge(self, other):
+        """Add the samples summarized by `other`."""
+        count = self.count + other.count
+        if count == 0:
+            return self
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.count / count)
+        self.m2 = self.m2 + other.m2 + delta**2 * (self.count * other.count / count)
+        self.count = count
+        return self
+
+    @property
+    def variance(self):
+        """Unbiased sample variance."""
+        if self.count < 2:
+            return np.full_like(self.m2, np.nan)
+        return self.m2 / (self.count - 1)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+
+class QuantileSketch:
+    """Quantiles of each element with bounded relative error.
+
+    Values are counted in buckets whose bounds grow geometrically, so any
+    quantile of values above `min_value` is estimated within
+    `relative_accuracy`. Smaller values, including zero and negative values,
+    fall in a single bucket reported as 0. Only occupied buckets are stored,
+    as sorted pairs of element and bucket, so memory follows the range of
+    values each element actually takes.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        Shape of each sample.
+    relative_accuracy : float
+    min_value : float
+        Smallest value resolved.
+    """
+
+    # Keys are element * _STRIDE + bucket.
+    _STRIDE = 2**32
+
+    def __init__(self, shape=(), relative_accuracy=0.01, min_value=1e-3):
+        self.shape = tuple(shape)
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.min_value = min_value
+        self.offset = int(np.floor(np.log(min_value) / np.log(self.gamma)))
+        self.count = 0
+        self.keys = np.empty(0, dtype=np.int64)
+        self.counts = np.empty(0, dtype=np.int64)
+
+    def update(self, x):
+        """Add a batch of samples stacked along the first axis."""
+        x = np.asarray(x, dtype=float).reshape((-1,) + self.shape)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bucket = np.ceil(np.log(x) / np.log(self.gamma)) - self.offset
+        bucket = np.where(x > self.min_value, bucket, 0).astype(np.int64)
+        element = np.arange(int(np.prod(self.shape, dtype=int))).reshape(self.shape)
+        keys, counts = np.unique(element * self._STRIDE + bucket, return_counts=True)
+        self._add(keys, counts)
+        self.count += len(x)
+        return self
+
+    def merge(self, other):
+        """Add the samples counted by `other`."""
+        if (self.shape, self.gamma, self.min_value) != (
+            other.shape,
+            other.gamma,
+            other.min_value,
+        ):
+            raise ValueError("Cannot merge sketches with different buckets.")
+        self._add(other.keys, other.counts)
+        self.count += other.count
+        return self
+
+    def quantile(self, q):
+        """Estimated quantile `q` of each element, with `q` in [0, 1]."""
+        size = int(np.prod(self.shape, dtype=int))
+        if self.count == 0:
+            return np.full(self.shape, np.nan)
+        cumulative = self.counts.cumsum()
+        # Every element counts every sample, so element i ends at (i + 1) *
+        # count in the cumulative counts.
+        rank = np.arange(size) * self.count + q * (self.count - 1)
+        position = np.searchsorted(cumulative, rank, side="right")
+        bucket = self.keys[position] % self._STRIDE
+        value = 2 * self.gamma ** (bucket + self.offset) / (self.gamma + 1)
+        return np.where(bucket > 0, value, 0.0).reshape(self.shape)
+
+    def _add(self, keys, counts):
+        keys = np.concatenate((self.keys, keys))
+        counts = np.concatenate((self.counts, counts))
+        self.keys, inverse = np.unique(keys, return_inverse=True)
+        self.counts = np.bincount(inverse, counts, len(self.keys)).astype(np.int64)
+
+
+class Histogram:
+    """Histogram of each element over fixed bin edges.
+
+    Values outside the edges are counted in the first or last bin.
+
+    Parameters
+    ----------
+    edges : array_like
+        Increasing bin edges.
+    shape : tuple of int
+        Shape of each sample.
+    """
+
+    def __init__(self, edges, shape=()):
+        self.edges = np.asarray(edges, dtype=float)
+        self.count = 0
+        self.counts = np.zeros(tuple(shape) + (len(self.edges) - 1,), dtype=np.int64)
+
+    def update(self, x):
+        """Add a batch of samples stacked along the first axis."""
+        x = np.asarray(x, dtype=float)
+        shape, n_bins = self.counts.shape[:-1], self.counts.shape[-1]
+        x = x.reshape((len(x),) + shape)
+        index = np.clip(np.searchsorted(self.edges, x, side="right") - 1, 0, n_bins - 1)
+        element = np.arange(int(np.prod(shape, dtype=int))).reshape(shape)
+        flat = (element * n_bins + index).ravel()
+        self.counts += np.bincount(flat, minlength=self.counts.size).reshape(
+            self.counts.shape
+        )
+        self.count += len(x)
+        return self
+
+    def merge(self, other):
+        """Add the samples counted by `other`."""
+        if self.counts.shape != other.counts.shape:
+            raise ValueError("Cannot merge accumulators with different bins.")
+        self.counts += other.counts
+        self.count += other.count
+        return self
+
+
+def simulate_statistics(
+    network, t, params, statistics, batch_size=100, observables=True, **options
+):
+    """Simulate cells one by one, accumulating statistics of their outputs.
+
+    Parameters
+    ----------
+    network : Network
+    t : array_like
+        Output times.
+    params : iterable of array_like
+        Parameter vector of each cell. It can be a generator, so parameter
+        sets need not be stored either.
+    statistics : sequence
+        Accumulators with shape (len(t), number of outputs).
+    batch_size : int
+        Number of cells simulated before updating the accumulators.
+    observables : bool
+        Accumulate observables (True) or species amounts (False).
+    options
+        Passed to :meth:`Network.simulate`.
+
+    Returns
+    -------
+    statistics : sequence
+    """
+    batch = []
+
+    def flush():
+        if batch:
+            for statistic in statistics:
+                statistic.update(batch)
+            batch.clear()
+
+    for p in params:
+        y = network.simulate(t, p, **options)
+        batch.append(network.observe(y) if observables else y)
+        if len(batch) == batch_size:
+            flush()
+    flush()
+    return statistics
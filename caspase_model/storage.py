@@ -0,0 +1,200 @@
+"""Compact storage of simulated trajectories.
+
+Species amounts span many orders of magnitude but are only needed to a
+small relative precision, so trajectories can be stored in far fewer bytes
+than float64 arrays take. Codecs encode an array into a compact NumPy array
+and decode it back, with a bounded error:
+
+- :class:`Float32`: single precision, a relative error below 6e-8,
+- :class:`LogFixedPoint`: logarithms of amounts rounded to a fixed step and
+  stored as 16 or 32 bit integers, a relative error below `relative_error`,
+- :class:`DeltaLog`: the integers of :class:`LogFixedPoint` differenced
+  along time, which leaves mostly small numbers for smooth trajectories,
+  packed into the narrowest integer type and compressed with zlib.
+
+A :class:`CompressedArray` keeps an array encoded in blocks along its first
+axis (cells) and decodes only the blocks an indexing operation touches. It
+behaves as a read-only ndarray for :func:`numpy.asarray`, indexing and
+slicing, so it can be passed to analysis functions such as
+:func:`~caspase_model.features.features` or accumulators of
+:mod:`~caspase_model.statistics` in place of the array itself.
+"""
+
+import os
+import zlib
+
+import numpy as np
+
+from ._util import load_pickle, save_pickle
+
+
+class Float32:
+    """Single precision storage."""
+
+    def encode(self, y):
+        return np.asarray(y, dtype=np.float32)
+
+    def decode(self, data, shape):
+        return data.astype(float).reshape(shape)
+
+
+class LogFixedPoint:
+    """Logarithms of amounts rounded to a fixed step.
+
+    Parameters
+    ----------
+    relative_error : float
+        Maximum relative error of amounts above `floor`.
+    floor : float
+        Amounts below it, including zero and small negative amounts left by
+        the solver, are stored as zero.
+    """
+
+    def __init__(self, relative_error=1e-4, floor=1e-3):
+        self.relative_error = relative_error
+        self.floor = floor
+        self.step = 2 * np.log1p(relative_error)
+
+    def codes(self, y):
+        """Integer codes of amounts `y`, 0 for amounts below the floor."""
+        y = np.asarray(y, dtype=float)
+        above = y >= self.floor
+        logs = np.log(np.where(above, y, self.floor) / self.floor)
+        return np.where(above, np.rint(logs / self.step) + 1, 0).astype(np.int64)
+
+    def amounts(self, codes):
+        """Amounts of integer codes."""
+        y = self.floor * np.exp((codes - 1) * self.step)
+        return np.where(codes > 0, y, 0)
+
+    def encode(self, y):
+        codes = self.codes(y)
+        dtype = (
+            np.uint16 if codes.max(initial=0) <= np.iinfo(np.uint16).max else np.uint32
+        )
+        return codes.astype(dtype)
+
+    def decode(self, data, shape):
+        return self.amounts(data.astype(np.int64)).reshape(shape)
+
+
+class DeltaLog(LogFixedPoint):
+    """Codes of :class:`LogFixedPoint` differenced along time (the second
+    axis) and compressed with zlib, with the same error bound."""
+
+    def __init__(self, relative_error=1e-4, floor=1e-3, level=6):
+        super().__init__(relative_error, floor)
+        self.level = level
+
+    def encode(self, y):
+        codes = self.codes(y)
+        axis = 1 if codes.ndim > 1 else 0
+        deltas = np.diff(codes, axis=axis, prepend=0)
+        for dtype in (np.int8, np.int16, np.int32, np.int64):
+            info = np.iinfo(dtype)
+            if info.min <= deltas.min(initial=0) and deltas.max(initial=0) <= info.max:
+                break
+        compressed = zlib.compress(deltas.astype(dtype).tobytes(), self.level)
+        header = np.array([np.dtype(dtype).itemsize], dtype=np.uint8)
+        return np.concatenate((header, np.frombuffer(compressed, dtype=np.uint8)))
+
+    def decode(self, data, shape):
+        dtype = {1: np.int8, 2: np.int16, 4: np.int32, 8: np.int64}[int(data[0])]
+        deltas = np.frombuffer(zlib.decompress(data[1:].tobytes()), dtype=dtype)
+        deltas = deltas.astype(np.int64).reshape(shape)
+        codes = np.cumsum(deltas, axis=1 if len(shape) > 1 else 0)
+        return self.amounts(codes)
+
+
+class CompressedArray:
+    """Read-only array stored encoded in blocks along its first axis.
+
+    Parameters
+    ----------
+    y : array_like
+        Array to store, such as trajectories of shape (cells, times,
+        species).
+    codec : object, optional
+        :class:`Float32`, :class:`LogFixedPoint` or :class:`DeltaLog`
+        (default), or any object with the same ``encode`` and ``decode``
+        methods.
+    block_size : int
+        Number of elements along the first axis encoded together.
+    """
+
+    dtype = np.dtype(float)
+
+    def __init__(self, y, codec=None, block_size=64):
+        y = np.asarray(y, dtype=float)
+        self.codec = DeltaLog() if codec is None else codec
+        self.shape = y.shape
+        self.block_size = block_size
+        self.blocks = [
+            self.codec.encode(y[i : i + block_size])
+            for i in range(0, len(y), block_size)
+        ]
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    @property
+    def nbytes(self):
+        """Bytes taken by the encoded blocks."""
+        return sum(block.nbytes for block in self.blocks)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __repr__(self):
+        return (
+            f"<CompressedArray shape={self.shape} "
+            f"{type(self.codec).__name__}, {self.nbytes} bytes>"
+        )
+
+    def __array__(self, dtype=None, copy=None):
+        y = self._decode(range(len(self.blocks)))
+        return y if dtype is None else y.astype(dtype)
+
+    def __getitem__(self, key):
+        key = key if isinstance(key, tuple) else (key,)
+        if not key or key[0] is Ellipsis or key[0] is None:
+            return np.asarray(self)[key]
+
+        rows = np.arange(len(self))[key[0]]
+        blocks = np.unique(rows // self.block_size)
+        y = self._decode(blocks)
+        position = (
+            np.searchsorted(blocks, rows // self.block_size) * self.block_size
+            + rows % self.block_size
+        )
+        y = y[position]
+        return y[key[1:]] if rows.ndim == 0 else y[(slice(None),) + key[1:]]
+
+    def _decode(self, blocks):
+        parts = []
+        for b in blocks:
+            start = b * self.block_size
+            shape = (min(self.block_size, len(self) - start),) + self.shape[1:]
+            parts.append(self.codec.decode(self.blocks[b], shape))
+        if not parts:
+            return np.empty((0,) + self.shape[1:])
+        return np.concatenate(parts)
+
+
+def save(path, y, codec=None, block_size=64):
+    """Write `y`, compressing it unless it is a :class:`CompressedArray`,
+    and return the number of bytes written."""
+    if not isinstance(y, CompressedArray):
+        y = CompressedArray(y, codec, block_size)
+    save_pickle(path, y)
+    return os.path.getsize(path)
+
+
+def load(path):
+    """Read a :class:`CompressedArray` written by :func:`save`."""
+    return load_pickle(path)
@@ -0,0 +1,197 @@
+"""Parameter sweeps warm-started from neighbouring points.
+
+Adjacent points of a sweep give nearly identical trajectories, so
+:func:`warm_sweep` visits them in an order that keeps consecutive points
+close (:func:`locality_order`) and hands over from one point to the next:
+
+- the initial step size the solver settled on, skipping step size ramp-up,
+- the pre-stimulus steady state, used as starting guess of a chord Newton
+  iteration instead of integrating the pre-stimulus transient,
+- the LU factorization of the steady state Jacobian, reused by that
+  iteration until convergence slows down.
+
+The cost of each sweep, in right-hand side and Jacobian evaluations and LU
+factorizations, is reported so warm and cold sweeps can be compared.
+
+Newton's method converges to the steady state closest to the neighbour's,
+which is the one integration would reach unless a fold lies between both
+points.
+"""
+
+from collections import Counter, namedtuple
+
+import numpy as np
+
+from .continuation import SteadyState, species_scale
+
+SweepResult = namedtuple("SweepResult", ["y", "order", "cost"])
+SweepResult.__doc__ = """Result of a sweep.
+
+y : array of shape (points, len(t), number of species), in the order of the
+    given parameter sets.
+order : order in which points were simulated.
+cost : Counter of right-hand side evaluations ("rhs"), Jacobian evaluations
+    ("jacobian") and LU factorizations ("lu").
+"""
+
+
+def locality_order(params, log=True):
+    """Order of parameter sets visiting each one next to the previous.
+
+    Greedy nearest neighbour path, starting from the first point, over
+    parameters scaled to unit range (of their logarithms, if `log`).
+    """
+    x = np.asarray(params, dtype=float)
+    if log:
+        x = np.log(np.where(x > 0, x, np.nan))
+        x = np.where(np.isnan(x), 0, x)
+    span = np.ptp(x, axis=0)
+    x = (x - x.min(axis=0)) / np.where(span > 0, span, 1)
+
+    order = [0]
+    remaining = np.ones(len(x), dtype=bool)
+    remaining[0] = False
+    for _ in range(len(x) - 1):
+        distance = ((x - x[order[-1]]) ** 2).sum(axis=1)
+        distance[~remaining] = np.inf
+        order.append(int(distance.argmin()))
+        remaining[order[-1]] = False
+    return np.array(order, dtype=int)
+
+
+def warm_sweep(
+    network,
+    t,
+    params,
+    equilibrate=None,
+    warm=True,
+    method="LSODA",
+    rtol=1e-6,
+    atol=1e-6,
+    t_equilibrium=1e6,
+):
+    """Simulate each parameter set of a sweep, warm-starting from neighbours.
+
+    Parameters
+    ----------
+    network : Network
+    t : array_like
+        Output times.
+    params : array_like
+        Parameter sets of shape (points, number of parameters).
+    equilibrate : dict of str to float, optional
+        Parameter values before stimulation, such as ``{"L_0": 0}``. If
+        given, each point starts from the steady state with these values,
+        plus the change in initial amounts caused by the stimulus.
+    warm : bool
+        Reuse information from the previous point. If False, each point is
+        simulated cold, which is useful to measure the savings.
+    method, rtol, atol
+        Passed to :func:`scipy.integrate.solve_ivp`.
+    t_equilibrium : float
+        Integration time used to reach a steady state from scratch.
+
+    Returns
+    -------
+    result : SweepResult
+    """
+    t = np.asarray(t, dtype=float)
+    params = np.asarray(params, dtype=float)
+    order = locality_order(params) if warm else np.arange(len(params))
+    equilibrate = equilibrate or {}
+    indexes = [network.parameters.index(name) for name in equilibrate]
+    options = dict(method=method, rtol=rtol, atol=atol)
+
+    y = np.empty((len(params), len(t), len(network.species)))
+    cost = Counter()
+    first_step = steady = None
+    for i in order:
+        y0 = network.initial_amounts(params[i])
+        if equilibrate:
+            before = params[i].copy()
+            before[indexes] = list(equilibrate.values())
+            steady = _equilibrate(
+                network, before, steady if warm else None, t_equilibrium, cost, options
+            )
+            y0 = steady[0] + y0 - network.initial_amounts(before)
+
+        solution = _integrate(
+            network, t, params[i], y0, first_step if warm else None, cost, options
+        )
+        y[i] = solution.y.T
+        first_step = solution.sol.ts[1] - solution.sol.ts[0]
+    return SweepResult(y, order, cost)
+
+
+def _integrate(network, t, params, y0, first_step, cost, options):
+    from scipy.integrate import solve_ivp
+
+    result = solve_ivp(
+        network.rhs,
+        (t[0], t[-1]),
+        y0,
+        t_eval=t,
+        dense_output=True,
+        args=(network.rate_constants(params),),
+        jac=network.jacobian,
+        first_step=first_step,
+        **options,
+    )
+    if not result.success:
+        raise RuntimeError(result.message)
+    cost.update(rhs=int(result.nfev), jacobian=int(result.njev), lu=int(result.nlu))
+    return result
+
+
+def _equilibrate(network, params, previous, t_equilibrium, cost, options):
+    """Steady state, with the scale and LU factorization used to refine it.
+
+    Starts from the `previous` steady state by chord Newton iterations if
+    given, and falls back to integrating from the initial amounts.
+    """
+    if previous is not None:
+        y, scale, factorization = previous
+        system = SteadyState(network, params, [], False, scale)
+        z, factorization = _chord_newton(system, y / scale, factorization, cost)
+        if z is not None and (z * scale >= -options["atol"]).all():
+            return z * scale, scale, factorization
+
+    y0 = network.initial_amounts(params)
+    y = _integrate(network, [0, t_equilibrium], params, y0, None, cost, options).y
+    scale = species_scale(y[:, -1])
+    system = SteadyState(network, params, [], False, scale)
+    z, factorization = _chord_newton(system, y[:, -1] / scale, None, cost)
+    if z is None:
+        raise RuntimeError("Steady state did not converge.")
+    return z * scale, scale, factorization
+
+
+def _chord_newton(system, z, factorization, cost, tol=1e-10, max_iterations=50):
+    """Newton iterations reusing a factorized Jacobian while they converge
+    fast, refactorizing once otherwise. Returns (None, None) on failure."""
+    from scipy.linalg import lu_factor, lu_solve
+
+    def factorize(z):
+        cost.update(jacobian=1, lu=1)
+        return lu_factor(system.jacobian(z, []))
+
+    refreshed = factorization is None
+    if refreshed:
+        factorization = factorize(z)
+    previous = np.inf
+    for _ in range(max_iterations):
+        cost.update(rhs=1)
+        dz = lu_solve(factorization, -system.residual(z, []))
+        z = z + dz
+        norm = np.linalg.norm(dz)
+        if not np.isfinite(norm):
+            return None, None
+        if norm <= tol * (1 + np.linalg.norm(z)):
+            return z, factorization
+        if norm > 0.5 * previous:
+            if refreshed:
+                return None, None
+            factorization = factorize(z)
+            refreshed = True
+        previous = norm
+    return None, None
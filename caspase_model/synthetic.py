@@ -0,0 +1,277 @@
+"""Synthetic single-cell anisotropy datasets.
+
+Cells are drawn with lognormally distributed protein amounts around the
+initial amounts of a network, such as one compiled from :func:`arm` or
+:class:`~caspase_model.simbio_model.corbat.ARM`, and simulated in batches.
+Their biosensors are then observed as a microscope would:
+
+- each cell is imaged at one of several stage positions, visited in turn
+  every acquisition interval, so positions are sampled at shifted times,
+- the anisotropy of each sensor follows from its monomer fraction, the
+  anisotropies of monomer and dimer, and their relative brightness,
+- fluorescence bleaches with every exposure, so the anisotropy noise, which
+  grows as the inverse square root of the intensity, increases over time.
+
+:func:`generate` splits the cells into chunks, each with its own random
+generator spawned from one seed, and writes every chunk to its own file as
+soon as it is computed, so datasets of millions of cells never reside in
+memory and do not depend on how chunks are distributed among workers.
+Chunks already on disk are skipped, so an interrupted run resumes where it
+stopped.
+"""
+
+import glob
+import math
+import os
+from collections import namedtuple
+from functools import partial
+
+import numpy as np
+
+from ._util import atomic_write, job_key
+from .batch import simulate_batch
+
+SENSORS = ("sCas3", "sCas8", "sCas9")
+
+Acquisition = namedtuple(
+    "Acquisition", ["interval", "n_frames", "n_positions", "start"], defaults=(1, 0)
+)
+Acquisition.__doc__ = """Time-lapse acquisition schedule.
+
+interval : time between frames of a position.
+n_frames : number of frames per position.
+n_positions : number of stage positions, imaged in turn within each interval.
+start : time of the first frame after stimulation.
+"""
+
+Optics = namedtuple(
+    "Optics",
+    [
+        "monomer_anisotropy",
+        "dimer_anisotropy",
+        "brightness",
+        "bleaching",
+        "anisotropy_noise",
+        "intensity_noise",
+    ],
+    defaults=(0.3, 0.22, 1.0, 2e-3, 5e-3, 0.02),
+)
+Optics.__doc__ = """Anisotropy observation model.
+
+monomer_anisotropy, dimer_anisotropy : anisotropy of each sensor state.
+brightness : brightness of a monomer relative to a dimer subunit.
+bleaching : fraction of fluorescence bleached by each exposure.
+anisotropy_noise : anisotropy standard deviation at unbleached intensity.
+intensity_noise : relative standard deviation of the intensity.
+"""
+
+
+class LognormalCells:
+    """Cells with lognormally distributed parameters around the network's.
+
+    Parameters
+    ----------
+    network : Network
+    cv : float
+        Coefficient of variation of each varied parameter, whose mean is
+        kept at its value in `network`.
+    parameters : sequence of str, optional
+        Names of the varied parameters. Defaults to the nonzero initial
+        amounts, that is, protein expression levels.
+
+    Calling an instance with a :class:`numpy.random.Generator` and a number
+    of cells returns their parameter vectors, as expected by
+    :func:`~caspase_model.runner.run_ensemble`.
+    """
+
+    def __init__(self, network, cv=0.25, parameters=None):
+        self.values = network.values.copy()
+        if parameters is None:
+            indexes = network.initial_parameters
+            self.indexes = indexes[self.values[indexes] > 0]
+        else:
+            self.indexes = np.array([network.parameters.index(p) for p in parameters])
+        self.sigma = math.sqrt(math.log1p(cv**2))
+
+    def __call__(self, rng, n):
+        params = np.repeat(self.values[None], n, axis=0)
+        factors = rng.lognormal(-self.sigma**2 / 2, self.sigma, (n, len(self.indexes)))
+        params[:, self.indexes] *= factors
+        return params
+
+
+def acquisition_times(acquisition):
+    """Frame times of each position, of shape (positions, frames)."""
+    interval, n_frames, n_positions, start = acquisition
+    offsets = interval * np.arange(n_positions) / n_positions
+    return start + offsets[:, None] + interval * np.arange(n_frames)
+
+
+def anisotropy(monomer, dimer, optics=Optics()):
+    """Anisotropy and intensity of sensors from the amounts of monomer and
+    dimer, without bleaching or noise.
+
+    The intensity is in units of the fluorescence of a dimer subunit, and
+    each dimer counts as two subunits.
+    """
+    subunits = monomer + 2 * dimer
+    fraction = np.divide(
+        monomer, subunits, out=np.zeros_like(subunits), where=subunits > 0
+    )
+    b = optics.brightness
+    intensity = fraction * b + (1 - fraction)
+    r = (
+        fraction * b * optics.monomer_anisotropy
+        + (1 - fraction) * optics.dimer_anisotropy
+    ) / intensity
+    return r, intensity * subunits
+
+
+def observe(monomer, dimer, frame, rng, optics=Optics()):
+    """Measured anisotropy and intensity of sensors.
+
+    Parameters
+    ----------
+    monomer, dimer : array_like
+        Amounts of monomer and dimer.
+    frame : array_like
+        Number of previous exposures, broadcast against `monomer`.
+    rng : numpy.random.Generator
+    optics : Optics
+
+    Returns
+    -------
+    anisotropy, intensity : ndarray
+    """
+    r, intensity = anisotropy(np.asarray(monomer), np.asarray(dimer), optics)
+    total = np.max(intensity, axis=-2, keepdims=True)
+    intensity = intensity * (1 - optics.bleaching) ** np.asarray(frame)
+    relative = intensity / np.where(total > 0, total, 1)
+
+    noise = optics.anisotropy_noise / np.sqrt(np.maximum(relative, 1e-12))
+    r = r + noise * rng.standard_normal(r.shape)
+    intensity = intensity * (1 + optics.intensity_noise * rng.standard_normal(r.shape))
+    return r, intensity
+
+
+def generate(
+    network,
+    path,
+    n_cells,
+    acquisition,
+    sample=None,
+    sensors=SENSORS,
+    optics=Optics(),
+    chunk_size=500,
+    seed=0,
+    executor=None,
+    job_id=None,
+    **options,
+):
+    """Simulate and observe `n_cells` cells, writing them in chunks.
+
+    Parameters
+    ----------
+    network : Network
+        Network with observables ``<sensor>_monomer`` and ``<sensor>_dimer``
+        for each sensor, as added by
+        :func:`~caspase_model.shared.observe_biosensors`.
+    path : str or path
+        Directory where chunks are written as ``chunk_<index>.npz`` files.
+    n_cells : int
+    acquisition : Acquisition
+    sample : callable, optional
+        ``sample(rng, n)`` returns the parameter vectors of `n` cells.
+        Defaults to :class:`LognormalCells` of `network`. It must be
+        picklable to use a process pool.
+    sensors : sequence of str
+        Names of the observed sensors.
+    optics : Optics
+    chunk_size : int
+        Cells per chunk.
+    seed : int
+    executor : concurrent.futures.Executor, optional
+        Computes and writes chunks in parallel.
+    job_id : str, optional
+        Identifies `sample` in the chunks, in place of its pickle, for
+        samplers that cannot be pickled.
+    options
+        Passed to :func:`~caspase_model.batch.simulate_batch`.
+
+    Returns
+    -------
+    paths : list of str
+        Paths of all chunks, in order.
+
+    Each chunk holds the parameter vectors (``params``), the frame times
+    (``t``, cells by frames) and the measured ``anisotropy`` and
+    ``intensity`` (cells by frames by sensors, as float32) of its cells.
+    """
+    sample = LognormalCells(network) if sample is None else sample
+    n_chunks = math.ceil(n_cells / chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    sizes = [min(chunk_size, n_cells - i * chunk_size) for i in range(n_chunks)]
+    key = job_key(
+        "synthetic",
+        network.digest(),
+        n_cells,
+        tuple(acquisition),
+        sample if job_id is None else job_id,
+        tuple(sensors),
+        tuple(optics),
+        chunk_size,
+        seed,
+        options,
+    )
+
+    os.makedirs(path, exist_ok=True)
+    write = partial(
+        _write_chunk, network, path, key, acquisition, sample, sensors, optics, options
+    )
+    chunks = list(zip(range(n_chunks), seeds, sizes))
+    return list((executor.map if executor else map)(write, chunks))
+
+
+def read(path):
+    """Iterate over the chunks written by :func:`generate`, in order, as
+    dicts of arrays."""
+    for filename in sorted(glob.glob(os.path.join(path, "chunk_*.npz"))):
+        with np.load(filename) as chunk:
+            yield {name: chunk[name] for name in chunk.files if name != "key"}
+
+
+def _write_chunk(
+    network, path, key, acquisition, sample, sensors, optics, options, chunk
+):
+    index, seed, size = chunk
+    filename = os.path.join(path, f"chunk_{index:06d}.npz")
+    if os.path.exists(filename):
+        with np.load(filename) as saved:
+            if str(saved["key"]) != key:
+                raise ValueError(f"Chunk {filename} belongs to a different dataset.")
+        return filename
+
+    rng = np.random.default_rng(seed)
+    params = sample(rng, size)
+    positions = rng.integers(acquisition.n_positions, size=size)
+    times = acquisition_times(acquisition)
+    grid = np.unique(np.append(0, times))
+    columns = np.searchsorted(grid, times)[positions]
+
+    y = simulate_batch(network, grid, params, **options).y
+    y = network.observe(np.take_along_axis(y, columns[..., None], axis=1))
+    monomer = y[..., [network.observables.index(f"{s}_monomer") for s in sensors]]
+    dimer = y[..., [network.observables.index(f"{s}_dimer") for s in sensors]]
+    frame = np.arange(acquisition.n_frames)[:, None]
+    r, intensity = observe(monomer, dimer, frame, rng, optics)
+
+    with atomic_write(filename) as f:
+        np.savez(
+            f,
+            key=key,
+            params=params,
+            t=times[positions],
+            anisotropy=r.astype(np.float32),
+            intensity=intensity.astype(np.float32),
+        )
+    return filename
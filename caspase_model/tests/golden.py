@@ -0,0 +1,61 @@
+"""Store of golden (reference) trajectories for tests.
+
+Each trajectory is saved as a compressed float32 ``.npz`` file together with
+the key it was computed for, a hash of the simulation settings, and the
+fingerprint of the model that produced it. Tests compare the stored
+fingerprint with that of the current reference model, so references go stale
+as soon as the model changes.
+
+References are versioned with the code. They are written only on request, by
+running the slow tests with the environment variable
+``CASPASE_MODEL_UPDATE_GOLDEN=1`` in an environment with the reference engine,
+which resimulates the models whose fingerprint changed.
+"""
+
+import os
+from collections import namedtuple
+
+import numpy as np
+
+DIRECTORY = os.path.join(os.path.dirname(__file__), "golden_trajectories")
+
+Golden = namedtuple("Golden", ["t", "columns", "values", "fingerprint"])
+
+
+def update_requested():
+    """Whether references should be (re)generated in this run."""
+    return os.environ.get("CASPASE_MODEL_UPDATE_GOLDEN", "") not in ("", "0")
+
+
+class GoldenStore:
+    def __init__(self, directory=DIRECTORY):
+        self.directory = directory
+
+    def load(self, name, key):
+        """Stored Golden for `name`, or None if missing or outdated."""
+        try:
+            with np.load(self._path(name)) as data:
+                if data["key"] != key:
+                    return None
+                return Golden(
+                    data["t"],
+                    [str(c) for c in data["columns"]],
+                    data["values"],
+                    str(data["fingerprint"]),
+                )
+        except FileNotFoundError:
+            return None
+
+    def save(self, name, key, golden):
+        os.makedirs(self.directory, exist_ok=True)
+        np.savez_compressed(
+            self._path(name),
+            key=key,
+            t=np.asarray(golden.t, dtype=float),
+            columns=np.asarray(golden.columns, dtype=str),
+            values=np.asarray(golden.values, dtype=np.float32),
+            fingerprint=golden.fingerprint,
+        )
+
+    def _path(self, name):
+        return os.path.join(self.directory, name + ".npz")
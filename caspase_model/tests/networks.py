@@ -0,0 +1,36 @@
+"""Small reaction networks for tests that do not need a modelling engine."""
+
+from caspase_model.network import Network
+
+
+def binding_network():
+    """Reversible binding A + B <--> C, with observables for A and C."""
+    return Network(
+        species=["A", "B", "C"],
+        parameters=["kf", "kr", "A_0", "B_0"],
+        values=[1e-3, 1e-2, 100, 50],
+        reactants=[(0, 1), (2,)],
+        products=[(2,), (0, 1)],
+        rate_parameters=[0, 1],
+        initial_species=[0, 1],
+        initial_parameters=[2, 3],
+        observables={"A_free": [1, 0, 0], "AB": [0, 0, 1]},
+    )
+
+
+def schlogl_network():
+    """Schlögl model, bistable for B_0 between 6 -+ 2 / sqrt(27).
+
+    X changes as -X**3 + 6 A X**2 - 11 X + B, where A and B are constant
+    species acting as catalysts.
+    """
+    return Network(
+        species=["X", "A", "B"],
+        parameters=["k1", "k2", "k3", "k4", "X_0", "A_0", "B_0"],
+        values=[6, 1, 1, 11, 0.5, 1, 5],
+        reactants=[(1, 0, 0), (0, 0, 0), (2,), (0,)],
+        products=[(1, 0, 0, 0), (0, 0), (2, 0), ()],
+        rate_parameters=[0, 1, 2, 3],
+        initial_species=[0, 1, 2],
+        initial_parameters=[4, 5, 6],
+    )
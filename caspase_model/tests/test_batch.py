@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from caspase_model.batch import simulate_batch
+from caspase_model.tests.networks import binding_network, schlogl_network
+
+
+def test_batch_matches_lsoda():
+    t = np.linspace(0, 1000, 21)
+    rng = np.random.default_rng(0)
+    for network in (binding_network(), schlogl_network()):
+        params = network.values * rng.lognormal(0, 0.5, (20, len(network.values)))
+        solution = simulate_batch(network, t, params, rtol=1e-6, atol=1e-8)
+        reference = [network.simulate(t, p, rtol=1e-10, atol=1e-10) for p in params]
+        assert solution.y.shape == (20, len(t), len(network.species))
+        assert np.allclose(solution.y, reference, rtol=1e-4, atol=1e-4)
+        # Members take different numbers of steps.
+        assert solution.steps.min() < solution.steps.max()
+
+
+def test_failed_members():
+    network = binding_network()
+    t = np.linspace(0, 100, 6)
+    params = network.values * np.array([[1, 1, 1, 1], [np.inf, 1, 1, 1]])
+    with np.errstate(invalid="ignore"):
+        with pytest.raises(RuntimeError):
+            simulate_batch(network, t, params)
+        solution = simulate_batch(network, t, params, strict=False)
+    assert solution.failed.tolist() == [False, True]
+    assert np.allclose(solution.y[0], network.simulate(t, params[0]), rtol=1e-3)
+    assert np.isnan(solution.y[1, -1]).all()
@@ -0,0 +1,39 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from pysb import Model, Monomer
+from pysb.core import SelfExporter
+
+from caspase_model import shared
+from caspase_model.builder import exporting_to
+from caspase_model.shared import add_biosensors
+
+
+def caspases_model(name):
+    """Model with the caspases cleaving the biosensors."""
+    model = Model(name, _export=False)
+    with exporting_to(model):
+        Monomer("C3", ["bf", "state"], {"state": ["pro", "A"]})
+        Monomer("C8", ["bf", "state"], {"state": ["pro", "A"]})
+        Monomer("Apop", ["bf"])
+    return model
+
+
+def build(name):
+    model = caspases_model(name)
+    add_biosensors(model, cc=len(name))
+    return model
+
+
+def test_concurrent_builds():
+    names = [f"model_{i}" for i in range(16)]
+    with ThreadPoolExecutor(8) as pool:
+        models = list(pool.map(build, names))
+
+    for name, model in zip(names, models):
+        assert model.name == name
+        assert len(model.monomers) == 6
+        assert len(model.rules) == 6
+        assert model.parameters["dsCas3_0"].value == len(name)
+
+    assert SelfExporter.default_model is None
+    assert not hasattr(shared, "sCas3")
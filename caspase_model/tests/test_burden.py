@@ -0,0 +1,52 @@
+import numpy as np
+
+from caspase_model.burden import sensor_burden
+from caspase_model.network import Network
+
+T = np.linspace(0, 200, 101)
+
+
+def switch_network(sensor=True):
+    """Autocatalytic caspase activation C + A --> 2 A, with a sensor dimer D
+    sequestering active caspase A before being cleaved into monomers M."""
+    n = 4 if sensor else 1
+    return Network(
+        species=["C", "A", "D", "AD", "M"],
+        parameters=["k", "kf", "kr", "kc", "C_0", "A_0", "dsCas3_0"],
+        values=[1e-3, 1e-3, 1e-2, 1e-1, 100, 0.1, 10],
+        reactants=[(0, 1), (1, 2), (3,), (3,)][:n],
+        products=[(1, 1), (3,), (1, 2), (1, 4, 4)][:n],
+        rate_parameters=[0, 1, 2, 3][:n],
+        initial_species=[0, 1, 2] if sensor else [0, 1],
+        initial_parameters=[4, 5, 6] if sensor else [4, 5],
+        observables={"Cas3_active": [0, 1, 0, 0, 0]},
+    )
+
+
+def test_sensor_burden():
+    network = switch_network()
+    params = network.values * [[1] * 7, [1, 1, 1, 1, 2, 1, 1]]
+    burden = sensor_burden(
+        network,
+        T,
+        [10, 50, 200],
+        params,
+        sensors=["dsCas3_0"],
+        observables=["Cas3_active"],
+        rtol=1e-8,
+        atol=1e-8,
+    )
+    assert np.array_equal(burden.loadings[:, 0], [0, 10, 50, 200])
+    assert burden.y.shape == (2, 4, len(T), 1)
+    assert burden.deviation.shape == (2, 4, 1)
+
+    # The sensor-free reference is the network without sensors.
+    free = switch_network(sensor=False)
+    for cell, p in enumerate(params):
+        expected = free.observe(free.simulate(T, p, rtol=1e-10, atol=1e-10))
+        assert np.allclose(burden.y[cell, 0], expected, rtol=1e-4, atol=1e-4)
+
+    assert np.all(burden.deviation[:, 0] == 0)
+    assert np.all(np.diff(burden.deviation[..., 0], axis=1) > 0)
+    assert np.all(burden.delay[:, 0] == 0)
+    assert np.all(np.diff(burden.delay, axis=1) > 0)
@@ -0,0 +1,66 @@
+import os
+
+import numpy as np
+import pytest
+
+from caspase_model.cache import SimulationCache, simulation_key
+from caspase_model.tests.networks import binding_network
+
+
+def test_key():
+    network = binding_network()
+    t = np.linspace(0, 100, 11)
+
+    key = simulation_key(network, t)
+    assert key == simulation_key(network, t, network.values.copy())
+    assert key != simulation_key(network, t, network.values * 2)
+    assert key != simulation_key(network, t[:-1])
+    assert key != simulation_key(network, t, rtol=1e-8)
+    assert key == simulation_key(network, t, method="LSODA", rtol=1e-6)
+
+
+def test_hit_skips_integration(tmp_path, monkeypatch):
+    network = binding_network()
+    t = np.linspace(0, 100, 11)
+
+    cache = SimulationCache(tmp_path)
+    y = cache.simulate(network, t)
+    assert np.array_equal(y, network.simulate(t))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Integrated on a cache hit.")
+
+    monkeypatch.setattr(network, "simulate", fail)
+    assert cache.simulate(network, t) is y
+
+    # A fresh cache over the same directory reads the on-disk tier.
+    assert np.array_equal(SimulationCache(tmp_path).simulate(network, t), y)
+
+    with pytest.raises(TypeError):
+        cache.simulate(network, t, dense_output=True)
+
+
+def test_eviction(tmp_path):
+    y = np.zeros(100)
+    cache = SimulationCache(
+        tmp_path, max_memory_bytes=2 * y.nbytes, max_disk_bytes=3 * (y.nbytes + 128)
+    )
+    for key in "abcd":
+        cache.put(key, y)
+
+    assert list(cache._memory) == ["c", "d"]
+    assert len(list(tmp_path.glob("*.npy"))) == 3
+    assert cache.get("a") is None
+
+
+def test_memory_hits_refresh_disk(tmp_path):
+    y = np.zeros(100)
+    cache = SimulationCache(tmp_path, max_disk_bytes=3 * (y.nbytes + 128))
+    for key in "abc":
+        cache.put(key, y)
+    for key, mtime in zip("abc", [1, 2, 3]):
+        os.utime(tmp_path / f"{key}.npy", (mtime, mtime))
+
+    assert cache.get("a") is not None
+    cache.put("d", y)
+    assert sorted(p.stem for p in tmp_path.glob("*.npy")) == ["a", "c", "d"]
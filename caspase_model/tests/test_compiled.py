@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from caspase_model.compiled import CompiledModel
+from caspase_model.tests.networks import binding_network
+
+
+def test_simulate_with_vectors():
+    network = binding_network()
+    model = CompiledModel(network)
+    t = np.linspace(0, 100, 11)
+
+    assert list(model.parameters) == ["kf", "kr", "A_0", "B_0"]
+    assert model.species["C"] == 2
+    assert np.array_equal(model.parameters.positions(["B_0", "kf"]), [3, 0])
+
+    params = model.parameters.vector(model.values, kf=2e-3)
+    assert np.allclose(model.simulate(params, None, t), network.simulate(t, params))
+    y0 = np.array([10.0, 20, 30])
+    assert np.allclose(
+        model.simulate(None, y0, t), network.simulate(t, y0=y0), rtol=1e-5
+    )
+    assert model.values[0] == 1e-3
+    with pytest.raises(ValueError):
+        model.values[0] = 1
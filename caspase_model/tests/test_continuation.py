@@ -0,0 +1,30 @@
+import numpy as np
+
+from caspase_model.continuation import continuation, fold_continuation, steady_state
+from caspase_model.tests.networks import schlogl_network
+
+
+def test_folds_of_schlogl_model():
+    network = schlogl_network()
+    y = steady_state(network)
+    assert np.isclose(y[0] ** 3 - 6 * y[0] ** 2 + 11 * y[0], 5)
+
+    branch = continuation(network, "B_0", (1, 20))
+    assert branch.values.min() < 2 and branch.values.max() > 15
+    assert np.allclose(
+        sorted(f.value for f in branch.folds), 6 + np.array([-2, 2]) / 27**0.5
+    )
+    # The middle branch, between folds, is unstable.
+    x = branch.states[:, 0]
+    folds = 2 + np.array([-1, 1]) / 3**0.5
+    assert np.array_equal(branch.stable, (x < folds[0]) | (x > folds[1]))
+
+    curve = fold_continuation(
+        network, branch.folds[0], "A_0", (0.5, 2), fold_bounds=(1, 20)
+    )
+    b, a = curve.values.T
+    x = curve.states[:, 0]
+    assert np.allclose(-(x**3) + 6 * a * x**2 - 11 * x + b, 0)
+    assert np.allclose(-3 * x**2 + 12 * a * x - 11, 0)
+    # Both folds meet at a cusp, where 36 A**2 = 33.
+    assert np.isclose(a.min(), 33**0.5 / 6, rtol=1e-3)
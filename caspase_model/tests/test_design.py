@@ -0,0 +1,50 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from caspase_model.design import (
+    Design,
+    evaluate,
+    evaluate_designs,
+    select_times,
+    sensitivities,
+)
+from caspase_model.tests.networks import binding_network
+
+ESTIMATED = ["kf", "kr"]
+
+
+def test_sensitivities():
+    network = binding_network()
+    t = np.linspace(10, 1000, 10)
+    y, s = sensitivities(network, t, ESTIMATED)
+    assert s.shape == (10, 2, 2)
+
+    def observe(params):
+        y = network.simulate(np.append(0, t), params, rtol=1e-10, atol=1e-10)
+        return network.observe(y[1:])
+
+    h = 1e-4
+    up = observe(network.values * [np.exp(h), 1, 1, 1])
+    down = observe(network.values * [np.exp(-h), 1, 1, 1])
+    assert np.allclose(y, observe(network.values), rtol=1e-6)
+    assert np.allclose((up - down) / (2 * h), s[..., 0], rtol=1e-3, atol=1e-3)
+
+
+def test_designs():
+    network = binding_network()
+    t = np.linspace(10, 1000, 10)
+    designs = [Design({"B_0": b}, t) for b in (5, 50, 500)]
+
+    with ThreadPoolExecutor(2) as executor:
+        scores = evaluate_designs(network, designs, ESTIMATED, executor=executor)
+    assert np.array_equal(scores, evaluate_designs(network, designs, ESTIMATED))
+    assert scores.argmax() == 1
+
+    candidates = np.linspace(1, 2000, 50)
+    times = select_times(network, {}, candidates, 4, ESTIMATED)
+    assert len(times) == 4 and np.isin(times, candidates).all()
+    uniform = np.linspace(1, 2000, 4)
+    assert evaluate(network, Design({}, times), ESTIMATED) > evaluate(
+        network, Design({}, uniform), ESTIMATED
+    )
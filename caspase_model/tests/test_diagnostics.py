@@ -0,0 +1,34 @@
+import numpy as np
+
+from caspase_model.diagnostics import diagnose, report, switch_phases
+from caspase_model.network import Network
+
+
+def test_fast_equilibrium_is_stiff():
+    # A <--> B equilibrate fast, while B --> C is slow.
+    network = Network(
+        species=["A", "B", "C"],
+        parameters=["kf", "kr", "k", "A_0"],
+        values=[1e4, 1e4, 1e-2, 100],
+        reactants=[(0,), (1,), (1,)],
+        products=[(1,), (0,), (2,)],
+        rate_parameters=[0, 1, 2],
+        initial_species=[0],
+        initial_parameters=[3],
+    )
+    t = np.linspace(0, 1000, 101)
+    y = network.simulate(t, method="BDF")
+
+    diagnostics = diagnose(network, t, y)
+    assert diagnostics.eigenvalues.shape == (101, 2)
+    assert np.allclose(diagnostics.eigenvalues[0], [-2e4, -5e-3], rtol=1e-3)
+    assert np.allclose(diagnostics.participation[0, 0], [0.5, 0.5, 0])
+    assert np.allclose(diagnostics.stiffness, 4e6, rtol=1e-3)
+
+    phases = switch_phases(t, y[:, 2])
+    assert list(phases) == ["before", "switch", "after"]
+    reports = report(diagnostics, network.species, phases)
+    assert len(reports) == 3
+    for phase in reports:
+        assert sorted(phase.fast_species) == ["A", "B"]
+        assert phase.solver.startswith("BDF, or quasi-steady state")
@@ -0,0 +1,23 @@
+from caspase_model.equivalence import compare
+from caspase_model.tests.networks import binding_network
+
+name_mapping = {"A": "a", "B": "b", "C": "a_b"}
+
+
+def renamed(network):
+    network.species = tuple(name_mapping[s] for s in network.species)
+    return network
+
+
+def test_equivalent():
+    assert compare(binding_network(), renamed(binding_network()), name_mapping) == []
+
+
+def test_rate_mismatch():
+    other = renamed(binding_network())
+    other.values = other.values.copy()
+    other.values[0] *= 2
+
+    assert compare(binding_network(), other, name_mapping) == [
+        "a + b >> a_b has rate constant 0.001 in PySB and 0.002 in SimBio"
+    ]
@@ -0,0 +1,28 @@
+import numpy as np
+
+from caspase_model.features import activation_time, features
+
+
+def sigmoids(t, t50, width=10):
+    return 1 / (1 + np.exp(-(t[None, :, None] - t50[:, None, :]) / width))
+
+
+def test_features():
+    t = np.linspace(0, 1000, 501)
+    t50 = np.random.default_rng(0).uniform(200, 800, (50, 2))
+    y = sigmoids(t, t50)
+
+    result = features(t, y, ["C8", "C3"], pairs=[("C8", "C3")], chunk_size=7)
+    assert np.allclose(result["C8_time"], t50[:, 0], atol=1e-2)
+    assert np.allclose(result["C3_max_rate_time"], t50[:, 1], atol=1)
+    assert np.allclose(result["C3_max_rate"], 1 / 40, rtol=1e-2)
+    assert np.allclose(result["C8_to_C3_delay"], t50[:, 1] - t50[:, 0], atol=1e-2)
+
+    per_cell = features(np.broadcast_to(t, y.shape[:2]), y, ["C8", "C3"])
+    assert np.array_equal(per_cell["C3_time"], result["C3_time"])
+
+
+def test_activation_time_without_rise():
+    t = np.linspace(0, 10, 11)
+    y = np.stack([np.ones_like(t), t], axis=-1)[None]
+    assert np.allclose(activation_time(t, y), [[np.nan, 5]], equal_nan=True)
@@ -0,0 +1,36 @@
+import numpy as np
+
+from caspase_model.fingerprint import fingerprint
+from caspase_model.network import Network
+from caspase_model.tests.networks import binding_network
+
+
+def permuted(network):
+    """Same network with species and reactions declared in reverse order."""
+    n = len(network.species)
+    reverse = {i: n - 1 - i for i in range(n)}
+    return Network(
+        species=network.species[::-1],
+        parameters=network.parameters,
+        values=network.values,
+        reactants=[[reverse[i] for i in r] for r in network.reactants[::-1]],
+        products=[[reverse[i] for i in p] for p in network.products[::-1]],
+        rate_parameters=network.rate_parameters[::-1],
+        initial_species=[reverse[i] for i in network.initial_species],
+        initial_parameters=network.initial_parameters,
+        observables=dict(zip(network.observables, network.observable_matrix[:, ::-1])),
+    )
+
+
+def test_declaration_order():
+    network = binding_network()
+    assert fingerprint(network) == fingerprint(permuted(network))
+
+
+def test_values():
+    network = binding_network()
+    changed = binding_network()
+    changed.values = np.array(changed.values) * 2
+
+    assert fingerprint(network).structure == fingerprint(changed).structure
+    assert fingerprint(network).values != fingerprint(changed).values
@@ -0,0 +1,29 @@
+import subprocess
+import sys
+
+HEAVY_MODULES = (
+    "numpy",
+    "scipy",
+    "pandas",
+    "sympy",
+    "pysb",
+    "earm",
+    "simbio",
+    "networkx",
+)
+
+CODE = """
+import sys
+import caspase_model, caspase_model.simbio_model
+print(" ".join(sys.modules))
+"""
+
+
+def test_import_is_lazy():
+    """Importing the package must not import engines or numerical libraries."""
+    modules = subprocess.run(
+        [sys.executable, "-c", CODE], capture_output=True, text=True, check=True
+    ).stdout.split()
+
+    imported = {module.split(".")[0] for module in modules}
+    assert imported.isdisjoint(HEAVY_MODULES)
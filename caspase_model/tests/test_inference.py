@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from caspase_model.inference import (
+    BatchLikelihood,
+    effective_sample_size,
+    parallel_tempering,
+    r_hat,
+)
+from caspase_model.tests.networks import binding_network
+
+MEAN = np.array([1.0, -2.0])
+STD = np.array([0.5, 0.2])
+BOUNDS = [[-5, 5], [-5, 5]]
+
+
+class Gaussian:
+    """Gaussian log-likelihood, failing after a number of calls."""
+
+    def __init__(self, fail_after=None):
+        self.calls = 0
+        self.fail_after = fail_after
+
+    def __call__(self, theta):
+        self.calls += 1
+        if self.calls == self.fail_after:
+            raise KeyboardInterrupt
+        return -0.5 * (((theta - MEAN) / STD) ** 2).sum(axis=-1)
+
+
+def sample(log_likelihood, **kwargs):
+    return parallel_tempering(
+        log_likelihood,
+        BOUNDS,
+        1000,
+        n_walkers=8,
+        n_temperatures=4,
+        max_temperature=100,
+        proposal=0.3,
+        tune=200,
+        **kwargs,
+    )
+
+
+def test_gaussian_posterior(tmp_path):
+    samples = sample(Gaussian())
+    assert samples.chain.shape == (1000, 8, 2)
+    flat = samples.chain.reshape(-1, 2)
+    assert np.allclose(flat.mean(axis=0), MEAN, atol=0.1)
+    assert np.allclose(flat.std(axis=0), STD, rtol=0.1)
+    assert np.all(r_hat(samples.chain) < 1.05)
+    assert np.all(effective_sample_size(samples.chain) > 500)
+
+    # Log-likelihoods differing only in when they fail are the same job.
+    checkpoint = tmp_path / "chain"
+    options = dict(checkpoint=checkpoint, checkpoint_every=50, job_id="gaussian")
+    with pytest.raises(KeyboardInterrupt):
+        sample(Gaussian(fail_after=700), **options)
+    resumed = sample(Gaussian(), **options)
+    # Each checkpoint after tuning wrote only its own samples.
+    assert len(list(checkpoint.glob("chain_*.npz"))) == 1000 // 50
+    assert np.array_equal(resumed.chain, samples.chain)
+    assert np.array_equal(resumed.acceptance, samples.acceptance)
+
+
+def test_batch_likelihood():
+    network = binding_network()
+    t = np.linspace(0, 100, 6)
+    cells = network.values * np.array([[1, 1, 1, 1], [1, 1, 2, 0.5]])
+    data = np.stack([network.observe(network.simulate(t, p)) for p in cells])
+
+    likelihood = BatchLikelihood(network, t, data, 1.0, ["kf", "kr"], cells)
+    theta = np.log(network.values[:2]) + [[0, 0], [0.1, 0], [0, -0.1]]
+    log_likelihood = likelihood(theta)
+    assert log_likelihood.shape == (3,)
+    assert log_likelihood[0] > -1e-3
+    assert np.all(log_likelihood[1:] < log_likelihood[0])
+
+    # Parameter sets whose simulation fails are impossible.
+    with np.errstate(over="ignore", invalid="ignore"):
+        log_likelihood = likelihood(theta[:1] + [[0, 0], [800, 0]])
+    assert np.isfinite(log_likelihood[0])
+    assert log_likelihood[1] == -np.inf
+
+
+def test_checkpoint_of_other_data(tmp_path):
+    network = binding_network()
+    t = np.linspace(0, 100, 6)
+    data = network.observe(network.simulate(t))[None]
+    bounds = np.log(network.values[:2])[:, None] + [-1, 1]
+    options = dict(n_walkers=4, n_temperatures=2, checkpoint=tmp_path / "chain")
+
+    likelihood = BatchLikelihood(network, t, data, 1.0, ["kf", "kr"])
+    samples = parallel_tempering(likelihood, bounds, 2, **options)
+    same = BatchLikelihood(binding_network(), t, data.copy(), 1.0, ["kf", "kr"])
+    resumed = parallel_tempering(same, bounds, 2, **options)
+    assert np.array_equal(resumed.chain, samples.chain)
+    other = BatchLikelihood(network, t, 2 * data, 1.0, ["kf", "kr"])
+    with pytest.raises(ValueError):
+        parallel_tempering(other, bounds, 2, **options)
+
+
+def test_invalid_starts():
+    def log_likelihood(theta):
+        return np.where(theta[:, 0] < 4, Gaussian()(theta), -np.inf)
+
+    samples = sample(log_likelihood)
+    assert np.isfinite(samples.log_likelihood).all()
+    with pytest.raises(ValueError):
+        sample(log_likelihood, theta0=[4.5, 0])
@@ -0,0 +1,24 @@
+from caspase_model.mapping import MappingIndex, infer_name_mapping
+from caspase_model.tests.networks import binding_network
+
+name_mapping = {"A": "A", "B": "B", "C": "A_B"}
+
+
+def renamed(network):
+    network.species = tuple(name_mapping[s] for s in network.species)
+    return network
+
+
+def test_infer():
+    assert infer_name_mapping(binding_network(), renamed(binding_network())) == (
+        name_mapping
+    )
+
+
+def test_index(tmp_path):
+    path = tmp_path / "mapping.json"
+    MappingIndex(path).get(binding_network(), renamed(binding_network()))
+
+    index = MappingIndex(path)
+    assert index.get(binding_network(), renamed(binding_network())) == name_mapping
+    assert len(index._mappings) == 1
@@ -0,0 +1,32 @@
+from types import SimpleNamespace
+
+import pytest
+
+from caspase_model.network import Network
+from caspase_model.tests.name_mapping import name_mapping
+
+
+@pytest.mark.parametrize("name", ["albeck.Albeck11b", "corbat.ARM"])
+def test_from_simbio_species(name):
+    """Compiled species are named by their path and none are merged."""
+    from caspase_model import simbio_model
+
+    module, model = name.split(".")
+    network = Network.from_simbio(getattr(getattr(simbio_model, module), model))
+    assert len(set(network.species)) == len(network.species)
+    assert set(network.species) <= set(name_mapping.values())
+    # Species of nested compartments with the same local name stay apart.
+    assert {"C8.pro", "C3.pro"} <= set(network.species)
+    assert len(network.initial_parameters) == len(network.species)
+
+
+def test_from_simbio_rejects_shared_names():
+    rate = SimpleNamespace(name="k", value=1.0)
+    first, second = (SimpleNamespace(name="pro", value=1.0) for _ in range(2))
+    reaction = SimpleNamespace(reactants=[first], products=[second], rate=rate)
+    model = SimpleNamespace(_reactions={"conversion": reaction})
+    with pytest.raises(ValueError):
+        Network.from_simbio(model)
+
+    reaction.products = [SimpleNamespace(name="A", value=0.0)]
+    assert Network.from_simbio(model).species == ("pro", "A")
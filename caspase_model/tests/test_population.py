@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from caspase_model.population import Population
+from caspase_model.tests.networks import binding_network, schlogl_network
+
+T = np.linspace(0, 100, 11)
+
+
+def test_identical_cells_match_single_cell():
+    network = binding_network()
+    single = network.simulate(T, rtol=1e-8, atol=1e-8)
+    population = Population(network, shared=["A"], volume_ratio=5)
+    y = population.simulate(T, np.tile(network.values, (5, 1)), rtol=1e-8, atol=1e-8)
+    assert y.shape == (5, len(T), 3)
+    assert np.allclose(y, single, rtol=1e-5, atol=1e-5)
+
+
+def test_shared_pool_depletion():
+    network = binding_network()
+    params = np.tile(network.values, (3, 1))
+    params[:, 3] = [10, 50, 100]  # B_0
+
+    # An infinite medium is not depleted, so cells are independent.
+    population = Population(network, shared=["A"], volume_ratio=np.inf)
+    y = population.simulate(T, params)
+    assert np.allclose(y[:, :, 0], 100)
+
+    population = Population(network, shared=["A"], volume_ratio=2)
+    y = population.simulate(T, params, rtol=1e-8, atol=1e-8)
+    assert np.allclose(y[:, :, 0], y[0, :, 0])
+    bound = y[:, :, 2].sum(axis=0)
+    assert np.allclose(y[0, :, 0] + bound / 2, 100)
+    assert np.all(np.diff(y[0, :, 0]) < 0)
+
+
+@pytest.mark.parametrize(
+    "network, shared", [(binding_network(), "A"), (schlogl_network(), "B")]
+)
+def test_jacobian(network, shared):
+    rng = np.random.default_rng(0)
+    params = network.values * rng.lognormal(0, 0.3, (4, len(network.values)))
+    population = Population(network, shared=[shared], volume_ratio=3)
+    k = network.rate_constants(params)
+    state = population.state(network.initial_amounts(params)) + 1
+
+    jacobian = population.jacobian(None, state, k).toarray()
+    step = 1e-6
+    numeric = np.stack(
+        [
+            (
+                population.rhs(None, state + step * e, k)
+                - population.rhs(None, state - step * e, k)
+            )
+            / (2 * step)
+            for e in np.eye(len(state))
+        ],
+        axis=1,
+    )
+    assert np.allclose(jacobian, numeric, rtol=1e-6, atol=1e-9)
@@ -0,0 +1,38 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from caspase_model.network import Network
+from caspase_model.profile import ChiSquare, profile_all, report
+
+
+def test_profiles():
+    # Reversible binding with a parameter that has no effect.
+    network = Network(
+        species=["A", "B", "C"],
+        parameters=["kf", "kr", "unused", "A_0", "B_0"],
+        values=[1e-3, 1e-2, 1, 100, 50],
+        reactants=[(0, 1), (2,)],
+        products=[(2,), (0, 1)],
+        rate_parameters=[0, 1],
+        initial_species=[0, 1],
+        initial_parameters=[3, 4],
+        observables={"AB": [0, 0, 1]},
+    )
+    t = np.linspace(0, 200, 11)
+    data = network.observe(network.simulate(t, rtol=1e-10, atol=1e-10))
+    names = ["kf", "kr", "unused"]
+    objective = ChiSquare(network, t, data, 1.0, names, rtol=1e-8, atol=1e-8)
+    theta = np.log(network.values[:3])
+
+    with ThreadPoolExecutor(3) as executor:
+        profiles = profile_all(objective, theta, names, executor, max_points=15)
+    kf, kr, unused = profiles
+
+    assert kf.identifiability == kr.identifiability == "identifiable"
+    assert kf.interval[0] < theta[0] < kf.interval[1]
+    assert kf.interval[1] - kf.interval[0] < 0.5
+    assert unused.identifiability == "structurally non-identifiable"
+    assert np.isinf(unused.interval).all()
+    assert np.all(np.diff(kf.values) > 0) and len(kf.optima) == len(kf.values)
+    assert "kf" in report(profiles)
@@ -0,0 +1,91 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from caspase_model.runner import run_ensemble, run_sweep
+from caspase_model.statistics import Moments, QuantileSketch
+from caspase_model.tests.networks import binding_network
+
+T = np.linspace(0, 100, 5)
+
+
+class Sample:
+    """Lognormal rate constants, failing after a number of calls."""
+
+    def __init__(self, fail_after=None):
+        self.calls = 0
+        self.fail_after = fail_after
+
+    def __call__(self, rng, n):
+        self.calls += 1
+        if self.calls == self.fail_after:
+            raise KeyboardInterrupt
+        values = binding_network().values
+        return values * rng.lognormal(0, 0.3, (n, len(values)))
+
+
+def ensemble(**kwargs):
+    return run_ensemble(
+        binding_network(),
+        T,
+        kwargs.pop("sample", Sample()),
+        n_cells=50,
+        statistics=kwargs.pop("statistics", [Moments((5, 2)), QuantileSketch((5, 2))]),
+        unit_size=8,
+        **kwargs,
+    )
+
+
+def test_resumed_ensemble_is_identical(tmp_path):
+    moments, sketch = ensemble()
+    assert moments.count == 50
+
+    # Samplers differing only in when they fail are the same job.
+    checkpoint = tmp_path / "ensemble"
+    with pytest.raises(KeyboardInterrupt):
+        ensemble(checkpoint=checkpoint, sample=Sample(4), job_id="lognormal")
+    assert len(list(checkpoint.glob("unit_*.pkl"))) == 3
+    sample = Sample()
+    resumed_moments, resumed_sketch = ensemble(
+        checkpoint=checkpoint, sample=sample, job_id="lognormal"
+    )
+    assert sample.calls == 4
+    assert np.array_equal(resumed_moments.mean, moments.mean)
+    assert np.array_equal(resumed_moments.m2, moments.m2)
+    assert np.array_equal(resumed_sketch.counts, sketch.counts)
+
+    with ThreadPoolExecutor(2) as executor:
+        parallel_moments, _ = ensemble(executor=executor)
+    assert np.array_equal(parallel_moments.m2, moments.m2)
+
+    with pytest.raises(ValueError):
+        ensemble(checkpoint=checkpoint, seed=1, job_id="lognormal")
+
+
+def test_checkpoint_of_another_job(tmp_path):
+    checkpoint = tmp_path / "ensemble"
+    ensemble(checkpoint=checkpoint)
+    # Samplers and accumulators are identified by their configuration.
+    with pytest.raises(ValueError):
+        ensemble(checkpoint=checkpoint, sample=Sample(fail_after=100))
+    statistics = [Moments((5, 2)), QuantileSketch((5, 2), relative_accuracy=0.05)]
+    with pytest.raises(ValueError):
+        ensemble(checkpoint=checkpoint, statistics=statistics)
+    # Samplers that cannot be pickled need a job id.
+    with pytest.raises(TypeError):
+        ensemble(checkpoint=checkpoint, sample=lambda rng, n: Sample()(rng, n))
+
+
+def test_resumed_sweep(tmp_path):
+    network = binding_network()
+    params = network.values * np.linspace(0.5, 2, 7)[:, None]
+    checkpoint = tmp_path / "sweep"
+
+    results = run_sweep(network, T, params, checkpoint=checkpoint, unit_size=3)
+    assert results.shape == (7, 5, 2)
+    assert np.array_equal(results[2], network.observe(network.simulate(T, params[2])))
+    # A finished job is read back from its checkpoint.
+    assert np.array_equal(
+        run_sweep(network, T, params, checkpoint=checkpoint, unit_size=3), results
+    )
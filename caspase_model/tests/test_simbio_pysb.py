@@ -1,3 +1,6 @@
+import hashlib
+from functools import partial
+
 import numpy as np
 import pytest
 from earm import albeck_modules
@@ -6,10 +9,18 @@ from pysb.simulator import ScipyOdeSimulator
 from simbio import Simulator
 from simbio.simulator.solvers.scipy import ODEint
 
+from caspase_model.batch import simulate_batch
+from caspase_model.equivalence import compare
+from caspase_model.fingerprint import fingerprint
+from caspase_model.mapping import infer_name_mapping
 from caspase_model.models import albeck_as_matlab, arm, corbat_2018
+from caspase_model.network import Network
 from caspase_model.simbio_model import albeck, corbat
+from caspase_model.tests.golden import Golden, GoldenStore, update_requested
 from caspase_model.tests.name_mapping import name_mapping
 
+GOLDEN = GoldenStore()
+
 
 def load_pysb_model(func, pore: bool):
     """Load an Albeck model.
@@ -37,58 +48,124 @@ def pysb_dataframe(result, model):
     return result.dataframe.rename(columns=names).rename(columns=name_mapping)
 
 
-# Mapping of models between SimBio and PySB
+# Mapping of models between SimBio and PySB. PySB models are built lazily by
+# each test.
 MODELS = [
-    (albeck.Albeck11b, load_pysb_model(albeck_modules.albeck_11b, pore=False)),
+    (albeck.Albeck11b, partial(load_pysb_model, albeck_modules.albeck_11b, pore=False)),
     (
         albeck.Albeck11bPoreTransport,
-        load_pysb_model(albeck_modules.albeck_11b, pore=True),
+        partial(load_pysb_model, albeck_modules.albeck_11b, pore=True),
     ),
-    (albeck.Albeck11c, load_pysb_model(albeck_modules.albeck_11c, pore=False)),
+    (albeck.Albeck11c, partial(load_pysb_model, albeck_modules.albeck_11c, pore=False)),
     (
         albeck.Albeck11cPoreTransport,
-        load_pysb_model(albeck_modules.albeck_11c, pore=True),
+        partial(load_pysb_model, albeck_modules.albeck_11c, pore=True),
     ),
-    (albeck.Albeck11d, load_pysb_model(albeck_modules.albeck_11d, pore=False)),
+    (albeck.Albeck11d, partial(load_pysb_model, albeck_modules.albeck_11d, pore=False)),
     (
         albeck.Albeck11dPoreTransport,
-        load_pysb_model(albeck_modules.albeck_11d, pore=True),
+        partial(load_pysb_model, albeck_modules.albeck_11d, pore=True),
     ),
-    (albeck.Albeck11e, load_pysb_model(albeck_modules.albeck_11e, pore=False)),
+    (albeck.Albeck11e, partial(load_pysb_model, albeck_modules.albeck_11e, pore=False)),
     (
         albeck.Albeck11ePoreTransport,
-        load_pysb_model(albeck_modules.albeck_11e, pore=True),
+        partial(load_pysb_model, albeck_modules.albeck_11e, pore=True),
     ),
-    (albeck.Albeck11f, load_pysb_model(albeck_modules.albeck_11f, pore=False)),
+    (albeck.Albeck11f, partial(load_pysb_model, albeck_modules.albeck_11f, pore=False)),
     (
         albeck.Albeck11fPoreTransport,
-        load_pysb_model(albeck_modules.albeck_11f, pore=True),
+        partial(load_pysb_model, albeck_modules.albeck_11f, pore=True),
     ),
-    (corbat.AlbeckAsMatlab, albeck_as_matlab()),
-    (corbat.Corbat2018_extrinsic, corbat_2018(stimuli="extrinsic")),
-    (corbat.Corbat2018_intrinsic, corbat_2018(stimuli="intrinsic")),
-    (corbat.ARM_extrinsic, arm(stimuli="extrinsic")),
-    (corbat.ARM_intrinsic, arm(stimuli="intrinsic")),
+    (corbat.AlbeckAsMatlab, albeck_as_matlab),
+    (corbat.Corbat2018_extrinsic, partial(corbat_2018, stimuli="extrinsic")),
+    (corbat.Corbat2018_intrinsic, partial(corbat_2018, stimuli="intrinsic")),
+    (corbat.ARM_extrinsic, partial(arm, stimuli="extrinsic")),
+    (corbat.ARM_intrinsic, partial(arm, stimuli="intrinsic")),
 ]
+MODELS = [pytest.param(*pair, id=pair[0].__name__) for pair in MODELS]
+
+
+def pysb_reference(name, build_pysb_model, t, solver_options):
+    """PySB trajectories from the golden store.
+
+    References are versioned by the rule-level fingerprint of the PySB model,
+    which needs no network generation. A missing or outdated reference fails
+    the test, unless references are being updated, in which case the PySB
+    model is resimulated and its reference replaced.
+    """
+    settings = repr((t.tolist(), sorted(solver_options.items()))).encode()
+    key = hashlib.sha256(settings).hexdigest()
+    pysb_model = build_pysb_model()
+    values = fingerprint(pysb_model).values
+    golden = GOLDEN.load(name, key)
+    if golden is not None and golden.fingerprint == values:
+        return golden
+    if not update_requested():
+        state = "No" if golden is None else "Outdated"
+        pytest.fail(
+            f"{state} golden trajectory for {name}; regenerate it with "
+            "CASPASE_MODEL_UPDATE_GOLDEN=1 pytest -m slow and commit it."
+        )
+
+    sim_pysb = ScipyOdeSimulator(
+        pysb_model, integrator="lsoda", integrator_options=solver_options
+    )
+    df = pysb_dataframe(sim_pysb.run(t), pysb_model)
+    golden = Golden(t, list(df.columns), df.to_numpy(), values)
+    GOLDEN.save(name, key, golden)
+    return golden
+
 
+@pytest.mark.parametrize("simbio_model, build_pysb_model", MODELS)
+def test_structure(simbio_model, build_pysb_model):
+    """Compare reaction networks of SimBio and PySB models."""
+    pysb_model = build_pysb_model()
+    assert compare(pysb_model, simbio_model, name_mapping) == []
 
-@pytest.mark.parametrize("simbio_model, pysb_model", MODELS)
-def test_model(simbio_model, pysb_model):
-    """Run models with SimBio and PySB, and compare results at each timepoint."""
+
+@pytest.mark.parametrize("simbio_model, build_pysb_model", MODELS)
+def test_name_mapping(simbio_model, build_pysb_model):
+    """Inferred species mapping agrees with the hand-written one."""
+    pysb_model = build_pysb_model()
+    inferred = infer_name_mapping(pysb_model, simbio_model)
+    assert inferred == {name: name_mapping[name] for name in inferred}
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("simbio_model, build_pysb_model", MODELS)
+def test_model(simbio_model, build_pysb_model):
+    """Run models with SimBio and compare results at each timepoint with
+    reference PySB trajectories."""
 
     t = np.linspace(0, 20_000, 1_000)
     solver_options = {"atol": 1e-6, "rtol": 1e-6}
 
+    # PySB
+    golden = pysb_reference(simbio_model.__name__, build_pysb_model, t, solver_options)
+
     # SimBio
     sim = Simulator(
         simbio_model, builder="numpy", solver=ODEint, solver_kwargs=solver_options
     )
     _, df_simbio = sim.run(t)
 
-    # PySB
-    sim_pysb = ScipyOdeSimulator(
-        pysb_model, integrator="lsoda", integrator_options=solver_options
-    )
-    df_pysb = pysb_dataframe(sim_pysb.run(t), pysb_model)
+    simbio = df_simbio[golden.columns].to_numpy()
+    assert np.allclose(golden.values, simbio, rtol=1e-2, atol=1e-2)
+
 
-    assert np.allclose(df_pysb, df_simbio[df_pysb.columns], rtol=1e-2, atol=1e-2)
+@pytest.mark.slow
+@pytest.mark.parametrize("simbio_model, build_pysb_model", MODELS)
+def test_batch(simbio_model, build_pysb_model):
+    """Batched Rosenbrock solver agrees with LSODA on perturbed parameters of
+    both versions of each model."""
+    t = np.linspace(0, 20_000, 100)
+    for network in (
+        Network.from_pysb(build_pysb_model()),
+        Network.from_simbio(simbio_model),
+    ):
+        rng = np.random.default_rng(0)
+        params = network.values * rng.lognormal(0, 0.2, (4, len(network.values)))
+        batch = simulate_batch(network, t, params, rtol=1e-6, atol=1e-6).y
+        for y, p in zip(batch, params):
+            reference = network.simulate(t, p, rtol=1e-8, atol=1e-8)
+            assert np.allclose(y, reference, rtol=1e-2, atol=1e-2)
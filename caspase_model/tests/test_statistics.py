@@ -0,0 +1,50 @@
+import numpy as np
+
+from caspase_model.statistics import (
+    Histogram,
+    Moments,
+    QuantileSketch,
+    simulate_statistics,
+)
+from caspase_model.tests.networks import binding_network
+
+
+def test_merged_accumulators_match_batch():
+    x = np.random.default_rng(0).lognormal(3, 1, (5000, 4, 2))
+    edges = np.linspace(0, 100, 11)
+
+    workers = []
+    for part in np.array_split(x, 3):
+        accumulators = Moments((4, 2)), QuantileSketch((4, 2)), Histogram(edges, (4, 2))
+        for chunk in np.array_split(part, 5):
+            for accumulator in accumulators:
+                accumulator.update(chunk)
+        workers.append(accumulators)
+    moments, sketch, histogram = workers[0]
+    for other in workers[1:]:
+        for accumulator, other_accumulator in zip(workers[0], other):
+            accumulator.merge(other_accumulator)
+
+    assert moments.count == sketch.count == histogram.count == len(x)
+    assert np.allclose(moments.mean, x.mean(axis=0))
+    assert np.allclose(moments.variance, x.var(axis=0, ddof=1))
+    # Only occupied buckets are stored, about 370 per element here.
+    assert sketch.counts.sum() == 8 * len(x)
+    assert sketch.keys.size < 8 * 400
+    for q in (0, 0.1, 0.5, 0.9, 1):
+        assert np.allclose(sketch.quantile(q), np.quantile(x, q, axis=0), rtol=0.02)
+    expected = np.histogram(np.clip(x[:, 1, 0], 0, 99), edges)[0]
+    assert np.array_equal(histogram.counts[1, 0], expected)
+
+
+def test_simulate_statistics():
+    network = binding_network()
+    t = np.linspace(0, 100, 5)
+    params = network.values * np.random.default_rng(0).uniform(0.5, 2, (25, 1))
+
+    (moments,) = simulate_statistics(
+        network, t, iter(params), [Moments((5, 2))], batch_size=10
+    )
+    outputs = [network.observe(network.simulate(t, p)) for p in params]
+    assert moments.count == 25
+    assert np.allclose(moments.mean, np.mean(outputs, axis=0))
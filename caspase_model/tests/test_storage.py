@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from caspase_model.batch import simulate_batch
+from caspase_model.features import features
+from caspase_model.storage import (
+    CompressedArray,
+    DeltaLog,
+    Float32,
+    LogFixedPoint,
+    load,
+    save,
+)
+from caspase_model.tests.networks import binding_network
+
+T = np.linspace(0, 100, 51)
+
+
+@pytest.fixture(scope="module")
+def trajectories():
+    network = binding_network()
+    params = network.values * np.random.default_rng(0).lognormal(0, 0.5, (150, 4))
+    params[:, 2:] *= 1e4
+    return simulate_batch(network, T, params).y
+
+
+@pytest.mark.parametrize(
+    "codec, relative_error, ratio",
+    [(Float32(), 1e-7, 2), (LogFixedPoint(), 1e-4, 2), (DeltaLog(1e-3), 1e-3, 8)],
+)
+def test_error_bound(trajectories, codec, relative_error, ratio):
+    y = CompressedArray(trajectories, codec, block_size=32)
+    assert y.nbytes * ratio <= trajectories.nbytes
+    decoded = np.asarray(y)
+    assert decoded.shape == trajectories.shape
+    above = trajectories >= 1e-3
+    error = np.abs(decoded[above] / trajectories[above] - 1)
+    assert error.max() <= relative_error
+    assert np.all(np.abs(decoded[~above] - trajectories[~above]) < 1e-3)
+
+
+def test_indexing(trajectories):
+    y = CompressedArray(trajectories, block_size=32)
+    decoded = np.asarray(y)
+    for key in [5, -1, slice(30, 70), (slice(None, None, 7), -1, 2), [149, 3, 64]]:
+        assert np.array_equal(y[key], decoded[key])
+    assert len(y) == 150 and y.ndim == 3
+
+
+def test_analysis_and_files(trajectories, tmp_path):
+    network = binding_network()
+    y = network.observe(trajectories)
+    compressed = CompressedArray(y, block_size=32)
+    expected = features(T, y, network.observables, chunk_size=40)
+    result = features(T, compressed, network.observables, chunk_size=40)
+    for name in ["AB_time", "AB_max_rate", "AB_max_rate_time"]:
+        assert np.allclose(result[name], expected[name], rtol=1e-2, equal_nan=True)
+
+    path = tmp_path / "y.pkl"
+    assert save(path, y) < y.nbytes / 8
+    assert np.array_equal(np.asarray(load(path)), np.asarray(compressed))
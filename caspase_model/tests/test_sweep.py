@@ -0,0 +1,43 @@
+import numpy as np
+
+from caspase_model.network import Network
+from caspase_model.sweep import locality_order, warm_sweep
+
+
+def test_locality_order():
+    grid = np.log([[a, b] for a in (1, 2, 4, 8) for b in (1, 2, 4, 8)])
+    order = locality_order(np.exp(grid))
+    assert sorted(order) == list(range(16))
+
+    def length(points):
+        return np.abs(np.diff(points, axis=0)).sum()
+
+    # Shorter than the raster scan, which jumps back at the end of each row.
+    assert length(grid[order]) < length(grid)
+
+
+def test_warm_sweep_is_cheaper():
+    # X turns over slowly, and ligand L activates it into Y.
+    network = Network(
+        species=["X", "Y", "L"],
+        parameters=["ks", "kd", "ka", "L_0"],
+        values=[1e-2, 1e-4, 1e-3, 10],
+        reactants=[(), (0,), (2, 0), (1,)],
+        products=[(0,), (), (2, 1), ()],
+        rate_parameters=[0, 1, 2, 1],
+        initial_species=[2],
+        initial_parameters=[3],
+    )
+    t = np.linspace(0, 1000, 11)
+    grid = [
+        network.values * [a, 1, b, 1]
+        for a in np.linspace(0.5, 2, 4)
+        for b in np.linspace(0.5, 2, 4)
+    ]
+
+    cold = warm_sweep(network, t, grid, equilibrate={"L_0": 0}, warm=False)
+    warm = warm_sweep(network, t, grid, equilibrate={"L_0": 0})
+    assert np.allclose(warm.y, cold.y, rtol=1e-4, atol=1e-4)
+    assert np.allclose(cold.y[:, 0, 0], [p[0] / p[1] for p in grid])
+    assert warm.cost["rhs"] < cold.cost["rhs"] / 1.5
+    assert warm.cost["lu"] < cold.cost["lu"]
@@ -0,0 +1,95 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from caspase_model.network import Network
+from caspase_model.synthetic import (
+    Acquisition,
+    LognormalCells,
+    Optics,
+    acquisition_times,
+    generate,
+    read,
+)
+
+ACQUISITION = Acquisition(interval=10, n_frames=8, n_positions=3)
+
+
+def sensor_network():
+    """Caspase E cleaving dimeric sensor D into two monomers M."""
+    return Network(
+        species=["E", "D", "M"],
+        parameters=["kc", "E_0", "D_0"],
+        values=[1e-2, 1, 10],
+        reactants=[(0, 1)],
+        products=[(0, 2, 2)],
+        rate_parameters=[0],
+        initial_species=[0, 1],
+        initial_parameters=[1, 2],
+        observables={"sCas3_monomer": [0, 0, 1], "sCas3_dimer": [0, 1, 0]},
+    )
+
+
+def dataset(path, **kwargs):
+    return generate(
+        sensor_network(),
+        path,
+        n_cells=25,
+        acquisition=ACQUISITION,
+        sensors=["sCas3"],
+        chunk_size=10,
+        **kwargs,
+    )
+
+
+def test_lognormal_cells():
+    network = sensor_network()
+    params = LognormalCells(network, cv=0.2)(np.random.default_rng(0), 100_000)
+    assert np.all(params[:, 0] == network.values[0])
+    assert np.allclose(params[:, 1:].mean(axis=0), network.values[1:], rtol=0.01)
+    assert np.allclose(params[:, 1:].std(axis=0), 0.2 * network.values[1:], rtol=0.02)
+
+
+def test_acquisition_times():
+    times = acquisition_times(ACQUISITION)
+    assert times.shape == (3, 8)
+    assert np.allclose(np.diff(times, axis=1), 10)
+    assert np.allclose(times[:, 0], [0, 10 / 3, 20 / 3])
+
+
+def test_noiseless_anisotropy(tmp_path):
+    optics = Optics(bleaching=0, anisotropy_noise=0, intensity_noise=0)
+    dataset(tmp_path, optics=optics, sample=LognormalCells(sensor_network(), cv=0))
+    chunk = next(read(tmp_path))
+    r = chunk["anisotropy"][..., 0]
+    assert r.shape == (10, 8)
+    assert np.allclose(r[chunk["t"] == 0], optics.dimer_anisotropy)
+    assert np.all(np.diff(r, axis=1) > 0)
+    assert np.all(r < optics.monomer_anisotropy)
+    # With equal brightness, cleavage does not change the total intensity.
+    assert np.allclose(chunk["intensity"], 20)
+
+
+def test_chunks_are_deterministic(tmp_path):
+    paths = dataset(tmp_path / "serial")
+    assert len(paths) == 3
+    with ThreadPoolExecutor(3) as executor:
+        dataset(tmp_path / "parallel", executor=executor)
+    for serial, parallel in zip(read(tmp_path / "serial"), read(tmp_path / "parallel")):
+        for name in serial:
+            assert np.array_equal(serial[name], parallel[name])
+
+    chunks = list(read(tmp_path / "serial"))
+    assert sum(len(chunk["params"]) for chunk in chunks) == 25
+    assert chunks[0]["anisotropy"].dtype == np.float32
+    assert not np.array_equal(chunks[0]["params"][:5], chunks[1]["params"][:5])
+
+    # Existing chunks are kept, but not those of another dataset.
+    mtime = (tmp_path / "serial" / "chunk_000000.npz").stat().st_mtime_ns
+    dataset(tmp_path / "serial")
+    assert (tmp_path / "serial" / "chunk_000000.npz").stat().st_mtime_ns == mtime
+    with pytest.raises(ValueError):
+        dataset(tmp_path / "serial", seed=1)
+    with pytest.raises(ValueError):
+        dataset(tmp_path / "serial", sample=LognormalCells(sensor_network(), cv=0.5))
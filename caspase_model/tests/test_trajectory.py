@@ -0,0 +1,54 @@
+import numpy as np
+
+from caspase_model.network import Network
+from caspase_model.tests.networks import binding_network
+from caspase_model.trajectory import Ensemble
+
+
+def test_trajectory_matches_grid():
+    network = binding_network()
+    t = np.linspace(0, 1000, 37)
+
+    trajectory = network.simulate(t[[0, -1]], dense_output=True)
+    assert len(trajectory.t) < len(t) * 3
+    reference = network.simulate(t, rtol=1e-10, atol=1e-10)
+    assert np.allclose(trajectory(t), reference, rtol=1e-3, atol=1e-3)
+    assert np.array_equal(trajectory(2000), trajectory.y[-1])
+
+
+def test_ensemble_evaluates_each_member():
+    network = binding_network()
+    trajectories = [
+        network.simulate([0, 1000], network.values * f, dense_output=True)
+        for f in (0.5, 1, 2)
+    ]
+    ensemble = Ensemble(trajectories)
+
+    t = np.random.default_rng(0).uniform(0, 1000, (3, 11))
+    y = ensemble(t)
+    assert y.shape == (3, 11, 3)
+    for i, trajectory in enumerate(trajectories):
+        assert np.allclose(y[i], trajectory(t[i]))
+        assert np.array_equal(ensemble[i].t, trajectory.t)
+
+
+def test_adaptive_sampling_resolves_switch():
+    # Autocatalytic activation A + B --> 2 B switches quickly around t = 2000.
+    network = Network(
+        species=["A", "B"],
+        parameters=["k", "A_0", "B_0"],
+        values=[1e-4, 100, 1e-7],
+        reactants=[(0, 1)],
+        products=[(1, 1)],
+        rate_parameters=[0],
+        initial_species=[0, 1],
+        initial_parameters=[1, 2],
+    )
+    t_span = (0, 20_000)
+    t, y = network.sample(t_span, 40, rtol=1e-8, atol=1e-10)
+    assert len(t) <= 40
+    assert t[0] == t_span[0] and t[-1] == t_span[-1]
+
+    switch = (y[:, 1] > 10) & (y[:, 1] < 90)
+    uniform = network.simulate(np.linspace(*t_span, 40))
+    assert switch.sum() > 3 * ((uniform[:, 1] > 10) & (uniform[:, 1] < 90)).sum()
@@ -0,0 +1,158 @@
+"""Continuous trajectories that can be evaluated at arbitrary times.
+
+A trajectory keeps the states and time derivatives at the solver steps and
+interpolates between them with cubic Hermite polynomials. This is much more
+compact than a fine output grid and needs no re-integration to evaluate
+at new times, such as per-cell acquisition times.
+"""
+
+import numpy as np
+
+
+def _hermite(t, t0, t1, y0, y1, dy0, dy1):
+    """Cubic Hermite interpolation, broadcasting over leading axes."""
+    h = (t1 - t0)[..., None]
+    s = ((t - t0) / (t1 - t0))[..., None]
+    s2, s3 = s * s, s * s * s
+    return (
+        (2 * s3 - 3 * s2 + 1) * y0
+        + (s3 - 2 * s2 + s) * h * dy0
+        + (3 * s2 - 2 * s3) * y1
+        + (s3 - s2) * h * dy1
+    )
+
+
+class Trajectory:
+    """Piecewise cubic Hermite trajectory.
+
+    Parameters
+    ----------
+    t : array_like
+        Increasing solver step times.
+    y, dydt : array_like
+        States and their time derivatives at `t`, with shape
+        (len(t), number of species).
+    """
+
+    def __init__(self, t, y, dydt):
+        self.t = np.asarray(t, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.dydt = np.asarray(dydt, dtype=float)
+
+    def __call__(self, t):
+        """States at times `t`, with shape ``t.shape + (number of species,)``.
+
+        Times are clipped to the integrated interval.
+        """
+        t = np.clip(np.asarray(t, dtype=float), self.t[0], self.t[-1])
+        i = np.clip(np.searchsorted(self.t, t, side="right") - 1, 0, len(self.t) - 2)
+        return _hermite(
+            t,
+            self.t[i],
+            self.t[i + 1],
+            self.y[i],
+            self.y[i + 1],
+            self.dydt[i],
+            self.dydt[i + 1],
+        )
+
+    def adaptive_times(self, n, weights=None, refine=8):
+        """At most `n` times concentrated where the trajectory changes.
+
+        Times equidistribute the arc length of the trajectory, with time and
+        each observed quantity scaled to unit range, so flat stretches get
+        few points and fast transitions get many.
+
+        Parameters
+        ----------
+        n : int
+            Point budget, including both ends.
+        weights : array_like, optional
+            Matrix of shape (number of quantities, number of species), such
+            as :attr:`Network.observable_matrix`, selecting the quantities
+            that should be resolved (default: every species).
+        refine : int
+            Candidate points per solver step used to measure arc length.
+
+        Returns
+        -------
+        t : ndarray
+        """
+        s = np.linspace(0, 1, refine, endpoint=False)
+        steps = np.diff(self.t)
+        candidates = np.append(
+            (self.t[:-1, None] + s * steps[:, None]).ravel(), self.t[-1]
+        )
+        z = self(candidates)
+        if weights is not None:
+            z = z @ np.asarray(weights, dtype=float).T
+        span = np.ptp(z, axis=0)
+        z = z / np.where(span > 0, span, 1)
+        tau = (candidates - candidates[0]) / (candidates[-1] - candidates[0])
+
+        length = np.sqrt(np.diff(tau) ** 2 + (np.diff(z, axis=0) ** 2).sum(axis=1))
+        length = np.concatenate(([0], np.cumsum(length)))
+        t = np.interp(np.linspace(0, length[-1], n), length, candidates)
+        return np.unique(t)
+
+
+class Ensemble:
+    """Trajectories of many cells, with different solver steps, stored as
+    concatenated arrays.
+
+    Parameters
+    ----------
+    trajectories : sequence of Trajectory
+    """
+
+    def __init__(self, trajectories):
+        lengths = [len(tr.t) for tr in trajectories]
+        self.offsets = np.concatenate(([0], np.cumsum(lengths)))
+        self.t = np.concatenate([tr.t for tr in trajectories])
+        self.y = np.concatenate([tr.y for tr in trajectories])
+        self.dydt = np.concatenate([tr.dydt for tr in trajectories])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        s = slice(self.offsets[i], self.offsets[i + 1])
+        return Trajectory(self.t[s], self.y[s], self.dydt[s])
+
+    def __call__(self, t):
+        """States of each member at its own times.
+
+        Parameters
+        ----------
+        t : array_like
+            Times with shape (number of members, n), or (n,) to use the same
+            times for every member. Times are clipped to each member's
+            integrated interval.
+
+        Returns
+        -------
+        y : ndarray
+            Array of shape (number of members, n, number of species).
+        """
+        start, end = self.offsets[:-1], self.offsets[1:] - 1
+        t = np.broadcast_to(np.asarray(t, dtype=float), (len(self), np.shape(t)[-1]))
+        t = np.clip(t, self.t[start, None], self.t[end, None])
+
+        # Shift each member to its own time window, so one search over the
+        # concatenated times finds the step of every query.
+        span = (self.t[end] - self.t[start]).max() + 1
+        member = np.repeat(np.arange(len(self)), np.diff(self.offsets))
+        shifted = self.t - self.t[start][member] + span * member
+        queries = t - self.t[start, None] + span * np.arange(len(self))[:, None]
+
+        i = np.searchsorted(shifted, queries, side="right") - 1
+        i = np.clip(i, start[:, None], end[:, None] - 1)
+        return _hermite(
+            t,
+            self.t[i],
+            self.t[i + 1],
+            self.y[i],
+            self.y[i + 1],
+            self.dydt[i],
+            self.dydt[i + 1],
+        )